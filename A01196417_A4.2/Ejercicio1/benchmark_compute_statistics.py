@@ -0,0 +1,70 @@
+"""
+Benchmark of the compute_statistics summation modes.
+
+Measures the throughput and the relative error of the mean and the
+variance of every summation mode, from the default sum()/count and
+two-pass variance to the opt-in Welford and compensated modes, on
+generated inputs that are hard to sum. The exact results are computed
+with fractions.
+
+Usage: python benchmark_compute_statistics.py [count]
+"""
+
+import random
+import sys
+import time
+from fractions import Fraction
+
+from compute_statistics import SUMMATIONS, moments
+
+
+def generate_inputs(count, seed=0):
+    """Returns named lists of numbers with a wide dynamic range."""
+    rng = random.Random(seed)
+    cancelling = [1e16, 1.0, -1e16] * (count // 3)
+    rng.shuffle(cancelling)
+    return {
+        "cancellation": cancelling,
+        "large offset": [1e9 + rng.random() for _ in range(count)],
+        "dynamic range": [rng.choice((-1, 1)) * 10 ** rng.uniform(-10, 10)
+                          for _ in range(count)],
+        "ascending": sorted(rng.uniform(0, 1) * 10 ** (i % 12)
+                            for i in range(count)),
+    }
+
+
+def exact_moments(numbers):
+    """Returns the exact mean and variance of numbers as fractions."""
+    values = [Fraction(number) for number in numbers]
+    count = len(values)
+    total = sum(values)
+    squares = sum(value * value for value in values)
+    return total / count, (squares - total * total / count) / count
+
+
+def relative_error(value, exact):
+    """Returns the relative error of value against an exact fraction."""
+    if exact == 0:
+        return abs(value)
+    return float(abs((Fraction(value) - exact) / exact))
+
+
+def main():
+    """Prints the speed and the error of every mode on every input."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    methods = ("plain", "welford") + tuple(SUMMATIONS)
+
+    print("Input\tMethod\tMnumbers/s\tMean error\tVariance error")
+    for input_name, numbers in generate_inputs(count).items():
+        exact_mean, exact_variance = exact_moments(numbers)
+        for name in methods:
+            start = time.perf_counter()
+            mean, variance = moments(numbers, name)
+            elapsed = time.perf_counter() - start
+            print(f"{input_name}\t{name}\t{len(numbers) / elapsed / 1e6:.2f}"
+                  f"\t{relative_error(mean, exact_mean):.1e}"
+                  f"\t{relative_error(variance, exact_variance):.1e}")
+
+
+if __name__ == "__main__":
+    main()
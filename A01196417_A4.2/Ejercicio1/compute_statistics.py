@@ -1,122 +1,542 @@
 """Compute statistics (mean, median, mode, variance, and std dev) 
 from numerical data in a file."""
 
-import re
+import argparse
+import functools
+import itertools
+import math
+import multiprocessing
+import os
 import sys
 import time
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure Python backend is used
+    np = None
 
-def read_file(filename):
-    """Reads a file, extracts numbers, and handles errors gracefully."""
-    numbers = []  # Store extracted numbers
-    invalid_lines = []  # Store invalid lines
+from grouping import GroupedStats, format_result, grouped_statistics
+from incremental import STATE_FILE, incremental_statistics
+from selection import (
+    exact_median, exact_percentiles, percentile_key, select_ranks)
+from states import (
+    MODE_CAPACITY, QUANTILE_ERROR, ModeTracker, RunningStats, StreamState,
+    count_state, count_statistics)
+
+try:
+    from numeric_reader import (
+        ReadWarnings, count_lines, iter_numbers, split_offsets, tokenize)
+except ImportError:  # Run as a script, numeric_reader is one level up
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from numeric_reader import (
+        ReadWarnings, count_lines, iter_numbers, split_offsets, tokenize)
+
+PAIRWISE_BLOCK = 128  # Numbers added left to right by pairwise_sum
+
+
+def scan_file(filename, consume, max_warnings=None):
+    """Calls consume with the numbers of a file as they are extracted.
+
+    Returns what consume returns, or None on a file error, and the
+    warnings of the file, listing up to max_warnings lines of each kind.
+    """
+    warnings = ReadWarnings(max_warnings)
 
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            for line_num, line in enumerate(file, 1):
-                line = line.strip()
-                if not line:
-                    invalid_lines.append(
-                        f"Warning: Line {line_num} is empty."
-                    )
-                    continue
-
-                extracted_numbers = [
-                    float(num) for num in re.findall(r'-?\d+\.?\d*', line)
-                ]
-                if extracted_numbers:
-                    numbers.extend(extracted_numbers)
-                else:
-                    invalid_lines.append(
-                        f"Warning: No valid numbers on line {line_num}: "
-                        f"{line}"
-                    )
+        with open(filename, 'rb') as file:
+            result = consume(iter_numbers(file, warnings))
 
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
-        return [], ["File not found."]
+        return None, ["File not found."]
     except (IOError, OSError) as error:
         print(f"File error: {error}")
-        return [], [f"File error: {error}"]
+        return None, [f"File error: {error}"]
+
+    return result, warnings.messages()
+
+
+def read_file(filename, max_warnings=None):
+    """Reads a file, extracts numbers, and handles errors gracefully."""
+    numbers, invalid_lines = scan_file(filename, list, max_warnings)
+    return numbers or [], invalid_lines
+
 
-    return numbers, invalid_lines
+def neumaier_sum(values):
+    """Sums values with Neumaier's compensated (improved Kahan) method.
+
+    The rounding error of every addition is accumulated apart and added
+    back at the end, so the error does not grow with the count.
+    """
+    total = 0.0
+    compensation = 0.0
+    for value in values:
+        partial = total + value
+        if abs(total) >= abs(value):
+            compensation += (total - partial) + value
+        else:
+            compensation += (value - partial) + total
+        total = partial
+    return total + compensation
+
+
+def pairwise_sum(values):
+    """Sums a list of values by halves, like NumPy does.
+
+    Blocks of PAIRWISE_BLOCK values are summed first and the block sums
+    are then added in pairs, so the error grows with log n, not n.
+    """
+    sums = [sum(values[start:start + PAIRWISE_BLOCK])
+            for start in range(0, len(values), PAIRWISE_BLOCK)]
+    while len(sums) > 1:
+        sums = [sum(sums[start:start + 2])
+                for start in range(0, len(sums), 2)]
+    return sums[0] if sums else 0.0
+
+
+# Opt-in summations, more precise than the default sum() but slower
+SUMMATIONS = {
+    "neumaier": neumaier_sum,
+    "pairwise": pairwise_sum,
+    "fsum": math.fsum,
+}
+
+
+def summed_moments(numbers, total):
+    """Returns the mean and variance of numbers summed with total.
+
+    The variance takes two passes and subtracts the sum of the
+    deviations, which corrects most of the rounding error of the mean.
+    """
+    count = len(numbers)
+    mean = total(numbers) / count
+    deviations = [num - mean for num in numbers]
+    squares = total([deviation * deviation for deviation in deviations])
+    return mean, (squares - total(deviations) ** 2 / count) / count
 
 
-def compute_statistics(numbers):
-    """Compute mean, median, mode, variance, and std dev manually."""
+def plain_moments(numbers):
+    """Returns the mean as sum() / count and the two-pass variance."""
+    count = len(numbers)
+    mean = sum(numbers) / count
+    return mean, sum((x - mean) ** 2 for x in numbers) / count
+
+
+def welford_moments(numbers):
+    """Returns the mean and variance of a RunningStats of numbers."""
+    running = RunningStats().update(numbers)
+    return running.mean, running.variance
+
+
+def moments(numbers, summation="plain"):
+    """Returns the mean and variance of a non-empty list of numbers.
+
+    plain is the fast default; welford is the one-pass RunningStats and
+    the SUMMATIONS are more precise but slower.
+    """
+    if summation == "plain":
+        return plain_moments(numbers)
+    if summation == "welford":
+        return welford_moments(numbers)
+    return summed_moments(numbers, SUMMATIONS[summation])
+
+
+def compute_statistics(numbers, percentiles=(), summation="plain"):
+    """Compute mean, median, mode, variance, and std dev manually.
+
+    The median and the requested percentiles (0 to 100) are found by
+    selection, without sorting the numbers. Mean and variance are
+    summed as described in moments.
+    """
     if not numbers:
         return {}
 
     count = len(numbers)
-    mean = sum(numbers) / count
+    mean, variance = moments(numbers, summation)
 
     # Median calculation
-    sorted_numbers = sorted(numbers)
-    if count % 2 == 0:
-        median = (
-            sorted_numbers[count // 2 - 1] + sorted_numbers[count // 2]
-        ) / 2
-    else:
-        median = sorted_numbers[count // 2]
+    median = exact_median(
+        count, lambda ranks: select_ranks(numbers, ranks))
 
-    # Mode calculation
-    freq = {}
-    for num in numbers:
-        freq[num] = freq.get(num, 0) + 1
-    max_freq = max(freq.values())
-    mode = [key for key, val in freq.items() if val == max_freq]
+    # Mode calculation, without a map of counts if already sorted
+    tracker = ModeTracker().scan(numbers)
+    if tracker.in_order:
+        mode = tracker.result()[0]
+    else:
+        freq = {}
+        for num in numbers:
+            freq[num] = freq.get(num, 0) + 1
+        max_freq = max(freq.values())
+        mode = [key for key, val in freq.items() if val == max_freq]
 
-    # Variance & Standard Deviation
-    variance = sum((x - mean) ** 2 for x in numbers) / count
+    # Standard Deviation
     std_dev = variance ** 0.5
 
-    return {
+    stats = {
         "mean": mean,
         "median": median,
         "mode": mode,
         "variance": variance,
         "std_dev": std_dev,
     }
+    stats.update(exact_percentiles(
+        count, percentiles, lambda ranks: select_ranks(numbers, ranks)))
+    return stats
+
+
+def summarize_range(task):
+    """Computes the partial state of a byte range in a worker process.
+
+    With an empty StreamState as state the range fills it; otherwise
+    the RunningStats and the map of counts of the range are built.
+    Returns the partial state and the ReadWarnings. Lines are numbered
+    from the first_line of the range, so warnings match a serial run.
+    """
+    filename, start, end, first_line, state, seed, max_warnings = task
+    warnings = ReadWarnings(max_warnings)
+    with open(filename, 'rb') as file:
+        numbers = iter_numbers(file, warnings, float,
+                               (start, end, first_line))
+        if state is not None:
+            state.quantiles.rng.seed(seed)
+            partial = state.update(numbers)
+        else:
+            partial = count_state(numbers)
+    return partial, warnings
+
+
+def file_statistics(filename, percentiles=(), state=None,
+                    summation="plain", max_warnings=None):
+    """Computes the statistics of a file in a single process.
+
+    With an empty StreamState as state the file is streamed into it;
+    otherwise summation is passed to compute_statistics. Returns the
+    statistics and the warnings of the file.
+    """
+    if state is not None:
+        state, invalid_lines = scan_file(filename, state.update,
+                                         max_warnings)
+        return state.statistics(percentiles) if state else {}, invalid_lines
+    numbers, invalid_lines = read_file(filename, max_warnings)
+    return (compute_statistics(numbers, percentiles, summation),
+            invalid_lines)
 
 
-def write_results_to_file(stats, invalid_lines, execution_time):
-    """Writes statistics and errors to a results file."""
+def numpy_statistics(values, percentiles=()):
+    """Computes the statistics of compute_statistics over a NumPy array.
+
+    Median, mode and percentiles are identical to the pure Python ones.
+    Mean, variance and std dev use NumPy's pairwise summation and agree
+    with them within 1e-9 of the largest magnitude of the data, squared
+    for the variance (they are usually more accurate). The mode keeps
+    the order of first appearance.
+    """
+    if not values.size:
+        return {}
+
+    unique, first, counts = np.unique(values, return_index=True,
+                                      return_counts=True)
+    modes = np.flatnonzero(counts == counts.max())
+    stats = {
+        "mean": float(values.mean()),
+        "median": float(np.median(values)),
+        "mode": unique[modes[np.argsort(first[modes])]].tolist(),
+        "variance": float(values.var()),
+        "std_dev": float(values.std()),
+    }
+    if percentiles:
+        for percentile, value in zip(percentiles,
+                                     np.percentile(values, percentiles)):
+            stats[percentile_key(percentile)] = float(value)
+    return stats
+
+
+def numpy_file_statistics(filename, percentiles=(), max_warnings=None):
+    """Computes the statistics of a file with the NumPy backend.
+
+    The whole file is tokenized at once and the tokens are converted
+    to a float64 array in bulk. Falls back to file_statistics, noting
+    it in the warnings, when NumPy is missing or the text is not ASCII
+    (NumPy does not parse other digits).
+    """
+    if np is None:
+        stats, invalid_lines = file_statistics(
+            filename, percentiles, max_warnings=max_warnings)
+        return stats, ["Warning: NumPy is not installed, used the Python "
+                       "backend."] + invalid_lines
+
+    try:
+        with open(filename, 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return {}, ["File not found."]
+    except (IOError, OSError) as error:
+        print(f"File error: {error}")
+        return {}, [f"File error: {error}"]
+
+    if not data.isascii():
+        stats, invalid_lines = file_statistics(
+            filename, percentiles, max_warnings=max_warnings)
+        return stats, ["Warning: Text is not ASCII, used the Python "
+                       "backend."] + invalid_lines
+
+    warnings = ReadWarnings(max_warnings)
+    values = np.array(tokenize(data, warnings), dtype=np.float64)
+    return numpy_statistics(values, percentiles), warnings.messages()
+
+
+def parallel_statistics(filename, workers, percentiles=(), state=None,
+                        max_warnings=None):
+    """Computes the statistics of a file like file_statistics, in workers.
+
+    The file is cut into line-aligned byte ranges. The workers first
+    count the lines of every range, so each range knows the number of
+    its first line, and then parse their range into a partial state:
+    a copy of the StreamState state when streaming, or a RunningStats
+    and a map of counts otherwise. States are merged in file order, so
+    the mode keeps the order of first appearance. Mean and variance
+    match a serial run up to rounding; median, mode and percentiles are
+    exact, except for the approximations of the StreamState.
+    """
+    try:
+        ranges = split_offsets(filename, workers)
+    except (IOError, OSError):
+        ranges = []
+    if len(ranges) < 2:
+        return file_statistics(filename, percentiles, state,
+                               max_warnings=max_warnings)
+
+    with multiprocessing.Pool(min(workers, len(ranges))) as pool:
+        newlines = pool.map(count_lines,
+                            [(filename, start, end) for start, end in ranges])
+        first_lines = itertools.accumulate([1] + newlines[:-1])
+        tasks = [(filename, start, end, first_line, state, seed,
+                  max_warnings)
+                 for seed, ((start, end), first_line)
+                 in enumerate(zip(ranges, first_lines))]
+        partials = pool.map(summarize_range, tasks)
+    return merge_partials(partials, percentiles, state, max_warnings)
+
+
+def merge_partials(partials, percentiles=(), state=None, max_warnings=None):
+    """Merges the results of summarize_range, given in file order.
+
+    The partial states are merged into state when streaming, or into
+    one RunningStats and map of counts otherwise. Returns the statistics
+    and the warnings of the whole file.
+    """
+    running = RunningStats()
+    freq = {}
+    warnings = ReadWarnings(max_warnings)
+    for partial, partial_warnings in partials:
+        if state is not None:
+            state.merge(partial)
+        else:
+            running.merge(partial[0])
+            for num, num_count in partial[1].items():
+                freq[num] = freq.get(num, 0) + num_count
+        warnings.merge(partial_warnings)
+
+    if state is not None:
+        return state.statistics(percentiles), warnings.messages()
+    return (count_statistics(running, freq, percentiles),
+            warnings.messages())
+
+
+def write_results_to_file(report, invalid_lines, execution_time):
+    """Writes the report lines of the statistics and errors to a file."""
     with open('StatisticsResults.txt', 'w', encoding='utf-8') as file:
         file.write("\nWarnings and Errors:\n")
         for line in invalid_lines:
             file.write(f"{line}\n")
 
         file.write("\nDescriptive Statistics:\n")
-        for key, value in stats.items():
-            file.write(f"{key.capitalize()}: {value}\n")
+        for line in report:
+            file.write(f"{line}\n")
 
         file.write(f"\nExecution Time: {execution_time:.2f} sec\n")
 
 
+def parse_args():
+    """Parses the command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compute descriptive statistics of a file of numbers.")
+    parser.add_argument("filename", help="file with the numbers")
+    parser.add_argument("--stream", action="store_true",
+                        help="compute in one pass and bounded memory, with "
+                             "approximate median, percentiles and, unless "
+                             "sorted, mode")
+    parser.add_argument("--percentiles", type=parse_percentiles, default=(),
+                        help="comma separated percentiles to report, e.g. "
+                             "50,90,99")
+    parser.add_argument("--quantile-error", type=float,
+                        default=QUANTILE_ERROR,
+                        help="rank error of the --stream quantiles "
+                             f"(default {QUANTILE_ERROR})")
+    parser.add_argument("--incremental", nargs="?", const=STATE_FILE,
+                        metavar="STATE_FILE",
+                        help="stream the file, saving the state so a rerun "
+                             "only reads appended data (default state file "
+                             f"{STATE_FILE})")
+    parser.add_argument("--mode-capacity", type=int, default=MODE_CAPACITY,
+                        help="distinct numbers tracked by the --stream mode "
+                             f"(default {MODE_CAPACITY})")
+    parser.add_argument("--group-by", type=int, metavar="COLUMN",
+                        help="report the streaming statistics of every key "
+                             "of this column (columns start at 1 and are "
+                             "split by whitespace, commas or semicolons)")
+    parser.add_argument("--value-column", type=int, metavar="COLUMN",
+                        help="column of the numbers when grouping or "
+                             "windowing (default the first column left)")
+    parser.add_argument("--window", type=float, metavar="SIZE",
+                        help="report the statistics of windows of SIZE "
+                             "rows of each group, or SIZE units of time "
+                             "with --time-column")
+    parser.add_argument("--slide", type=float, metavar="STEP",
+                        help="start a window every STEP rows or units of "
+                             "time, dividing SIZE (default SIZE, tumbling "
+                             "windows)")
+    parser.add_argument("--time-column", type=int, metavar="COLUMN",
+                        help="column with the time of each row, as a "
+                             "number such as epoch seconds")
+    parser.add_argument("--max-warnings", type=int, metavar="N",
+                        help="list at most N lines of each kind of "
+                             "warning, such as empty lines or lines without "
+                             "numbers, counting the rest (default all)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes used to read the file")
+    parser.add_argument("--backend", choices=("python", "numpy"),
+                        default="python",
+                        help="parse and compute with NumPy arrays, loading "
+                             "the whole file (default python)")
+    parser.add_argument("--summation", default="plain",
+                        choices=("plain", "welford") + tuple(SUMMATIONS),
+                        help="how mean and variance are summed: sum() and "
+                             "a second pass (default), Welford's one pass, "
+                             "Neumaier compensated, pairwise or exactly "
+                             "rounded fsum")
+    args = parser.parse_args()
+    args.grouped = any(option is not None for option in (
+        args.group_by, args.value_column, args.window, args.slide,
+        args.time_column))
+    in_memory = not any((args.stream, args.incremental, args.workers > 1,
+                         args.backend == "numpy", args.grouped))
+    if not 0 < args.quantile_error < 1:
+        parser.error("--quantile-error must be between 0 and 1")
+    if args.mode_capacity < 1:
+        parser.error("--mode-capacity must be positive")
+    if args.max_warnings is not None and args.max_warnings < 0:
+        parser.error("--max-warnings cannot be negative")
+    if args.backend == "numpy" and (args.stream or args.workers > 1):
+        parser.error("--backend numpy cannot be combined with --stream or "
+                     "--workers")
+    if args.summation != "plain" and not in_memory:
+        parser.error("--summation needs the default in-memory mode")
+    if args.incremental and (args.workers > 1 or args.backend == "numpy"):
+        parser.error("--incremental cannot be combined with --workers or "
+                     "--backend numpy")
+    if args.grouped:
+        check_grouping(parser, args)
+    return args
+
+
+def check_grouping(parser, args):
+    """Validates the grouping options and sets the 0-based columns."""
+    if args.incremental or args.workers > 1 or args.backend == "numpy":
+        parser.error("--group-by and --window cannot be combined with "
+                     "--incremental, --workers or --backend numpy")
+    columns = (args.group_by, args.time_column)
+    if any(column is not None and column < 1
+           for column in columns + (args.value_column,)):
+        parser.error("columns start at 1")
+    if args.value_column is None:
+        args.value_column = min({1, 2, 3}.difference(columns))
+    if args.value_column in columns:
+        parser.error("the value column must differ from the other columns")
+    if args.time_column is not None and not args.window:
+        parser.error("--time-column needs --window")
+    if args.window is not None:
+        if args.window <= 0:
+            parser.error("--window must be positive")
+        args.slide = args.slide or args.window
+        span = args.window / args.slide
+        if not 0 < args.slide <= args.window or span != round(span):
+            parser.error("--slide must divide --window")
+        if args.time_column is None:
+            if not args.slide.is_integer():
+                parser.error("row windows need a whole --window and --slide")
+            args.window, args.slide = int(args.window), int(args.slide)
+    elif args.slide is not None:
+        parser.error("--slide needs --window")
+    args.columns = tuple(None if column is None else column - 1
+                         for column in (args.value_column, args.group_by,
+                                        args.time_column))
+
+
+def parse_percentiles(text):
+    """Parses a comma separated list of percentiles from 0 to 100."""
+    try:
+        percentiles = [float(item) for item in text.split(",")]
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from error
+    if not all(0 <= percentile <= 100 for percentile in percentiles):
+        raise argparse.ArgumentTypeError(
+            "percentiles must be between 0 and 100")
+    return percentiles
+
+
 def main():
     """Main function to process file and compute statistics."""
-    if len(sys.argv) != 2:
-        print("Usage: python computeStatistics.py <fileWithData.txt>")
-        return
-
-    filename = sys.argv[1]
+    args = parse_args()
+    state = (StreamState(args.quantile_error, args.mode_capacity)
+             if args.stream else None)
     start_time = time.time()
 
-    numbers, invalid_lines = read_file(filename)
-    stats = compute_statistics(numbers)
+    if args.grouped:
+        grouped = GroupedStats(
+            functools.partial(StreamState, args.quantile_error,
+                              args.mode_capacity),
+            args.percentiles, args.window, args.slide,
+            args.time_column is not None)
+        results, invalid_lines = grouped_statistics(
+            args.filename, grouped, args.columns, args.max_warnings)
+    elif args.incremental:
+        stats, invalid_lines = incremental_statistics(
+            args.filename, args.incremental, args.percentiles,
+            StreamState(args.quantile_error, args.mode_capacity),
+            args.max_warnings)
+    elif args.backend == "numpy":
+        stats, invalid_lines = numpy_file_statistics(
+            args.filename, args.percentiles, args.max_warnings)
+    elif args.workers > 1:
+        stats, invalid_lines = parallel_statistics(
+            args.filename, args.workers, args.percentiles, state,
+            args.max_warnings)
+    else:
+        stats, invalid_lines = file_statistics(
+            args.filename, args.percentiles, state, args.summation,
+            args.max_warnings)
     execution_time = time.time() - start_time
 
+    if args.grouped:
+        report = [format_result(*result) for result in results]
+    else:
+        report = [f"{key.capitalize()}: {value}"
+                  for key, value in stats.items()]
+
     print("\nWarnings and Errors:")
     for line in invalid_lines:
         print(line)
 
     print("\nDescriptive Statistics:")
-    for key, value in stats.items():
-        print(f"{key.capitalize()}: {value}")
+    for line in report:
+        print(line)
 
     print(f"\nExecution Time: {execution_time:.2f} sec")
 
-    write_results_to_file(stats, invalid_lines, execution_time)
+    write_results_to_file(report, invalid_lines, execution_time)
 
 
 if __name__ == "__main__":
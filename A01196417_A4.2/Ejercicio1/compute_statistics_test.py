@@ -0,0 +1,231 @@
+"""
+Unit tests for compute_statistics.py
+"""
+
+import bisect
+import contextlib
+import functools
+import io
+import math
+import operator
+import os
+import shutil
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import compute_statistics
+from compute_statistics import np
+from states import StreamState
+
+
+class TestParallelStatistics(unittest.TestCase):
+    """Statistics computed in worker processes match a serial run."""
+
+    PERCENTILES = (1, 25, 50, 90, 99.9)
+
+    def setUp(self):
+        """Writes a file of repeated numbers with empty and bad lines."""
+        rng = random.Random(0)
+        lines = []
+        for _ in range(20000):
+            choice = rng.random()
+            if choice < 0.01:
+                lines.append("")
+            elif choice < 0.02:
+                lines.append("no numbers")
+            elif choice < 0.3:
+                lines.append(f"{rng.randint(-50, 50)} {rng.randint(0, 9)}")
+            else:
+                lines.append(f"{rng.gauss(100, 15):.2f}")
+        handle, self.filename = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            file.write("\n".join(lines) + "\n")
+        self.numbers = compute_statistics.read_file(self.filename)[0]
+
+    def tearDown(self):
+        """Deletes the test file."""
+        os.remove(self.filename)
+
+    def assert_moments(self, stats, expected):
+        """Checks mean, variance and std dev up to rounding."""
+        for key in ("mean", "variance", "std_dev"):
+            self.assertAlmostEqual(stats[key], expected[key],
+                                   delta=1e-9 * abs(expected[key]))
+
+    def test_exact_statistics(self):
+        """TC-01: Median, mode, percentiles and warnings are identical."""
+        expected, expected_lines = compute_statistics.file_statistics(
+            self.filename, self.PERCENTILES)
+        self.assertTrue(expected_lines)
+        for workers in (2, 4):
+            stats, invalid_lines = compute_statistics.parallel_statistics(
+                self.filename, workers, self.PERCENTILES)
+            self.assertEqual(invalid_lines, expected_lines)
+            self.assertEqual(stats.keys(), expected.keys())
+            self.assert_moments(stats, expected)
+            for key in expected.keys() - {"mean", "variance", "std_dev"}:
+                self.assertEqual(stats[key], expected[key], key)
+
+    def test_streaming_statistics(self):
+        """TC-02: Merged streaming states stay within their error.
+
+        The mode capacity fits every distinct number, so the mode is
+        exact.
+        """
+        error = 0.01
+        expected, expected_lines = compute_statistics.file_statistics(
+            self.filename, self.PERCENTILES)
+        stats, invalid_lines = compute_statistics.parallel_statistics(
+            self.filename, 4, self.PERCENTILES,
+            StreamState(error, len(set(self.numbers))))
+        self.assertEqual(invalid_lines, expected_lines)
+        self.assert_moments(stats, expected)
+        ordered = sorted(self.numbers)
+        for percentile in self.PERCENTILES:
+            key = f"p{percentile:g}"
+            target = percentile / 100 * len(ordered)
+            distance = max(0, bisect.bisect_left(ordered, stats[key]) - target,
+                           target - bisect.bisect_right(ordered, stats[key]))
+            self.assertLessEqual(distance, error * len(ordered), key)
+        self.assertEqual(stats["mode"], expected["mode"])
+        self.assertTrue(stats["mode_exact"])
+
+    def test_small_file_serial(self):
+        """TC-03: A file too small to split is read by one process."""
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            file.write("4\n")
+        stats, invalid_lines = compute_statistics.parallel_statistics(
+            self.filename, 4)
+        self.assertEqual(invalid_lines, [])
+        self.assertEqual(stats["mode"], [4.0])
+        self.assertEqual(stats["variance"], 0)
+
+
+class TestSummation(unittest.TestCase):
+    """The compensated summations are exact where adding in order fails."""
+
+    CANCELLING = [1e16, 1.0, -1e16]
+    TENTHS = [0.1] * 100000
+
+    def test_cancelling_values(self):
+        """TC-04: A small value between cancelling large ones is kept."""
+        self.assertEqual(functools.reduce(operator.add, self.CANCELLING), 0)
+        self.assertEqual(compute_statistics.neumaier_sum(self.CANCELLING), 1)
+        self.assertEqual(
+            compute_statistics.neumaier_sum(self.CANCELLING * 1000), 1000)
+        mean, _ = compute_statistics.summed_moments(
+            self.CANCELLING, compute_statistics.neumaier_sum)
+        self.assertEqual(mean, 1 / 3)
+
+    def test_repeated_tenths(self):
+        """TC-05: Many copies of 0.1 sum as math.fsum does.
+
+        Pairwise summation is not compensated, but its error is far below
+        that of adding in order.
+        """
+        exact = math.fsum(self.TENTHS)
+        naive_error = abs(functools.reduce(operator.add, self.TENTHS) - exact)
+        self.assertGreater(naive_error, 0)
+        self.assertEqual(compute_statistics.neumaier_sum(self.TENTHS), exact)
+        self.assertLess(
+            abs(compute_statistics.pairwise_sum(self.TENTHS) - exact),
+            naive_error / 100)
+        mean, variance = compute_statistics.summed_moments(
+            self.TENTHS, compute_statistics.neumaier_sum)
+        self.assertEqual((mean, variance),
+                         (exact / len(self.TENTHS), 0))
+        for total in compute_statistics.SUMMATIONS.values():
+            self.assertEqual(total([]), 0)
+            self.assertEqual(total([2.5]), 2.5)
+
+    def test_results_format(self):
+        """TC-06: Every --summation writes the same StatisticsResults.
+
+        The numbers are exact in binary, so all ways of summing agree.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(directory)
+        with open("numbers.txt", 'w', encoding='utf-8') as file:
+            file.write("1.5\n\nx\n-2\n4.25\n4.25\n")
+        reports = set()
+        for summation in ("plain", "welford") + tuple(
+                compute_statistics.SUMMATIONS):
+            argv = ["compute_statistics.py", "numbers.txt", "--percentiles",
+                    "50", "--summation", summation]
+            with mock.patch("sys.argv", argv), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                compute_statistics.main()
+            with open("StatisticsResults.txt", encoding='utf-8') as file:
+                lines = file.read().splitlines()
+            self.assertTrue(lines[-1].startswith("Execution Time: "))
+            reports.add(tuple(lines[:-1]))
+        self.assertEqual(len(reports), 1)
+        self.assertIn("Mean: 2.0", reports.pop())
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestNumpyBackend(unittest.TestCase):
+    """The NumPy backend agrees with the pure Python statistics."""
+
+    TOLERANCE = 1e-9  # Relative to the largest magnitude of the data
+
+    def setUp(self):
+        """Picks a file name for the test data."""
+        handle, self.filename = tempfile.mkstemp(suffix=".txt")
+        os.close(handle)
+
+    def tearDown(self):
+        """Deletes the test file."""
+        os.remove(self.filename)
+
+    def compare(self, lines, percentiles=(5, 50, 95)):
+        """Checks both backends on a file of lines."""
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            file.write("\n".join(lines) + "\n")
+        expected, expected_lines = compute_statistics.file_statistics(
+            self.filename, percentiles)
+        stats, invalid_lines = compute_statistics.numpy_file_statistics(
+            self.filename, percentiles)
+        self.assertEqual(invalid_lines, expected_lines)
+        self.assertEqual(stats.keys(), expected.keys())
+        scale = max(abs(number) for number in
+                    compute_statistics.read_file(self.filename)[0])
+        for key in ("mean", "variance", "std_dev"):
+            delta = self.TOLERANCE * scale ** (2 if key == "variance" else 1)
+            self.assertAlmostEqual(stats[key], expected[key], delta=delta)
+        for key in expected.keys() - {"mean", "variance", "std_dev"}:
+            self.assertEqual(stats[key], expected[key], key)
+
+    def test_random_numbers(self):
+        """TC-07: Random numbers with bad lines agree within tolerance."""
+        rng = random.Random(4)
+        lines = [f"{rng.uniform(-1e6, 1e6):.3f} {rng.randint(0, 20)}"
+                 for _ in range(20000)]
+        lines[10:12] = ["", "none here"]
+        self.compare(lines)
+
+    def test_large_offset(self):
+        """TC-08: Numbers far from zero agree within tolerance."""
+        rng = random.Random(5)
+        self.compare([f"{1e9 + rng.random():.6f}" for _ in range(5000)])
+
+    def test_repeated_numbers(self):
+        """TC-09: Ties of the mode keep the order of first appearance."""
+        self.compare(["3", "1", "2", "1", "3", "2"], (0, 100))
+
+    def test_not_ascii_falls_back(self):
+        """TC-10: Text that is not ASCII is read by the Python backend."""
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            file.write("1\n\u0661\u0662\n")
+        stats, invalid_lines = compute_statistics.numpy_file_statistics(
+            self.filename)
+        self.assertIn("used the Python backend", invalid_lines[0])
+        self.assertEqual(stats["median"], 6.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
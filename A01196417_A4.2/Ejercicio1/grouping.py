@@ -0,0 +1,266 @@
+"""
+Module for the grouped and windowed statistics of compute_statistics.
+
+Lines are split into columns; the numbers of a value column are grouped
+by the key of another column and cut into windows of rows or of time.
+Every group streams into bounded StreamStates, so thousands of series
+are summarized in one pass over the file.
+"""
+
+import collections
+import math
+import os
+import re
+import sys
+
+try:
+    from numeric_reader import ReadWarnings
+except ImportError:  # Run as a script, numeric_reader is one level up
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from numeric_reader import ReadWarnings
+
+GROUP_BUFFER = 1024  # Numbers a pane buffers before updating its state
+FIELD_SEPARATOR = re.compile(r'[\s,;]+')
+
+
+class RowWarnings(ReadWarnings):
+    """Lines skipped while grouping, counted by kind.
+
+    The kinds are "empty", "bad_columns" and "out_of_order"; they are
+    sampled and summarized as in ReadWarnings.
+    """
+
+    KINDS = ("empty", "bad_columns", "out_of_order")
+    LABELS = {"empty": "empty lines",
+              "bad_columns": "lines with missing or invalid columns",
+              "out_of_order": "lines out of time order"}
+
+    @staticmethod
+    def message(line_num, kind, text):
+        """Returns the warning of one skipped line."""
+        if kind == "empty":
+            return f"Warning: Line {line_num} is empty."
+        if kind == "bad_columns":
+            return (f"Warning: Missing or invalid columns on line "
+                    f"{line_num}: {text}")
+        return f"Warning: Line {line_num} is out of time order."
+
+
+def scan_rows(file, warnings, value_column, key_column=None,
+              time_column=None):
+    """Yields the line number, key, time and value of every line.
+
+    Lines are split into fields by whitespace, commas or semicolons and
+    the columns are indexes of those fields; key and time are None when
+    their column is. Empty lines and lines whose columns are missing or
+    whose numbers are not finite are recorded in the RowWarnings.
+    """
+    split = FIELD_SEPARATOR.split
+    for line_num, line in enumerate(file, 1):
+        line = line.strip()
+        if not line:
+            warnings.record(line_num, "empty", line)
+            continue
+
+        fields = split(line)
+        try:
+            key = None if key_column is None else fields[key_column]
+            moment = (None if time_column is None
+                      else float(fields[time_column]))
+            value = float(fields[value_column])
+            if not math.isfinite(value) or (
+                    moment is not None and not math.isfinite(moment)):
+                raise ValueError(line)
+        except (IndexError, ValueError):
+            warnings.record(line_num, "bad_columns", line)
+            continue
+        yield line_num, key, moment, value
+
+
+class Pane:
+    """Numbers of a group that fall in one step of its windows.
+
+    The numbers are buffered and added to the StreamState GROUP_BUFFER
+    at a time.
+    """
+
+    __slots__ = ("index", "values", "state")
+
+    def __init__(self, index, state):
+        self.index = index
+        self.values = []
+        self.state = state
+
+    def add(self, value):
+        """Adds a number to the pane."""
+        self.values.append(value)
+        if len(self.values) >= GROUP_BUFFER:
+            self.flush()
+
+    def flush(self):
+        """Moves the buffered numbers into the state."""
+        if self.values:
+            self.state.update(self.values)
+            self.values = []
+
+
+class GroupedStats:
+    """Statistics of every group and window of a stream of numbers.
+
+    The numbers of each key are split into panes of slide rows of the
+    group, or of slide units of time, and a window spans the last
+    window / slide panes, so tumbling windows have a single pane. Every
+    pane streams into an empty StreamState returned by new_state, which
+    bounds the memory of each group. When a pane of a group closes, the
+    statistics of the window ending with it are added to results.
+
+    Row windows are reported once they are full; only the last window
+    of a group may hold fewer rows, and its label says it is partial.
+    Time windows are labeled with their time range, and every window
+    holding a number of the group is reported, including those that
+    start before its first number or end after its last one. Without a
+    window each group is one pane, closed by finish.
+    """
+
+    def __init__(self, new_state, percentiles=(), window=None, slide=None,
+                 by_time=False):
+        self.new_state = new_state
+        self.percentiles = percentiles
+        self.window = window
+        self.slide = slide or window
+        self.by_time = by_time
+        self.groups = {}  # Key to [rows seen, deque of its open Panes]
+        self.results = []  # (key, window label, statistics) tuples
+
+    @property
+    def span(self):
+        """Number of panes in a window."""
+        return round(self.window / self.slide) if self.window else 1
+
+    def add(self, key, moment, value):
+        """Adds a number to its group and window.
+
+        Returns False, ignoring the number, if its time is earlier than
+        the open pane of its group.
+        """
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = [0, collections.deque()]
+        rows, panes = group
+        if not self.window:
+            index = 0
+        elif self.by_time:
+            index = math.floor(moment / self.slide)
+        else:
+            index = rows // self.slide
+
+        if not panes or index > panes[-1].index:
+            if panes:
+                self.close(key, panes, index)
+            span = self.span
+            while panes and panes[0].index <= index - span:
+                panes.popleft()
+            panes.append(Pane(index, self.new_state()))
+        elif index < panes[-1].index:
+            return False
+        group[0] = rows + 1
+        panes[-1].add(value)
+        return True
+
+    def update(self, rows):
+        """Adds every (key, time, value) row of an iterable."""
+        for key, moment, value in rows:
+            self.add(key, moment, value)
+        return self
+
+    def close(self, key, panes, following=None):
+        """Records the windows that end with the last pane of a group.
+
+        following is the index of the next pane, None once the group
+        ends. Every time window that holds the last pane and ends before
+        the next one is recorded. A row window ending at the last pane is
+        skipped if it starts before the first row of its group, unless
+        it is the last window of the group.
+        """
+        last = panes[-1].index
+        span = self.span
+        if self.by_time:
+            ends = range(last, last + span if following is None
+                         else min(following, last + span))
+        elif following is None or last >= span - 1:
+            ends = (last,)
+        else:
+            return
+        for pane in panes:
+            pane.flush()
+        for end in ends:
+            self.record(key, [pane for pane in panes
+                              if pane.index > end - span], end - span + 1)
+
+    def record(self, key, window, start):
+        """Records the statistics of the panes of a window."""
+        state = window[0].state
+        if len(window) > 1:
+            state = self.new_state()
+            for pane in window:
+                state.merge(pane.state)
+        stats = {"count": state.running.count}
+        stats.update(state.statistics(self.percentiles))
+        self.results.append((key, self.label(start, stats["count"]), stats))
+
+    def label(self, start, count):
+        """Describes the window starting at a pane, None without windows."""
+        if not self.window:
+            return None
+        start *= self.slide
+        if self.by_time:
+            end = start + self.window
+            start, end = (int(bound) if float(bound).is_integer() else bound
+                          for bound in (start, end))
+            return f"[{start}, {end})"
+        first = max(0, start) + 1
+        label = f"rows {first}-{first + count - 1}"
+        return label if count == self.window else f"{label} (partial)"
+
+    def finish(self):
+        """Closes the open pane of every group and returns the results."""
+        for key, (_, panes) in self.groups.items():
+            if panes:
+                self.close(key, panes)
+        return self.results
+
+
+def grouped_statistics(filename, grouped, columns, max_warnings=None):
+    """Computes the statistics per group and window of a file.
+
+    columns holds the indexes of the value, key and time columns, the
+    last two None when unused, and grouped is an empty GroupedStats.
+    Returns the results of grouped and the warnings of the file, listing
+    up to max_warnings lines of each kind.
+    """
+    warnings = RowWarnings(max_warnings)
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            for line_num, key, moment, value in scan_rows(
+                    file, warnings, *columns):
+                if not grouped.add(key, moment, value):
+                    warnings.record(line_num, "out_of_order", "")
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return [], ["File not found."]
+    except (IOError, OSError) as file_error:
+        print(f"File error: {file_error}")
+        return [], [f"File error: {file_error}"]
+
+    return grouped.finish(), warnings.messages()
+
+
+def format_result(key, window, stats):
+    """Formats the statistics of a group and window as one line."""
+    fields = [] if key is None else [f"Group: {key}"]
+    if window is not None:
+        fields.append(f"Window: {window}")
+    fields.extend(f"{name.capitalize()}: {value}"
+                  for name, value in stats.items())
+    return ", ".join(fields)
@@ -0,0 +1,124 @@
+"""
+Unit tests for grouping.py
+"""
+
+import os
+import tempfile
+import unittest
+
+import grouping
+from states import StreamState
+
+
+class TestGroupedStats(unittest.TestCase):
+    """Groups and windows report full windows in bounded memory."""
+
+    @staticmethod
+    def windows(rows, window=None, slide=None, by_time=False):
+        """Returns the (key, label, count, mean) of every result."""
+        grouped = grouping.GroupedStats(StreamState, (), window, slide,
+                                        by_time)
+        return [(key, label, stats["count"], stats["mean"])
+                for key, label, stats in grouped.update(rows).finish()]
+
+    def test_groups(self):
+        """TC-01: Every key gets the statistics of its numbers."""
+        rows = [("a", None, 1.0), ("b", None, 5.0), ("a", None, 3.0)]
+        self.assertEqual(self.windows(rows),
+                         [("a", None, 2, 2.0), ("b", None, 1, 5.0)])
+
+    def test_sliding_rows_full(self):
+        """TC-02: Sliding row windows start once full."""
+        rows = [(None, None, float(value)) for value in range(1, 6)]
+        self.assertEqual(self.windows(rows, 2, 1), [
+            (None, "rows 1-2", 2, 1.5), (None, "rows 2-3", 2, 2.5),
+            (None, "rows 3-4", 2, 3.5), (None, "rows 4-5", 2, 4.5)])
+
+    def test_partial_last_window(self):
+        """TC-03: Only the last window of a group may be partial."""
+        rows = [(None, None, float(value)) for value in range(1, 6)]
+        self.assertEqual(self.windows(rows, 4, 2), [
+            (None, "rows 1-4", 4, 2.5), (None, "rows 3-5 (partial)", 3, 4.0)])
+        self.assertEqual(self.windows(rows[:1], 3, 1),
+                         [(None, "rows 1-1 (partial)", 1, 1.0)])
+
+    def test_time_windows(self):
+        """TC-04: Time windows are labeled with their time range.
+
+        Every window holding a number is reported, at both ends.
+        """
+        rows = [("k", 0.0, 1.0), ("k", 15.0, 3.0), ("k", 25.0, 5.0)]
+        self.assertEqual(self.windows(rows, 20.0, 10.0, True), [
+            ("k", "[-10, 10)", 1, 1.0), ("k", "[0, 20)", 2, 2.0),
+            ("k", "[10, 30)", 2, 4.0), ("k", "[20, 40)", 1, 5.0)])
+        grouped = grouping.GroupedStats(StreamState, (), 10.0, 10.0, True)
+        self.assertTrue(grouped.add("k", 15.0, 1.0))
+        self.assertFalse(grouped.add("k", 5.0, 1.0))
+
+    def test_windows_after_gaps(self):
+        """TC-05: Windows ending in empty panes still get their numbers."""
+        rows = [("k", 14.0, 1.0), ("k", 30.0, 3.0), ("j", 7.0, 2.0)]
+        self.assertEqual(self.windows(rows, 10.0, 5.0, True), [
+            ("k", "[5, 15)", 1, 1.0), ("k", "[10, 20)", 1, 1.0),
+            ("k", "[25, 35)", 1, 3.0), ("k", "[30, 40)", 1, 3.0),
+            ("j", "[0, 10)", 1, 2.0), ("j", "[5, 15)", 1, 2.0)])
+
+    def test_bounded_buffers(self):
+        """TC-06: A group keeps at most GROUP_BUFFER numbers unmerged."""
+        grouped = grouping.GroupedStats(StreamState)
+        for value in range(3 * grouping.GROUP_BUFFER + 5):
+            grouped.add("k", None, float(value))
+        pane = grouped.groups["k"][1][0]
+        self.assertEqual(len(pane.values), 5)
+        self.assertEqual(grouped.finish()[0][2]["count"],
+                         3 * grouping.GROUP_BUFFER + 5)
+
+
+class TestGroupedFile(unittest.TestCase):
+    """Rows of a file are checked and their warnings sampled."""
+
+    def setUp(self):
+        """Picks a path for the test file."""
+        handle, self.filename = tempfile.mkstemp(suffix=".txt")
+        os.close(handle)
+
+    def tearDown(self):
+        """Deletes the test file."""
+        os.remove(self.filename)
+
+    def run_file(self, text, max_warnings=None):
+        """Groups a file of key, time and value rows in windows of 10."""
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            file.write(text)
+        grouped = grouping.GroupedStats(StreamState, (), 10.0, 10.0, True)
+        return grouping.grouped_statistics(self.filename, grouped,
+                                           (2, 0, 1), max_warnings)
+
+    def test_finite_columns(self):
+        """TC-07: Finite times and values are kept even if their sum is not.
+        """
+        results, invalid_lines = self.run_file(
+            "a,1e308,1e308\na,inf,1\na,1e308,nan\n")
+        self.assertEqual([stats["count"] for _, _, stats in results], [1])
+        self.assertEqual(invalid_lines, [
+            "Warning: Missing or invalid columns on line 2: a,inf,1",
+            "Warning: Missing or invalid columns on line 3: a,1e308,nan"])
+
+    def test_max_warnings(self):
+        """TC-08: Only max_warnings lines of each kind are listed."""
+        text = "\n\na,15,1\nb\nc\na,1,2\na,2,3\na,16,4\n"
+        results, invalid_lines = self.run_file(text, 1)
+        self.assertEqual(results[0][2]["count"], 2)
+        self.assertEqual(invalid_lines, [
+            "Warning: Line 1 is empty.",
+            "Warning: Missing or invalid columns on line 4: b",
+            "Warning: Line 6 is out of time order.",
+            "Warning: 1 more empty lines not listed.",
+            "Warning: 1 more lines with missing or invalid columns not "
+            "listed.",
+            "Warning: 1 more lines out of time order not listed."])
+        self.assertEqual(len(self.run_file(text)[1]), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
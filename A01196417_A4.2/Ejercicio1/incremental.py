@@ -0,0 +1,169 @@
+"""
+Module for the incremental statistics of a file that only grows.
+
+The StreamState of the lines read so far is saved to a JSON state file
+with the byte offset it reached, so a rerun of compute_statistics
+--incremental only reads the bytes appended since. A file that shrank
+or whose bytes read changed is recomputed from the start.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import sys
+
+from states import StreamState
+
+try:
+    from numeric_reader import (
+        BLOCK_SIZE, ReadWarnings, count_lines, iter_numbers)
+except ImportError:  # Run as a script, numeric_reader is one level up
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from numeric_reader import (
+        BLOCK_SIZE, ReadWarnings, count_lines, iter_numbers)
+
+STATE_FILE = "StatisticsState.json"
+FINGERPRINT_SIZE = 4096  # Bytes hashed at each end of the data read
+
+
+def fingerprint(file, offset):
+    """Hashes the first and last bytes before offset of a binary file."""
+    digest = hashlib.sha1()
+    for start in (0, max(0, offset - FINGERPRINT_SIZE)):
+        file.seek(start)
+        digest.update(file.read(min(offset, FINGERPRINT_SIZE)))
+    return digest.hexdigest()
+
+
+def complete_lines_end(file, start, end):
+    """Returns the offset after the last newline in a byte range.
+
+    Returns start when the range holds no newline.
+    """
+    position = end
+    while position > start:
+        block_start = max(start, position - BLOCK_SIZE)
+        file.seek(block_start)
+        index = file.read(position - block_start).rfind(b"\n")
+        if index >= 0:
+            return block_start + index + 1
+        position = block_start
+    return start
+
+
+def load_state(state_file):
+    """Loads the state saved by a previous incremental run.
+
+    Returns an empty dictionary when there is no valid state file.
+    """
+    try:
+        with open(state_file, 'r', encoding='utf-8') as file:
+            saved = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return saved if isinstance(saved, dict) else {}
+
+
+def save_state(state_file, saved):
+    """Stores the state for the next incremental run."""
+    try:
+        with open(state_file, 'w', encoding='utf-8') as file:
+            json.dump(saved, file)
+    except (OSError, IOError) as file_error:
+        print(f"File error: {file_error}")
+
+
+def state_options(filename, state, max_warnings):
+    """Returns the options a saved state must match to be resumed."""
+    return {"file": os.path.abspath(filename), "k": state.quantiles.k,
+            "capacity": state.modes.summary.capacity,
+            "max_warnings": max_warnings}
+
+
+def resume_state(saved, file, options, size):
+    """Returns the saved state, warnings, lines and offset, if still valid.
+
+    They are valid when the options match, the offset is within the size
+    of the file and the bytes before it did not change. Returns None
+    otherwise, or when the saved state is damaged.
+    """
+    offset = saved.get("offset")
+    if (saved.get("options") != options or not isinstance(offset, int)
+            or not 0 <= offset <= size):
+        return None
+    try:
+        if saved["fingerprint"] != fingerprint(file, offset):
+            return None
+        return (StreamState.from_dict(saved["state"]),
+                ReadWarnings.from_dict(saved["warnings"]),
+                int(saved["lines"]), offset)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def read_appended(file, saved, options, state, max_warnings):
+    """Reads the bytes of an open file that the saved run did not read.
+
+    state is the empty StreamState used when the saved run cannot be
+    resumed. Returns the state to save, the state and warnings of the
+    whole file and the notes about the saved run.
+    """
+    size = os.fstat(file.fileno()).st_size
+    notes = []
+    resumed = resume_state(saved, file, options, size)
+    if resumed is None:
+        if saved:
+            notes.append(f"Warning: '{file.name}' or the options changed "
+                         "since the last run, statistics recomputed.")
+        resumed = (state, ReadWarnings(max_warnings), 0, 0)
+    state, warnings, lines, offset = resumed
+
+    end = complete_lines_end(file, offset, size)
+    state.update(iter_numbers(file, warnings, float,
+                              (offset, end, lines + 1)))
+    lines += count_lines((file.name, offset, end))
+    saved = {"options": options, "offset": end, "lines": lines,
+             "fingerprint": fingerprint(file, end),
+             "warnings": warnings.to_dict(), "state": state.to_dict()}
+
+    if end < size:
+        state = copy.deepcopy(state)
+        warnings = copy.deepcopy(warnings)
+        state.update(iter_numbers(file, warnings, float,
+                                  (end, size, lines + 1)))
+    return saved, state, warnings, notes
+
+
+def incremental_statistics(filename, state_file=STATE_FILE, percentiles=(),
+                           state=None, max_warnings=None):
+    """Computes the streaming statistics of a file, resuming a past run.
+
+    state_file keeps the StreamState of the complete lines read so far,
+    with their byte offset, line count, warnings and a fingerprint of
+    the bytes read. A rerun only reads the bytes appended since then.
+    If the file shrank, the bytes read changed, the state file is
+    damaged or the options differ, everything is recomputed into state,
+    an empty StreamState (default options when None). A last line
+    without a newline is counted in the results but not saved, as it
+    may still grow. Returns the statistics and the warnings of the file.
+    """
+    if state is None:
+        state = StreamState()
+    saved = load_state(state_file)
+    options = state_options(filename, state, max_warnings)
+    try:
+        with open(filename, 'rb') as file:
+            saved, state, warnings, notes = read_appended(
+                file, saved, options, state, max_warnings)
+
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return {}, ["File not found."]
+    except (IOError, OSError) as file_error:
+        print(f"File error: {file_error}")
+        return {}, [f"File error: {file_error}"]
+
+    save_state(state_file, saved)
+    return state.statistics(percentiles), notes + warnings.messages()
@@ -0,0 +1,127 @@
+"""
+Unit tests for incremental.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import incremental
+from states import StreamState
+
+from numeric_reader import read_numbers
+
+
+class TestIncrementalStatistics(unittest.TestCase):
+    """Reruns read the appended data or recompute everything."""
+
+    PERCENTILES = (10, 50, 90)
+
+    def setUp(self):
+        """Picks a data file and a state file in a new directory."""
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "data.txt")
+        self.state_file = os.path.join(self.directory, "state.json")
+
+    def tearDown(self):
+        """Deletes the files."""
+        shutil.rmtree(self.directory)
+
+    def write(self, text, mode='w'):
+        """Writes or appends text to the data file."""
+        with open(self.filename, mode, encoding='utf-8') as file:
+            file.write(text)
+
+    def run_incremental(self, max_warnings=None):
+        """Returns the statistics and warnings of an incremental run."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return incremental.incremental_statistics(
+                self.filename, self.state_file, self.PERCENTILES,
+                StreamState(), max_warnings)
+
+    def expected(self):
+        """Returns the statistics and warnings of a full run."""
+        numbers, warnings = read_numbers(self.filename)
+        return (StreamState().update(numbers).statistics(self.PERCENTILES),
+                warnings.messages())
+
+    def read_saved(self):
+        """Returns the saved state."""
+        with open(self.state_file, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def test_append_resumes(self):
+        """TC-01: Appended lines are read after the saved offset."""
+        self.write("1\n\n2.5 3\n")
+        self.assertEqual(self.run_incremental(), self.expected())
+        self.write("4\nnone\n\n7\n", 'a')
+        stats, invalid_lines = self.run_incremental()
+        self.assertEqual((stats, invalid_lines), self.expected())
+        self.assertEqual(invalid_lines, [
+            "Warning: Line 2 is empty.",
+            "Warning: No valid numbers on line 5: none",
+            "Warning: Line 6 is empty."])
+        saved = self.read_saved()
+        self.assertEqual(saved["offset"], os.path.getsize(self.filename))
+        self.assertEqual(saved["lines"], 7)
+
+    def test_unfinished_line_not_saved(self):
+        """TC-02: A last line without a newline is read again later."""
+        self.write("1\n2\n3")
+        stats = self.run_incremental()[0]
+        self.assertEqual(stats["mean"], 2)
+        self.assertEqual(self.read_saved()["offset"], 4)
+        self.write("4\n", 'a')
+        self.assertEqual(self.run_incremental(), self.expected())
+        self.assertEqual(self.expected()[0]["mode"], [1.0, 2.0, 34.0])
+
+    def test_truncated_file_recomputed(self):
+        """TC-03: A file that shrank is recomputed from the start."""
+        self.write("".join(f"{number}\n" for number in range(100)))
+        self.run_incremental()
+        self.write("5\n6\n")
+        stats, invalid_lines = self.run_incremental()
+        self.assertIn("changed since the last run", invalid_lines[0])
+        self.assertEqual((stats, invalid_lines[1:]), self.expected())
+
+    def test_rewritten_file_recomputed(self):
+        """TC-04: Changed bytes of the same size are recomputed."""
+        self.write("10\n20\n")
+        self.run_incremental()
+        self.write("30\n40\n")
+        stats, invalid_lines = self.run_incremental()
+        self.assertIn("changed since the last run", invalid_lines[0])
+        self.assertEqual(stats["mean"], 35)
+
+    def test_corrupt_state_recomputed(self):
+        """TC-05: A damaged state file is replaced by a full run."""
+        self.write("1\n2\n\n3\n")
+        for content in ("{not json", "[1, 2]", '{"offset": "8"}',
+                        '{"offset": 2, "state": {}, "lines": 1}'):
+            with open(self.state_file, 'w', encoding='utf-8') as file:
+                file.write(content)
+            stats, invalid_lines = self.run_incremental()
+            expected, expected_lines = self.expected()
+            self.assertEqual(stats, expected)
+            self.assertEqual(invalid_lines[-len(expected_lines):],
+                             expected_lines)
+            self.assertEqual(self.read_saved()["offset"], 7)
+
+    def test_options_change_recomputed(self):
+        """TC-06: Other options than the saved ones recompute the file."""
+        self.write("\n\n1\n")
+        self.run_incremental()
+        stats, invalid_lines = self.run_incremental(max_warnings=1)
+        self.assertIn("changed since the last run", invalid_lines[0])
+        self.assertEqual(invalid_lines[1:], [
+            "Warning: Line 1 is empty.",
+            "Warning: 1 more empty lines not listed."])
+        self.assertEqual(stats["mean"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Module for finding the numbers at given ranks without sorting them.
+
+Used by compute_statistics for the exact median and percentiles, over
+a list of numbers or over the counts of its distinct numbers.
+"""
+
+import math
+import random
+
+SELECT_CUTOFF = 64  # Below this size selection just sorts the numbers
+
+
+def select_ranks(numbers, ranks, seed=0):
+    """Returns the numbers found at ranks if numbers were sorted.
+
+    Ranks are 0-based and the result maps every rank to its number.
+    Uses quickselect with a random pivot and a three-way partition over
+    a copy of the numbers, descending only into the parts that hold a
+    wanted rank, so the expected time is linear instead of the
+    O(n log n) of sorting.
+    """
+    rng = random.Random(seed)
+    found = {}
+    pending = [(list(numbers), 0, sorted(set(ranks)))]
+    while pending:
+        data, offset, wanted = pending.pop()
+        if len(data) <= SELECT_CUTOFF:
+            data.sort()
+            for rank in wanted:
+                found[rank] = data[rank - offset]
+        else:
+            pivot = data[rng.randrange(len(data))]
+            pending.extend(partition(data, offset, wanted, pivot, found))
+    return found
+
+
+def partition(data, offset, wanted, pivot, found):
+    """Splits the numbers of one quickselect step around a pivot.
+
+    data holds the numbers of ranks offset onwards. The wanted ranks
+    that fall on the pivot are stored in found; returns the (numbers,
+    offset, ranks) parts below and above the pivot that still hold a
+    wanted rank.
+    """
+    lows = [number for number in data if number < pivot]
+    highs = [number for number in data if number > pivot]
+    low_end = offset + len(lows)
+    high_start = offset + len(data) - len(highs)
+    for rank in wanted:
+        if low_end <= rank < high_start:
+            found[rank] = pivot
+    parts = []
+    below = [rank for rank in wanted if rank < low_end]
+    if below:
+        parts.append((lows, offset, below))
+    above = [rank for rank in wanted if rank >= high_start]
+    if above:
+        parts.append((highs, high_start, above))
+    return parts
+
+
+def percentile_key(percentile):
+    """Returns the results key of a percentile, e.g. p90 or p99.9."""
+    return f"p{percentile:g}"
+
+
+def select_counted_ranks(freq, ranks):
+    """Returns the numbers found at ranks, like select_ranks.
+
+    Works over a map of every distinct number to its count, walking the
+    distinct numbers in order.
+    """
+    found = {}
+    wanted = sorted(set(ranks))
+    position = 0
+    cumulative = 0
+    for number in sorted(freq):
+        cumulative += freq[number]
+        while position < len(wanted) and wanted[position] < cumulative:
+            found[wanted[position]] = number
+            position += 1
+        if position == len(wanted):
+            break
+    return found
+
+
+def exact_median(count, select):
+    """Returns the median of count numbers, given select as below."""
+    middle = select({(count - 1) // 2, count // 2})
+    if count % 2 == 0:
+        return (middle[count // 2 - 1] + middle[count // 2]) / 2
+    return middle[count // 2]
+
+
+def exact_percentiles(count, percentiles, select):
+    """Returns the percentiles of count numbers, interpolating ranks.
+
+    select maps a set of ranks to their numbers, as select_ranks does.
+    Uses the linear interpolation of NumPy's default percentile method.
+    """
+    positions = {percentile: (count - 1) * (percentile / 100)
+                 for percentile in percentiles}
+    ranks = set()
+    for position in positions.values():
+        ranks.add(math.floor(position))
+        ranks.add(min(math.floor(position) + 1, count - 1))
+    values = select(ranks)
+    results = {}
+    for percentile, position in positions.items():
+        lower = math.floor(position)
+        low = values[lower]
+        high = values[min(lower + 1, count - 1)]
+        fraction = position - lower
+        if fraction < 0.5:
+            value = low + (high - low) * fraction
+        else:  # Like NumPy, interpolate from the closest end
+            value = high - (high - low) * (1 - fraction)
+        results[percentile_key(percentile)] = value
+    return results
@@ -0,0 +1,355 @@
+"""
+Module of the mergeable states of compute_statistics.
+
+A state summarizes some numbers so that the states of consecutive parts
+of the data, read by worker processes or by consecutive runs, merge
+into the state of the whole data. RunningStats keeps the count, mean
+and variance, StreamState adds bounded quantiles and mode for one-pass
+statistics, and count_state keeps the count of every distinct number
+for exact ones.
+"""
+
+import collections
+import itertools
+import operator
+import os
+import sys
+
+from selection import (
+    exact_median, exact_percentiles, percentile_key, select_counted_ranks,
+    select_ranks)
+
+try:
+    from numeric_reader import iter_chunks
+except ImportError:  # Run as a script, the shared modules are one level up
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from numeric_reader import iter_chunks
+from sketches import KLLSketch, SpaceSaving
+
+CHUNK_SIZE = 1 << 16  # Numbers added to the streaming states at once
+QUANTILE_ERROR = 0.01  # Default rank error of the streaming quantiles
+MODE_CAPACITY = 1024  # Default numbers monitored by the streaming mode
+
+
+class RunningStats:
+    """Running count, mean and variance of a stream of numbers.
+
+    Uses Welford's algorithm, so each number is seen once and memory is
+    constant. Two states built over separate parts of the data can be
+    combined with merge, giving the state of the whole data.
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2  # Sum of squared differences from the mean
+
+    def add(self, number):
+        """Adds one number to the state."""
+        self.count += 1
+        delta = number - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (number - self.mean)
+
+    def update(self, numbers):
+        """Adds every number of an iterable and returns the state."""
+        count, mean, m2 = self.count, self.mean, self.m2
+        for number in numbers:
+            count += 1
+            delta = number - mean
+            mean += delta / count
+            m2 += delta * (number - mean)
+        self.count, self.mean, self.m2 = count, mean, m2
+        return self
+
+    def merge(self, other):
+        """Adds the numbers summarized by other and returns the state."""
+        count = self.count + other.count
+        if other.count:
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self.m2 += other.m2 + delta * delta * self.count * (
+                other.count / count)
+            self.count = count
+        return self
+
+    @property
+    def variance(self):
+        """Population variance of the numbers."""
+        return self.m2 / self.count
+
+    @property
+    def std_dev(self):
+        """Population standard deviation of the numbers."""
+        return self.variance ** 0.5
+
+    def to_dict(self):
+        """Returns the state as a JSON serializable dictionary."""
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a state from the dictionary of to_dict."""
+        return cls(data["count"], data["mean"], data["m2"])
+
+
+class ModeTracker:
+    """Mode of a stream of numbers in bounded memory.
+
+    While the numbers arrive sorted, runs of equal numbers are scanned
+    and only the first run, the last run and the longest runs in
+    between are kept, which gives the exact mode in constant memory.
+    At most capacity of the runs tied for the longest are reported; one
+    more is kept to tell that the list was cut, and the mode is then no
+    longer exact.
+    update also feeds a SpaceSaving summary, used once the stream turns
+    out not to be sorted; its mode is only exact if no number had to be
+    evicted. Trackers of consecutive parts of the data can be merged.
+    """
+
+    def __init__(self, capacity=MODE_CAPACITY):
+        self.in_order = True
+        self.runs = 0
+        self.head = None  # First (number, length) run
+        self.tail = None  # Last (number, length) run, still open
+        self.best = 0  # Longest run between head and tail
+        self.modes = []  # Numbers of the first capacity + 1 runs of best
+        self.summary = SpaceSaving(capacity)
+
+    def add_inner(self, number, length):
+        """Records a run that lies between the head and the tail."""
+        if length > self.best:
+            self.best = length
+            self.modes = [number]
+        elif length == self.best and len(self.modes) <= self.summary.capacity:
+            self.modes.append(number)
+
+    def add_run(self, number, length):
+        """Appends a run of length times number, in sorted order."""
+        if self.runs and number == self.tail[0]:
+            self.tail = (number, self.tail[1] + length)
+        else:
+            if self.runs >= 2:
+                self.add_inner(*self.tail)
+            self.tail = (number, length)
+            self.runs += 1
+        if self.runs == 1:
+            self.head = self.tail
+
+    def scan(self, numbers):
+        """Scans the runs of a list of numbers while they are sorted."""
+        if not self.in_order or not numbers:
+            return self
+        if ((self.runs and numbers[0] < self.tail[0])
+                or any(map(operator.gt, numbers,
+                           itertools.islice(numbers, 1, None)))):
+            self.in_order = False
+            return self
+        for number, group in itertools.groupby(numbers):
+            self.add_run(number, sum(1 for _ in group))
+        return self
+
+    def update(self, numbers):
+        """Adds a list of numbers and returns the tracker."""
+        self.summary.update_counts(collections.Counter(numbers).items())
+        return self.scan(numbers)
+
+    def merge(self, other):
+        """Adds the numbers of other, which follow, and returns self."""
+        self.summary.merge(other.summary)
+        if not (self.in_order and other.in_order):
+            self.in_order = False
+            return self
+        if not other.runs:
+            return self
+        if self.runs and self.tail[0] > other.head[0]:
+            self.in_order = False
+            return self
+
+        self.add_run(*other.head)
+        if other.runs >= 2:
+            if self.runs >= 2:
+                self.add_inner(*self.tail)
+            if other.best:
+                if other.best > self.best:
+                    self.best, self.modes = other.best, []
+                if other.best == self.best:
+                    room = self.summary.capacity + 1 - len(self.modes)
+                    self.modes.extend(other.modes[:max(room, 0)])
+            self.tail = other.tail
+            self.runs += other.runs - 1
+        return self
+
+    def result(self):
+        """Returns the modes, in order of appearance, and if exact."""
+        if not self.in_order:
+            return self.summary.modes(), not self.summary.evicted
+        if not self.runs:
+            return [], True
+        edges = [self.head] + ([self.tail] if self.runs >= 2 else [])
+        top = max([self.best] + [length for _, length in edges])
+        modes = [self.head[0]] if self.head[1] == top else []
+        exact = True
+        if self.best == top:
+            modes.extend(self.modes[:self.summary.capacity])
+            exact = len(self.modes) <= self.summary.capacity
+        if self.runs >= 2 and self.tail[1] == top:
+            modes.append(self.tail[0])
+        return modes, exact
+
+    def to_dict(self):
+        """Returns the tracker as a JSON serializable dictionary."""
+        return {"in_order": self.in_order, "runs": self.runs,
+                "head": self.head, "tail": self.tail, "best": self.best,
+                "modes": self.modes, "summary": self.summary.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a tracker from the dictionary of to_dict."""
+        tracker = cls()
+        tracker.in_order = data["in_order"]
+        tracker.runs = data["runs"]
+        tracker.head = tuple(data["head"]) if data["head"] else None
+        tracker.tail = tuple(data["tail"]) if data["tail"] else None
+        tracker.best = data["best"]
+        tracker.modes = data["modes"]
+        tracker.summary = SpaceSaving.from_dict(data["summary"])
+        return tracker
+
+
+class StreamState:
+    """Mergeable state of the streaming statistics of some numbers.
+
+    Combines a RunningStats, a KLLSketch for the quantiles and a
+    ModeTracker, all bounded in memory.
+    """
+
+    def __init__(self, error=QUANTILE_ERROR, capacity=MODE_CAPACITY,
+                 seed=0):
+        self.running = RunningStats()
+        self.quantiles = KLLSketch.for_error(error, seed)
+        self.modes = ModeTracker(capacity)
+
+    def update(self, numbers):
+        """Adds every number of an iterable and returns the state."""
+        for chunk in iter_chunks(numbers, CHUNK_SIZE):
+            self.running.update(chunk)
+            self.quantiles.update(chunk)
+            self.modes.update(chunk)
+        return self
+
+    def merge(self, other):
+        """Adds the numbers of other, which follow, and returns self."""
+        self.running.merge(other.running)
+        self.quantiles.merge(other.quantiles)
+        self.modes.merge(other.modes)
+        return self
+
+    def statistics(self, percentiles=()):
+        """Returns the statistics of the numbers added so far.
+
+        While the sketch still holds every number, as for small groups
+        and windows, median and percentiles are exact.
+        """
+        running = self.running
+        if not running.count:
+            return {}
+
+        quantiles = self.quantiles
+        if quantiles.size == running.count:
+            numbers = quantiles.compactors[0]
+
+            def select(ranks):
+                return select_ranks(numbers, ranks)
+
+            median = exact_median(running.count, select)
+            ranked = exact_percentiles(running.count, percentiles, select)
+        else:
+            median = quantiles.quantile(0.5)
+            ranked = {percentile_key(percentile):
+                      quantiles.quantile(percentile / 100)
+                      for percentile in percentiles}
+
+        mode, mode_exact = self.modes.result()
+        stats = {
+            "mean": running.mean,
+            "median": median,
+            "mode": mode,
+            "mode_exact": mode_exact,
+            "variance": running.variance,
+            "std_dev": running.std_dev,
+        }
+        stats.update(ranked)
+        return stats
+
+    def to_dict(self):
+        """Returns the state as a JSON serializable dictionary."""
+        return {"running": self.running.to_dict(),
+                "quantiles": self.quantiles.to_dict(),
+                "modes": self.modes.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a state from the dictionary of to_dict."""
+        state = cls.__new__(cls)
+        state.running = RunningStats.from_dict(data["running"])
+        state.quantiles = KLLSketch.from_dict(data["quantiles"])
+        state.modes = ModeTracker.from_dict(data["modes"])
+        return state
+
+
+def stream_statistics(numbers, percentiles=(), error=QUANTILE_ERROR,
+                      capacity=MODE_CAPACITY):
+    """Computes the statistics of an iterable in one pass.
+
+    Memory is bounded no matter the number of values. Mean, variance and
+    std dev are exact up to rounding; median and percentiles come from
+    a KLLSketch and are within about error of their rank, or exact
+    while the sketch holds every number. The mode is exact for sorted
+    input or up to capacity distinct numbers, and mode_exact tells
+    whether it is.
+    """
+    return StreamState(error, capacity).update(numbers).statistics(
+        percentiles)
+
+
+def count_state(numbers):
+    """Returns the RunningStats and the map of counts of an iterable.
+
+    The counts keep the order in which numbers first appear.
+    """
+    running = RunningStats()
+    freq = {}
+    for chunk in iter_chunks(numbers, CHUNK_SIZE):
+        running.update(chunk)
+        for num in chunk:
+            freq[num] = freq.get(num, 0) + 1
+    return running, freq
+
+
+def count_statistics(running, freq, percentiles=()):
+    """Returns the statistics of compute_statistics from merged states.
+
+    Median, mode and percentiles are exact, as they are read from the
+    count of every distinct number.
+    """
+    count = running.count
+    if not count:
+        return {}
+
+    def select(ranks):
+        return select_counted_ranks(freq, ranks)
+
+    max_freq = max(freq.values())
+    stats = {
+        "mean": running.mean,
+        "median": exact_median(count, select),
+        "mode": [key for key, val in freq.items() if val == max_freq],
+        "variance": running.variance,
+        "std_dev": running.std_dev,
+    }
+    stats.update(exact_percentiles(count, percentiles, select))
+    return stats
@@ -0,0 +1,98 @@
+"""
+Unit tests for states.py
+"""
+
+import collections
+import json
+import random
+import unittest
+
+from states import ModeTracker, StreamState
+
+
+class TestModeTracker(unittest.TestCase):
+    """The streaming mode is exact when it says so."""
+
+    @staticmethod
+    def exact_modes(numbers):
+        """Returns the modes of numbers in order of first appearance."""
+        counts = collections.Counter(numbers)
+        top = max(counts.values())
+        return [number for number, count in counts.items() if count == top]
+
+    @staticmethod
+    def track(numbers, parts=1, capacity=16):
+        """Returns the result of trackers of parts merged in order."""
+        size = -(-len(numbers) // parts)
+        tracker = ModeTracker(capacity)
+        for start in range(0, len(numbers), size):
+            tracker.merge(ModeTracker(capacity).update(
+                numbers[start:start + size]))
+        return tracker.result()
+
+    def test_sorted_runs(self):
+        """TC-01: Sorted numbers give the exact modes in bounded memory."""
+        rng = random.Random(1)
+        numbers = sorted(float(rng.randrange(2000)) for _ in range(20000))
+        for parts in (1, 2, 7):
+            modes, exact = self.track(numbers, parts)
+            self.assertTrue(exact)
+            self.assertEqual(modes, self.exact_modes(numbers))
+
+    def test_runs_across_parts(self):
+        """TC-02: A run split between parts is counted once."""
+        numbers = [1.0, 2.0, 2.0, 2.0, 3.0, 3.0, 4.0]
+        for parts in (1, 2, 3, 7):
+            self.assertEqual(self.track(numbers, parts), ([2.0], True))
+
+    def test_unsorted_within_capacity(self):
+        """TC-03: Unsorted numbers that fit the summary are exact."""
+        numbers = [5.0, 1.0, 5.0, 2.0, 1.0, 9.0]
+        self.assertEqual(self.track(numbers, 2), ([5.0, 1.0], True))
+
+    def test_unsorted_over_capacity(self):
+        """TC-04: Too many distinct numbers make the mode approximate."""
+        rng = random.Random(2)
+        numbers = [float(rng.randrange(500)) for _ in range(5000)]
+        numbers += [42.0] * 200
+        modes, exact = self.track(numbers, 3)
+        self.assertFalse(exact)
+        self.assertEqual(modes, [42.0])
+
+    def test_sorted_distinct_bounded(self):
+        """TC-05: Ties of sorted distinct numbers are kept up to capacity."""
+        numbers = [float(number) for number in range(10 ** 5)]
+        for parts in (1, 4):
+            tracker = ModeTracker(16)
+            size = len(numbers) // parts
+            for start in range(0, len(numbers), size):
+                tracker.merge(ModeTracker(16).update(
+                    numbers[start:start + size]))
+            modes, exact = tracker.result()
+            self.assertFalse(exact)
+            self.assertEqual(modes, numbers[:17] + numbers[-1:])
+            self.assertLessEqual(len(tracker.modes), 17)
+            self.assertLess(len(json.dumps(tracker.to_dict())), 2000)
+        self.assertEqual(self.track(numbers[:10]), (numbers[:10], True))
+
+
+class TestStreamState(unittest.TestCase):
+    """Small streams get exact medians and percentiles."""
+
+    def test_exact_while_kept(self):
+        """TC-06: Quantiles interpolate while every number is kept."""
+        stats = StreamState().update([4.0, 1.0, 3.0, 2.0]).statistics((25,))
+        self.assertEqual((stats["median"], stats["p25"]), (2.5, 1.75))
+        merged = StreamState().update([1.0]).merge(
+            StreamState().update([3.0]))
+        self.assertEqual(merged.statistics()["median"], 2.0)
+
+    def test_sketch_once_compacted(self):
+        """TC-07: Larger streams read the quantiles from the sketch."""
+        state = StreamState(0.1).update(float(value) for value in range(1000))
+        self.assertLess(state.quantiles.size, state.running.count)
+        self.assertLessEqual(abs(state.statistics()["median"] - 500), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
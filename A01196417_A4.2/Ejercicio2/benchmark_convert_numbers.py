@@ -0,0 +1,63 @@
+"""
+Microbenchmark of the convert_numbers conversion engine.
+
+Compares the previous digit-by-digit conversion of convertNumbers,
+which prepends one digit per step, against the current functions for
+inputs from 8 to 4096 bits, checking that both produce identical output.
+
+Usage: python benchmark_convert_numbers.py [repetitions]
+"""
+
+import functools
+import random
+import sys
+import timeit
+
+from convertNumbers import to_binary as legacy_to_binary
+from convertNumbers import to_hexadecimal as legacy_to_hexadecimal
+from convert_numbers import to_binary, to_hexadecimal
+
+BIT_SIZES = (8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+
+def sample(bits, count=50, seed=0):
+    """Returns signed random numbers of the given bit length, plus 0."""
+    rng = random.Random(seed + bits)
+    numbers = [rng.getrandbits(bits) | (1 << (bits - 1))
+               for _ in range(count)]
+    return [0] + [-n if i % 2 else n for i, n in enumerate(numbers)]
+
+
+def convert_all(binary, hexadecimal, numbers):
+    """Converts every number with both functions."""
+    for number in numbers:
+        binary(number)
+        hexadecimal(number)
+
+
+def main():
+    """Prints the time per conversion of both engines per bit size."""
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print("Bits\tLegacy us\tCurrent us\tSpeedup")
+    for bits in BIT_SIZES:
+        numbers = sample(bits)
+        for number in numbers:
+            if (to_binary(number) != legacy_to_binary(number)
+                    or to_hexadecimal(number)
+                    != legacy_to_hexadecimal(number)):
+                raise AssertionError(f"Output differs for {number}")
+
+        per_call = repetitions * len(numbers) / 1e6
+        legacy = min(timeit.repeat(
+            functools.partial(convert_all, legacy_to_binary,
+                              legacy_to_hexadecimal, numbers),
+            number=repetitions, repeat=3)) / per_call
+        current = min(timeit.repeat(
+            functools.partial(convert_all, to_binary, to_hexadecimal,
+                              numbers),
+            number=repetitions, repeat=3)) / per_call
+        print(f"{bits}\t{legacy:.2f}\t{current:.2f}\t{legacy / current:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,22 @@
 """Convert numbers to binary and hexadecimal formats 
 from a file containing numerical data."""
 
+import os
 import sys
 import time
-import re
+
+try:
+    from numeric_reader import read_numbers
+except ImportError:  # Run as a script, numeric_reader is one level up
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from numeric_reader import read_numbers
 
 
 def read_file(filename):
     """Reads a file, extracts numbers, and handles errors gracefully."""
-    numbers = []  # Store extracted numbers
-    invalid_lines = []  # Store invalid lines
-
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            for line_num, line in enumerate(file, 1):
-                line = line.strip()
-                if not line:
-                    invalid_lines.append(
-                        f"Warning: Line {line_num} is empty."
-                    )
-                    continue
-
-                extracted_numbers = [
-                    int(number) for number in re.findall(r'-?\d+', line)
-                ]
-                if extracted_numbers:
-                    numbers.extend(extracted_numbers)
-                else:
-                    invalid_lines.append(
-                        f"Warning: No valid numbers on line {line_num}: "
-                        f"{line}"
-                    )
+        numbers, warnings = read_numbers(filename, int)
 
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
@@ -39,7 +25,7 @@ def read_file(filename):
         print(f"File error: {error}")
         return [], [f"File error: {error}"]
 
-    return numbers, invalid_lines
+    return numbers, warnings.messages()
 
 
 def to_binary(number):
@@ -1,36 +1,43 @@
 """Convert numbers to binary and hexadecimal formats 
 from a file containing numerical data."""
 
+import argparse
+import collections
+import functools
+import itertools
+import multiprocessing
+import os
+import shutil
 import sys
+import tempfile
 import time
-import re
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure Python path is used
+    np = None
+
+try:
+    from numeric_reader import (
+        ReadWarnings, count_lines, iter_chunks, iter_numbers, read_numbers,
+        split_offsets)
+except ImportError:  # Run as a script, numeric_reader is one level up
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from numeric_reader import (
+        ReadWarnings, count_lines, iter_chunks, iter_numbers, read_numbers,
+        split_offsets)
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+NUMPY_BATCH = 1 << 16  # Values converted per NumPy block
+CHUNK_SIZE = NUMPY_BATCH  # Numbers converted per pipeline step
+SPOOL_BUFFER = 1 << 20  # Buffer of the temporary output files
 
-def read_file(filename):
-    """Reads a file, extracts numbers, and handles errors gracefully."""
-    numbers = []  # Store extracted numbers
-    invalid_lines = []  # Store invalid lines
 
+def read_file(filename, max_warnings=None):
+    """Reads a file, extracts numbers, and handles errors gracefully."""
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            for line_num, line in enumerate(file, 1):
-                line = line.strip()
-                if not line:
-                    invalid_lines.append(
-                        f"Warning: Line {line_num} is empty."
-                    )
-                    continue
-
-                extracted_numbers = [
-                    int(number) for number in re.findall(r'-?\d+', line)
-                ]
-                if extracted_numbers:
-                    numbers.extend(extracted_numbers)
-                else:
-                    invalid_lines.append(
-                        f"Warning: No valid numbers on line {line_num}: "
-                        f"{line}"
-                    )
+        numbers, warnings = read_numbers(filename, int, max_warnings)
 
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
@@ -39,81 +46,463 @@ def read_file(filename):
         print(f"File error: {error}")
         return [], [f"File error: {error}"]
 
-    return numbers, invalid_lines
+    return numbers, warnings.messages()
 
 
 def to_binary(number):
-    """Manually converts a number to its binary representation."""
-    if number == 0:
-        return "0"
-    binary = ""
-    number = abs(number)  # Remove negative sign
-
-    while number > 0:
-        binary = str(number % 2) + binary
-        number //= 2
+    """Converts a number to its binary representation, without sign.
 
-    return binary  # Always return positive binary representation
+    Uses the native formatting of int, which is linear in the number of
+    digits, instead of prepending one digit at a time.
+    """
+    return format(abs(number), "b")
 
 
 def to_hexadecimal(number):
-    """Manually converts a number to its hexadecimal representation."""
+    """Converts a number to its uppercase hexadecimal form, without sign."""
+    return format(abs(number), "X")
+
+
+def to_base(number, base):
+    """Converts a number to base 2 to 36, keeping its sign."""
+    if base == 2:
+        return format(number, "b")
+    if base == 8:
+        return format(number, "o")
+    if base == 10:
+        return str(number)
+    if base == 16:
+        return format(number, "X")
     if number == 0:
         return "0"
-    hex_digits = "0123456789ABCDEF"
-    hexadecimal = ""
-    number = abs(number)  # Remove negative sign
+    digits = []
+    rest = abs(number)
+    while rest:
+        rest, digit = divmod(rest, base)
+        digits.append(DIGITS[digit])
+    if number < 0:
+        digits.append("-")
+    return "".join(reversed(digits))
 
-    while number > 0:
-        remainder = number % 16
-        hexadecimal = hex_digits[remainder] + hexadecimal
-        number //= 16
 
-    return hexadecimal  # Always return positive hexadecimal
+def fits_width(number, bits):
+    """Tells whether a number fits in bits as a two's complement integer.
 
+    Only the signed range is accepted, so every bits-wide output has a
+    single number.
+    """
+    return -(1 << (bits - 1)) <= number < (1 << (bits - 1))
 
-def write_results_to_file(conversions, invalid_lines, execution_time):
-    """Writes conversion results and errors to a results file."""
-    with open('ConvertionResults.txt', 'w', encoding='utf-8') as file:
-        file.write("\nWarnings and Errors:\n")
-        for line in invalid_lines:
-            file.write(f"{line}\n")
 
-        file.write("\nNumber Conversions:\n")
-        for number, binary, hexa in conversions:
-            file.write(
-                f"Number: {number}, Binary: {binary}, Hex: {hexa}\n"
-            )
+def width_for(bits, base):
+    """Returns the digits needed to write any bits-wide value in base."""
+    return len(to_base((1 << bits) - 1, base))
 
-        file.write(f"\nExecution Time: {execution_time:.2f} sec\n")
 
+def to_twos_complement(number, bits, base=2):
+    """Converts a number to its fixed-width two's complement in base.
 
-def main():
-    """Main function to process file and convert numbers."""
-    if len(sys.argv) != 2:
-        print("Usage: python convertNumbers.py <fileWithData.txt>")
-        return
+    Negative numbers are written as 2**bits + number, zero padded to
+    the width of the largest bits-wide value.
+    """
+    if not fits_width(number, bits):
+        raise ValueError(f"{number} does not fit in {bits} bits")
+    return to_base(number & ((1 << bits) - 1), base).zfill(
+        width_for(bits, base))
 
-    filename = sys.argv[1]
-    start_time = time.time()
 
-    numbers, invalid_lines = read_file(filename)
-    conversions = [
-        (num, to_binary(num), to_hexadecimal(num)) for num in numbers
-    ]
-    execution_time = time.time() - start_time
+def numpy_fixed_width(values, bits, base):
+    """Converts a uint64 array to fixed-width digit strings in base.
+
+    Every digit column is computed for the whole block at once and the
+    resulting byte matrix is viewed as one string per row.
+    """
+    width = width_for(bits, base)
+    table = np.frombuffer(DIGITS.encode("ascii"), dtype=np.uint8)
+    digits = np.empty((len(values), width), dtype=np.uint8)
+    rest = values.copy()
+    for column in range(width - 1, -1, -1):
+        rest, digit = np.divmod(rest, np.uint64(base))
+        digits[:, column] = digit
+    return table[digits].view(f"S{width}").ravel().astype(str).tolist()
+
+
+def convert_one(number, bits=None, bases=()):
+    """Converts one number like convert_batch, without NumPy."""
+    if bits is None:
+        magnitude = abs(number)
+        return ((number, format(magnitude, "b"), format(magnitude, "X"))
+                + tuple(to_base(magnitude, base) for base in bases))
+    return (number,) + tuple(to_twos_complement(number, bits, base)
+                             for base in (2, 16) + tuple(bases))
+
+
+def convert_batch(numbers, bits=None, bases=()):
+    """Converts every number to a (number, binary, hexadecimal, ...) tuple.
+
+    Extra columns are added for every base in bases. Without bits every
+    form drops the sign, as the binary and hexadecimal did before; with
+    bits all forms are fixed-width two's complement. Numbers must fit in bits
+    (see fits_width). Widths up to 64 bits use NumPy when available.
+    """
+    if bits is None or np is None or bits > 64:
+        return [convert_one(number, bits, bases) for number in numbers]
+
+    all_bases = (2, 16) + tuple(bases)
+    mask = (1 << bits) - 1
+    conversions = []
+    for start in range(0, len(numbers), NUMPY_BATCH):
+        block = numbers[start:start + NUMPY_BATCH]
+        values = np.fromiter((number & mask for number in block),
+                             dtype=np.uint64, count=len(block))
+        columns = [numpy_fixed_width(values, bits, base)
+                   for base in all_bases]
+        conversions.extend(zip(block, *columns))
+    return conversions
+
+
+def base_labels(bases):
+    """Returns the output labels of the extra bases."""
+    return ["Octal" if base == 8 else f"Base{base}" for base in bases]
+
+
+def format_conversion(conversion, labels):
+    """Formats one conversion tuple as an output line."""
+    number, binary, hexa = conversion[:3]
+    line = f"Number: {number}, Binary: {binary}, Hex: {hexa}"
+    for label, value in zip(labels, conversion[3:]):
+        line += f", {label}: {value}"
+    return line
+
+
+def keep_fitting(numbers, bits, warn):
+    """Yields the numbers that fit in bits, warning about the rest."""
+    for number in numbers:
+        if fits_width(number, bits):
+            yield number
+        else:
+            warn(f"Warning: {number} does not fit in {bits} bits.")
+
+
+class Converter:
+    """Writes the output lines of streams of numbers.
+
+    Numbers are converted in chunks with convert_batch. With cache_size
+    every line is instead rendered through an LRU cache of that many
+    numbers, which pays off when few values repeat many times; hits and
+    misses are accumulated over every call to write. With dedup the
+    numbers are only counted, and write_counts reports every distinct
+    number once, in order of first appearance, with its occurrences.
+    max_warnings limits the empty lines and lines without numbers that
+    are listed, of each kind. Repeated bases, and bases 2 and 16 that
+    are always written, are dropped.
+    """
+
+    def __init__(self, bits=None, bases=(), cache_size=None, dedup=False,
+                 max_warnings=None):
+        self.bits = bits
+        self.bases = tuple(base for base in dict.fromkeys(bases)
+                           if base not in (2, 16))
+        self.cache_size = cache_size
+        self.dedup = dedup
+        self.max_warnings = max_warnings
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def labels(self):
+        """Output labels of the extra bases."""
+        return base_labels(self.bases)
+
+    def render(self, number):
+        """Returns the output line of one number."""
+        conversion = convert_one(number, self.bits, self.bases)
+        return f"{format_conversion(conversion, self.labels)}\n"
+
+    def write(self, numbers, output):
+        """Writes the line of every number to output.
+
+        With dedup nothing is written and the Counter of the numbers is
+        returned instead; otherwise None is returned.
+        """
+        if self.dedup:
+            return collections.Counter(numbers)
+
+        if self.cache_size:
+            render = functools.lru_cache(maxsize=self.cache_size)(
+                self.render)
+            output.writelines(map(render, numbers))
+            info = render.cache_info()
+            self.hits += info.hits
+            self.misses += info.misses
+            return None
+
+        labels = self.labels
+        for chunk in iter_chunks(numbers, CHUNK_SIZE):
+            output.writelines(
+                f"{format_conversion(conversion, labels)}\n"
+                for conversion in convert_batch(chunk, self.bits,
+                                                self.bases))
+        return None
+
+    def write_counts(self, counts, output):
+        """Writes the line of every distinct number with its count."""
+        labels = self.labels
+        for chunk in iter_chunks(counts, CHUNK_SIZE):
+            output.writelines(
+                f"{format_conversion(conversion, labels)}, "
+                f"Count: {counts[conversion[0]]}\n"
+                for conversion in convert_batch(chunk, self.bits,
+                                                self.bases))
+
+    def cache_report(self):
+        """Returns the cache statistics line, or None without cache."""
+        if not self.cache_size:
+            return None
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return (f"Cache: {self.hits} hits, {self.misses} misses, "
+                f"{hit_rate:.2%} hit rate (size {self.cache_size})")
+
 
-    print("\nWarnings and Errors:")
-    for line in invalid_lines:
-        print(line)
+def convert_file(filename, spools, converter=None):
+    """Converts a file chunk by chunk into two text spools.
 
-    print("\nNumber Conversions:")
-    for num, binary, hexa in conversions:
-        print(f"Number: {num}, Binary: {binary}, Hex: {hexa}")
+    spools is the (warnings, output) pair of text files: the numbers
+    that do not fit in the bits of the converter are reported to
+    warnings and the lines of the converter are written to output, so
+    memory stays bounded by CHUNK_SIZE (or by the distinct numbers with
+    dedup) no matter the size of the file. Returns the ReadWarnings of
+    the lines without numbers. As in read_file, a file error discards
+    any conversion and is the only warning reported.
+    """
+    converter = converter or Converter()
+    warnings, output = spools
+    read_warnings = ReadWarnings(converter.max_warnings)
 
-    print(f"\nExecution Time: {execution_time:.2f} sec")
+    def warn(message):
+        warnings.write(f"{message}\n")
+
+    try:
+        with open(filename, 'rb') as file:
+            numbers = iter_numbers(file, read_warnings, int)
+            if converter.bits is not None:
+                numbers = keep_fitting(numbers, converter.bits, warn)
+            counts = converter.write(numbers, output)
+            if counts is not None:
+                converter.write_counts(counts, output)
+
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        message = "File not found."
+    except (IOError, OSError) as error:
+        print(f"File error: {error}")
+        message = f"File error: {error}"
+    else:
+        return read_warnings
+    for spool in spools:
+        spool.seek(0)
+        spool.truncate()
+    warn(message)
+    return ReadWarnings(converter.max_warnings)
+
+
+def convert_range(task):
+    """Converts a byte range of a file in a worker process.
+
+    The fit warnings and the lines of the converter are written to two
+    files of directory. Returns their paths, the ReadWarnings of the
+    range, the Counter of the numbers with dedup (or None) and the
+    cache hits and misses. Lines are numbered from the first_line of
+    the range, so warnings match a serial run.
+    """
+    filename, start, end, first_line, converter, directory = task
+    bits = converter.bits
+    read_warnings = ReadWarnings(converter.max_warnings)
+    with open(filename, 'rb') as file, \
+            tempfile.NamedTemporaryFile(
+                "w", dir=directory, delete=False, buffering=SPOOL_BUFFER,
+                encoding="utf-8", suffix=".warnings") as warnings, \
+            tempfile.NamedTemporaryFile(
+                "w", dir=directory, delete=False, buffering=SPOOL_BUFFER,
+                encoding="utf-8", suffix=".conversions") as output:
+
+        def warn(message):
+            warnings.write(f"{message}\n")
+
+        numbers = iter_numbers(file, read_warnings, int,
+                               (start, end, first_line))
+        if bits is not None:
+            numbers = keep_fitting(numbers, bits, warn)
+        counts = converter.write(numbers, output)
+    return (warnings.name, output.name, read_warnings, counts,
+            converter.hits, converter.misses)
+
+
+def merge_chunk(path, spool):
+    """Appends the content of a chunk file to a spool and deletes it."""
+    with open(path, 'r', encoding='utf-8') as chunk:
+        shutil.copyfileobj(chunk, spool)
+    os.remove(path)
+
+
+def merge_ranges(results, spools, converter):
+    """Merges the results of convert_range, given in file order.
+
+    The chunk files are appended to the spools and the cache hits and
+    misses are added to converter. Returns the merged ReadWarnings and
+    the merged Counter of the numbers, empty without dedup.
+    """
+    read_warnings = ReadWarnings(converter.max_warnings)
+    total_counts = collections.Counter()
+    for (warnings_path, output_path, range_warnings, counts,
+         hits, misses) in results:
+        merge_chunk(warnings_path, spools[0])
+        merge_chunk(output_path, spools[1])
+        read_warnings.merge(range_warnings)
+        if counts is not None:
+            total_counts.update(counts)
+        converter.hits += hits
+        converter.misses += misses
+    return read_warnings, total_counts
+
+
+def convert_file_parallel(filename, spools, workers, converter=None):
+    """Converts a file like convert_file, splitting it across workers.
+
+    The file is cut into line-aligned byte ranges. The workers first
+    count the lines of every range, so each range knows the number of
+    its first line, and then convert their range into chunk files that
+    are merged into the spools in the original order. The ReadWarnings
+    of the ranges are merged and returned. With dedup the counts of
+    the ranges are merged, keeping the order of first appearance, and
+    written at the end.
+    """
+    converter = converter or Converter()
+    try:
+        ranges = split_offsets(filename, workers)
+    except (IOError, OSError):
+        ranges = []
+    if len(ranges) < 2:
+        return convert_file(filename, spools, converter)
+
+    with multiprocessing.Pool(min(workers, len(ranges))) as pool, \
+            tempfile.TemporaryDirectory() as directory:
+        newlines = pool.map(count_lines,
+                            [(filename, start, end) for start, end in ranges])
+        first_lines = itertools.accumulate([1] + newlines[:-1])
+        tasks = [(filename, start, end, first_line, converter, directory)
+                 for (start, end), first_line in zip(ranges, first_lines)]
+        read_warnings, total_counts = merge_ranges(
+            pool.imap(convert_range, tasks), spools, converter)
+
+    if converter.dedup:
+        converter.write_counts(total_counts, spools[1])
+    return read_warnings
+
+
+def write_report(target, spools, execution_time, notes=(),
+                 read_warnings=()):
+    """Writes the report sections, copying both spools into target.
+
+    The read_warnings lines are written before the warnings spool, and
+    every note as a line after the execution time.
+    """
+    warnings, output = spools
+    target.write("\nWarnings and Errors:\n")
+    for line in read_warnings:
+        target.write(f"{line}\n")
+    warnings.seek(0)
+    shutil.copyfileobj(warnings, target)
+
+    target.write("\nNumber Conversions:\n")
+    output.seek(0)
+    shutil.copyfileobj(output, target)
+
+    target.write(f"\nExecution Time: {execution_time:.2f} sec\n")
+    for note in notes:
+        target.write(f"{note}\n")
+
+
+def write_results_to_file(spools, execution_time, echo=True, notes=(),
+                          read_warnings=()):
+    """Writes conversion results and errors to a results file.
+
+    The report is also echoed to the console unless echo is False.
+    """
+    if echo:
+        write_report(sys.stdout, spools, execution_time, notes,
+                     read_warnings)
+    with open('ConvertionResults.txt', 'w', encoding='utf-8') as file:
+        write_report(file, spools, execution_time, notes, read_warnings)
+
+
+def parse_args():
+    """Parses the command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Convert numbers to binary and hexadecimal.")
+    parser.add_argument("filename", help="file with the numbers to convert")
+    parser.add_argument("--bits", type=int,
+                        help="fixed width two's complement output (e.g. 8, "
+                             "16, 32, 64 or any positive width); numbers "
+                             "outside -2**(N-1) to 2**(N-1)-1 are skipped")
+    parser.add_argument("--octal", action="store_true",
+                        help="add the octal representation")
+    parser.add_argument("--base", type=int,
+                        help="add the representation in base 2 to 36")
+    parser.add_argument("--quiet", action="store_true",
+                        help="only write the results file, without echoing "
+                             "it to the console")
+    parser.add_argument("--max-warnings", type=int, metavar="N",
+                        help="list at most N empty lines and N lines "
+                             "without numbers, counting the rest (default "
+                             "all)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes used to convert the file")
+    repeated = parser.add_mutually_exclusive_group()
+    repeated.add_argument("--cache", type=int, metavar="SIZE",
+                          help="keep the lines of the last SIZE distinct "
+                               "numbers in an LRU cache and report its hit "
+                               "rate")
+    repeated.add_argument("--dedup", action="store_true",
+                          help="report every distinct number once with its "
+                               "number of occurrences")
+    args = parser.parse_args()
+    if args.bits is not None and args.bits < 1:
+        parser.error("--bits must be positive")
+    if args.base is not None and not 2 <= args.base <= 36:
+        parser.error("--base must be between 2 and 36")
+    if args.cache is not None and args.cache < 1:
+        parser.error("--cache must be positive")
+    if args.max_warnings is not None and args.max_warnings < 0:
+        parser.error("--max-warnings cannot be negative")
+    return args
+
+
+def main():
+    """Main function to process file and convert numbers."""
+    args = parse_args()
+    bases = ([8] if args.octal else []) + (
+        [args.base] if args.base else [])
+    converter = Converter(args.bits, bases, args.cache, args.dedup,
+                          args.max_warnings)
+    start_time = time.time()
 
-    write_results_to_file(conversions, invalid_lines, execution_time)
+    with tempfile.TemporaryFile("w+", buffering=SPOOL_BUFFER,
+                                encoding="utf-8") as warnings, \
+            tempfile.TemporaryFile("w+", buffering=SPOOL_BUFFER,
+                                   encoding="utf-8") as output:
+        spools = (warnings, output)
+        if args.workers > 1:
+            read_warnings = convert_file_parallel(
+                args.filename, spools, args.workers, converter)
+        else:
+            read_warnings = convert_file(args.filename, spools, converter)
+        execution_time = time.time() - start_time
+        notes = [note for note in [converter.cache_report()] if note]
+        write_results_to_file(spools, execution_time, echo=not args.quiet,
+                              notes=notes,
+                              read_warnings=read_warnings.messages())
 
 
 if __name__ == "__main__":
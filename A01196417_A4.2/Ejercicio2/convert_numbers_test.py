@@ -0,0 +1,196 @@
+"""
+Unit tests for convert_numbers.py
+"""
+
+import io
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import convertNumbers
+import convert_numbers
+from convert_numbers import np
+
+
+class TestParallelConvert(unittest.TestCase):
+    """Converting a file in worker processes matches a serial run."""
+
+    def setUp(self):
+        """Writes a file of numbers with empty and invalid lines."""
+        rng = random.Random(0)
+        lines = []
+        for _ in range(5000):
+            choice = rng.random()
+            if choice < 0.02:
+                lines.append("")
+            elif choice < 0.04:
+                lines.append("no numbers")
+            elif choice < 0.6:
+                lines.append(str(rng.randint(-300, 300)))
+            else:
+                lines.append(f"{rng.randint(-10**12, 10**12)} "
+                             f"{rng.randint(0, 9)}")
+        handle, self.filename = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            file.write("\n".join(lines) + "\n")
+
+    def tearDown(self):
+        """Deletes the test file."""
+        os.remove(self.filename)
+
+    def convert(self, workers, **options):
+        """Returns the spools, warnings and cache lookups of a run."""
+        converter = convert_numbers.Converter(**options)
+        spools = (io.StringIO(), io.StringIO())
+        if workers > 1:
+            read_warnings = convert_numbers.convert_file_parallel(
+                self.filename, spools, workers, converter)
+        else:
+            read_warnings = convert_numbers.convert_file(
+                self.filename, spools, converter)
+        return ([spool.getvalue() for spool in spools],
+                read_warnings.messages(), converter.hits + converter.misses)
+
+    def check(self, **options):
+        """Checks that 1, 2 and 4 workers give the same results."""
+        expected = self.convert(1, **options)
+        self.assertTrue(expected[0][1])
+        for workers in (2, 4):
+            self.assertEqual(self.convert(workers, **options), expected)
+        return expected
+
+    def test_default_conversion(self):
+        """TC-01: Lines and read warnings match a serial run."""
+        spools, read_warnings, _ = self.check()
+        self.assertTrue(read_warnings)
+        self.assertFalse(spools[0])
+
+    def test_fixed_width_bases(self):
+        """TC-02: Fit warnings and extra bases match a serial run."""
+        spools = self.check(bits=16, bases=(8, 36), max_warnings=3)[0]
+        self.assertIn("does not fit in 16 bits", spools[0])
+
+    def test_cached_conversion(self):
+        """TC-03: Lines and cache lookups match a serial run.
+
+        Each worker has its own cache, so only the number of lookups,
+        not the hits, is the same.
+        """
+        lookups = self.check(cache_size=64)[2]
+        spools = self.convert(1)[0]
+        self.assertEqual(lookups, len(spools[1].splitlines()))
+
+    def test_dedup_conversion(self):
+        """TC-04: Merged counts keep the order of first appearance."""
+        spools = self.check(dedup=True, bits=64)[0]
+        lines = spools[1].splitlines()
+        self.assertEqual(len(lines), len(set(lines)))
+        self.assertTrue(all(", Count: " in line for line in lines))
+
+
+class TestConversionEngine(unittest.TestCase):
+    """The conversions match the digit by digit functions and NumPy."""
+
+    def sample(self, bits, count=200):
+        """Returns random numbers of up to bits bits, both signs."""
+        rng = random.Random(bits)
+        numbers = [0, -1, (1 << (bits - 1)) - 1, -(1 << (bits - 1))]
+        numbers += [rng.randrange(-(1 << (bits - 1)), 1 << (bits - 1))
+                    for _ in range(count)]
+        return numbers
+
+    def test_matches_legacy(self):
+        """TC-05: Binary and hex match the legacy output, sign dropped."""
+        numbers = [0, 1, -1, 15, -16, 255, -256, 2 ** 64, -(2 ** 100) + 3]
+        numbers += self.sample(4096, 20)
+        for number in numbers:
+            self.assertEqual(convert_numbers.to_binary(number),
+                             convertNumbers.to_binary(number))
+            self.assertEqual(convert_numbers.to_hexadecimal(number),
+                             convertNumbers.to_hexadecimal(number))
+        self.assertEqual(
+            convert_numbers.convert_batch(numbers),
+            [(number, convertNumbers.to_binary(number),
+              convertNumbers.to_hexadecimal(number)) for number in numbers])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_matches_python(self):
+        """TC-06: The NumPy batch matches convert_one at every width."""
+        for bits in (1, 7, 8, 13, 32, 64):
+            numbers = self.sample(bits)
+            self.assertEqual(
+                convert_numbers.convert_batch(numbers, bits, (8, 36)),
+                [convert_numbers.convert_one(number, bits, (8, 36))
+                 for number in numbers])
+
+    def test_without_numpy(self):
+        """TC-07: Without NumPy the batch falls back to convert_one."""
+        numbers = self.sample(16)
+        expected = convert_numbers.convert_batch(numbers, 16, (8,))
+        with mock.patch.object(convert_numbers, "np", None):
+            self.assertEqual(convert_numbers.convert_batch(numbers, 16, (8,)),
+                             expected)
+            self.assertEqual(convert_numbers.convert_batch(numbers),
+                             [convert_numbers.convert_one(number)
+                              for number in numbers])
+
+
+class TestFixedWidth(unittest.TestCase):
+    """Base N and two's complement forms at the edges of their range."""
+
+    def test_to_base(self):
+        """TC-08: Every base keeps the sign and the digits of int()."""
+        for number in (0, 1, -1, 35, -36, 2 ** 70 + 5, -(3 ** 50)):
+            for base in (2, 3, 8, 10, 16, 36):
+                digits = convert_numbers.to_base(number, base)
+                self.assertEqual(int(digits, base), number)
+        self.assertEqual(convert_numbers.to_base(-255, 16), "-FF")
+        self.assertEqual(convert_numbers.to_base(35, 36), "Z")
+
+    def test_signed_range(self):
+        """TC-09: Only -2**(bits-1) to 2**(bits-1)-1 fits in bits."""
+        for bits in (1, 8, 64):
+            low, high = -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+            self.assertTrue(convert_numbers.fits_width(low, bits))
+            self.assertTrue(convert_numbers.fits_width(high, bits))
+            self.assertTrue(convert_numbers.fits_width(0, bits))
+            self.assertFalse(convert_numbers.fits_width(low - 1, bits))
+            self.assertFalse(convert_numbers.fits_width(high + 1, bits))
+            self.assertFalse(convert_numbers.fits_width((1 << bits) - 1,
+                                                        bits))
+
+    def test_twos_complement_edges(self):
+        """TC-10: The range edges are distinct fixed-width values."""
+        to_twos = convert_numbers.to_twos_complement
+        self.assertEqual(to_twos(-128, 8), "10000000")
+        self.assertEqual(to_twos(127, 8), "01111111")
+        self.assertEqual(to_twos(-1, 8), "11111111")
+        self.assertEqual(to_twos(0, 8, 16), "00")
+        self.assertEqual(to_twos(-1, 8, 8), "377")
+        self.assertEqual([to_twos(0, 1), to_twos(-1, 1)], ["0", "1"])
+        self.assertEqual(to_twos(-(1 << 63), 64, 16), "8000000000000000")
+        self.assertEqual(to_twos((1 << 63) - 1, 64, 16), "7FFFFFFFFFFFFFFF")
+        for number, bits in ((255, 8), (-129, 8), (1, 1), (1 << 63, 64)):
+            with self.assertRaises(ValueError):
+                to_twos(number, bits)
+
+    def test_one_sign_convention(self):
+        """TC-11: Without bits the extra bases drop the sign as well."""
+        self.assertEqual(convert_numbers.convert_one(-10, bases=(8, 36)),
+                         (-10, "1010", "A", "12", "A"))
+        self.assertEqual(convert_numbers.convert_one(-10, 8, (8,)),
+                         (-10, "11110110", "F6", "366"))
+
+    def test_repeated_bases_dropped(self):
+        """TC-12: A base is written once, never again as binary or hex."""
+        converter = convert_numbers.Converter(bases=(8, 8, 16, 2, 36))
+        self.assertEqual(converter.bases, (8, 36))
+        self.assertEqual(converter.render(9),
+                         "Number: 9, Binary: 1001, Hex: 9, Octal: 11, "
+                         "Base36: 9\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
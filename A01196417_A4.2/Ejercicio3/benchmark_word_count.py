@@ -0,0 +1,71 @@
+"""
+Benchmark of the word_count tokenizer options.
+
+Measures the throughput of every Tokenizer stage against a raw
+str.split() over the lines of a file, or of generated text when no
+file is given.
+
+Usage: python benchmark_word_count.py [fileWithData.txt]
+"""
+
+import random
+import sys
+import time
+
+from word_count import Tokenizer
+
+SAMPLE_WORDS = ("The", "quick", "brown", "fox,", "jumps", "over", "the",
+                "lazy", "dog.", "Café", "naïve", "don't", "co-operate",
+                "(example)", "end!")
+STOP_WORDS = ("the", "over")
+
+
+def generate_lines(count, seed=0):
+    """Generates lines of random words with punctuation and accents."""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(SAMPLE_WORDS)
+                     for _ in range(rng.randint(5, 15)))
+            for _ in range(count)]
+
+
+def measure(tokenize, lines, repeat=3):
+    """Returns the best tokens/s and MB/s of tokenize over the lines."""
+    size = sum(len(line.encode("utf-8")) for line in lines)
+    best = float("inf")
+    tokens = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = sum(len(tokenize(line)) for line in lines)
+        best = min(best, time.perf_counter() - start)
+    return tokens / best, size / best / 2 ** 20
+
+
+def main():
+    """Prints the throughput of every tokenizer configuration."""
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r', encoding='utf-8') as file:
+            lines = file.read().splitlines()
+    else:
+        lines = generate_lines(200_000)
+
+    configurations = [
+        ("split()", str.split),
+        ("Tokenizer()", Tokenizer()),
+        ("casefold", Tokenizer(casefold=True)),
+        ("strip_punctuation", Tokenizer(strip_punctuation=True)),
+        ("normalize NFC", Tokenizer(normalize="NFC")),
+        ("stop_words", Tokenizer(stop_words=STOP_WORDS)),
+        ("ngrams 2", Tokenizer(ngrams=2)),
+        ("all", Tokenizer(True, True, "NFC", STOP_WORDS, 2)),
+    ]
+    baseline = None
+    print("Configuration\tTokens/s\tMB/s\tRelative")
+    for name, tokenize in configurations:
+        tokens_per_s, mb_per_s = measure(tokenize, lines)
+        baseline = baseline or mb_per_s
+        print(f"{name}\t{tokens_per_s:,.0f}\t{mb_per_s:.1f}\t"
+              f"{mb_per_s / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,181 @@
 """
 Module for counting distinct words in a text file and their frequency.
+
+Several files or directories can be counted at once, reporting per-file
+and merged totals and caching the counts of files that did not change.
+Words can optionally be case folded, stripped of punctuation, Unicode
+normalized, filtered by stop words and grouped into n-grams.
 """
 
+import argparse
+import codecs
+import collections
+import heapq
+import io
+import json
+import mmap
+import multiprocessing
+import os
+import re
 import sys
 import time
+import unicodedata
+
+try:
+    from numeric_reader import split_offsets
+except ImportError:  # Run as a script, the shared modules are one level up
+    sys.path.insert(
+        0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from numeric_reader import split_offsets
+from sketches import SpaceSaving
+
+
+CHUNK_SIZE = 1 << 20  # Characters read from the file per chunk
+PRINT_LIMIT = 100  # Rows printed to the console unless --print-all
+CACHE_FILE = "WordCountCache.json"
+RESULTS_FILE = "WordCountResults.txt"
+WORD_PATTERN = re.compile(r"\w+(?:['\u2019]\w+)*")
+ASCII_SPACE = re.compile(rb"\s")
+NON_SPACE = re.compile(rb"\S")
+BLANK_LINE = re.compile(rb"\n[ \t\r\x0b\x0c]*(?=\n)")
+# UTF-8 encoded Unicode whitespace that bytes.split() does not split on
+TEXT_ONLY = re.compile(rb"\xc2[\x85\xa0]|\xe1\x9a\x80"
+                       rb"|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f"
+                       rb"|\xe3\x80\x80")
+LONE_CR = re.compile(rb"\r(?!\n)")
+SEPARATORS = (b"\x1c", b"\x1d", b"\x1e", b"\x1f")
+
+
+class Tokenizer:
+    """Configurable line tokenizer applied before counting.
+
+    Every stage works on a whole line with C-level string methods and a
+    precompiled regex, so each enabled option costs one pass per line
+    instead of one Python call per token. Instances are picklable so
+    they can be sent to worker processes.
+    """
+
+    def __init__(self, casefold=False, strip_punctuation=False,
+                 normalize=None, stop_words=(), ngrams=1):
+        self.casefold = casefold
+        self.strip_punctuation = strip_punctuation
+        self.normalize = normalize
+        self.stop_words = frozenset(
+            word.casefold() if casefold else word for word in stop_words)
+        self.ngrams = ngrams
+
+    def __call__(self, line):
+        """Returns the tokens of a line."""
+        return self.join(self.words(line))
+
+    def words(self, line):
+        """Returns the words of a line, before grouping them in n-grams."""
+        if self.normalize:
+            line = unicodedata.normalize(self.normalize, line)
+        if self.casefold:
+            line = line.casefold()
+        if self.strip_punctuation:
+            tokens = WORD_PATTERN.findall(line)
+        else:
+            tokens = line.split()
+        if self.stop_words:
+            stop_words = self.stop_words
+            tokens = [token for token in tokens if token not in stop_words]
+        return tokens
+
+    def join(self, words):
+        """Groups consecutive words into n-grams, if configured."""
+        if self.ngrams > 1:
+            size = self.ngrams
+            return [" ".join(words[i:i + size])
+                    for i in range(len(words) - size + 1)]
+        return words
+
+    @property
+    def signature(self):
+        """Describes the configuration, to key cached counts."""
+        return (f"casefold={self.casefold},"
+                f"strip_punctuation={self.strip_punctuation},"
+                f"normalize={self.normalize},"
+                f"stop_words={sorted(self.stop_words)},"
+                f"ngrams={self.ngrams}")
+
+
+def tokenize_part(tokenize, text, carried, last=True):
+    """Tokenizes text, the part of a line that follows carried words.
+
+    carried are the last words of the parts of the line already
+    flushed, kept so the n-grams of a Tokenizer can span the parts.
+    Returns the tokens and the words to carry to the next part, none
+    when text is the last part.
+    """
+    if getattr(tokenize, "ngrams", 1) == 1:
+        return tokenize(text), []
+    words = carried + tokenize.words(text)
+    return tokenize.join(words), [] if last else words[1 - tokenize.ngrams:]
+
+
+def cut_line(line):
+    """Splits an unfinished line after its last complete word."""
+    if line[-1].isspace():
+        return line, ""
+    parts = line.rsplit(None, 1)
+    return ("", parts[0]) if len(parts) == 1 else tuple(parts)
 
 
-def read_file(filename):
-    """Reads a file and extracts words, handling errors gracefully."""
-    words = []
+def split_words(chunks, on_empty, chunk_size=CHUNK_SIZE, tokenize=str.split):
+    """Yields the words of each text chunk, reporting empty lines.
+
+    Only one chunk and the unfinished line that follows it are held in
+    memory, so the words are never materialized as a whole. on_empty is
+    called with the number of every empty line. tokenize turns a line
+    into its words; n-grams never span lines.
+    """
+    line_num = 0
+    pending = ""  # Unfinished last line of the previous chunk
+    flushed = False  # Part of that line was already consumed
+    has_text = False  # The consumed part was not blank
+    carried = []  # Last words of the consumed part, for n-grams
+    for chunk in chunks:
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        words = []
+        for line in lines:
+            line_num += 1
+            tokens, carried = tokenize_part(tokenize, line, carried)
+            if not tokens and not has_text and not line.strip():
+                on_empty(line_num)
+            flushed = has_text = False
+            words.extend(tokens)
+
+        # Lines longer than a chunk: flush their complete words
+        if len(pending) > chunk_size:
+            head, pending = cut_line(pending)
+            flushed = True
+            has_text = has_text or bool(head.strip())
+            tokens, carried = tokenize_part(tokenize, head, carried, False)
+            words.extend(tokens)
+        yield words
+
+    if pending or flushed:
+        tokens = tokenize_part(tokenize, pending, carried)[0]
+        if not tokens and not has_text and not pending.strip():
+            on_empty(line_num + 1)
+        yield tokens
+
+
+def print_empty_line(line_num):
+    """Prints the warning for an empty line."""
+    print(f"Warning: Line {line_num} is empty.")
+
+
+def read_chunks(filename, chunk_size=CHUNK_SIZE, tokenize=str.split):
+    """Reads a file in chunks and yields the words of each chunk."""
     try:
         with open(filename, 'r', encoding='utf-8') as file:
-            for line_num, line in enumerate(file, 1):
-                line = line.strip()
-                if not line:
-                    print(f"Warning: Line {line_num} is empty.")
-                    continue
-                words.extend(line.split())
+            chunks = iter(lambda: file.read(chunk_size), "")
+            yield from split_words(chunks, print_empty_line, chunk_size,
+                                   tokenize)
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
         sys.exit(1)
@@ -24,49 +183,519 @@ def read_file(filename):
         print(f"File error: {file_error}")
         sys.exit(1)
 
-    return words
 
-
-def count_words(words):
-    """Counts occurrences of each distinct word in a list."""
-    word_freq = {}
+def count_words(words, word_freq=None):
+    """Counts occurrences of each distinct word in an iterable."""
+    if word_freq is None:
+        word_freq = {}
     for word in words:
         word_freq[word] = word_freq.get(word, 0) + 1
     return word_freq
 
 
-def write_results(word_freq, execution_time):
+def merge_counts(word_freq, partial_freq):
+    """Adds the counts of partial_freq into word_freq."""
+    for word, count in partial_freq.items():
+        word_freq[word] = word_freq.get(word, 0) + count
+    return word_freq
+
+
+def read_range(file, start, end, chunk_size=CHUNK_SIZE):
+    """Yields the decoded text of a byte range in chunks.
+
+    Newlines are translated like a file opened in text mode.
+    """
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder('utf-8')(), translate=True)
+    file.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        data = file.read(min(chunk_size, remaining))
+        if not data:
+            break
+        remaining -= len(data)
+        yield decoder.decode(data, final=remaining == 0)
+
+
+def count_range(task):
+    """Counts the words of a byte range of a file in a worker process.
+
+    Returns the partial counts, the empty line numbers relative to the
+    range and the number of lines the range ends.
+    """
+    filename, start, end, tokenize = task
+    word_freq = {}
+    empty_lines = []
+    newlines = 0
+
+    def tally(chunks):
+        nonlocal newlines
+        for chunk in chunks:
+            newlines += chunk.count("\n")
+            yield chunk
+
+    with open(filename, 'rb') as file:
+        chunks = tally(read_range(file, start, end))
+        for words in split_words(chunks, empty_lines.append,
+                                 tokenize=tokenize):
+            count_words(words, word_freq)
+    return word_freq, empty_lines, newlines
+
+
+def count_file(filename, workers=1, tokenize=str.split):
+    """Counts the words of a file, in parallel when workers > 1."""
+    if workers <= 1:
+        word_freq = {}
+        for words in read_chunks(filename, tokenize=tokenize):
+            count_words(words, word_freq)
+        return word_freq
+
+    try:
+        ranges = split_offsets(filename, workers)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        sys.exit(1)
+    except (OSError, IOError) as file_error:
+        print(f"File error: {file_error}")
+        sys.exit(1)
+    if len(ranges) < 2:
+        return count_file(filename, tokenize=tokenize)
+
+    with multiprocessing.Pool(min(workers, len(ranges))) as pool:
+        partials = pool.map(count_range,
+                            [(filename, start, end, tokenize)
+                             for start, end in ranges])
+
+    word_freq = {}
+    lines_before = 0
+    for partial_freq, empty_lines, newlines in partials:
+        for line_num in empty_lines:
+            print_empty_line(lines_before + line_num)
+        lines_before += newlines
+        merge_counts(word_freq, partial_freq)
+    return word_freq
+
+
+def is_text_only(chunk):
+    """Tells whether bytes.split() would tokenize a chunk differently.
+
+    That happens with non-ASCII Unicode whitespace, the \\x1c-\\x1f
+    separators and lone \\r newlines, which str.split() and text mode
+    handle as whitespace and line breaks.
+    """
+    if not chunk.isascii() and TEXT_ONLY.search(chunk):
+        return True
+    if b"\r" in chunk and LONE_CR.search(chunk):
+        return True
+    return any(separator in chunk for separator in SEPARATORS)
+
+
+def count_blank_lines(data):
+    """Counts the lines of a byte buffer that hold only whitespace."""
+    blank = sum(1 for _ in BLANK_LINE.finditer(data))
+    first = data.find(b"\n")
+    if first == -1:
+        return 0 if NON_SPACE.search(data) else 1
+    if not NON_SPACE.search(data, 0, first):
+        blank += 1  # First line, not preceded by a newline
+    last = data.rfind(b"\n")
+    if last + 1 < len(data) and not NON_SPACE.search(data, last + 1):
+        blank += 1  # Last line, not followed by a newline
+    return blank
+
+
+def count_file_mmap(filename, chunk_size=CHUNK_SIZE):
+    """Counts the words of a file by tokenizing its bytes through mmap.
+
+    Only distinct tokens are decoded, and empty lines are counted rather
+    than reported one by one. Returns the counts and the number of empty
+    lines, or None when the file needs the text path (see is_text_only).
+    """
+    byte_freq = collections.Counter()
+    try:
+        with open(filename, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return {}, 0
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                size = len(data)
+                start = 0
+                while start < size:
+                    space = ASCII_SPACE.search(data, start + chunk_size)
+                    end = space.start() if space else size
+                    chunk = data[start:end]
+                    if is_text_only(chunk):
+                        return None
+                    byte_freq.update(chunk.split())
+                    start = end
+                empty_lines = count_blank_lines(data)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        sys.exit(1)
+    except (OSError, IOError) as file_error:
+        print(f"File error: {file_error}")
+        sys.exit(1)
+
+    try:
+        word_freq = {word.decode('utf-8'): count
+                     for word, count in byte_freq.items()}
+    except UnicodeDecodeError as decode_error:
+        print(f"File error: {decode_error}")
+        sys.exit(1)
+    return word_freq, empty_lines
+
+
+def collect_files(paths, exclude=()):
+    """Expands directories into the sorted list of files they contain.
+
+    Files of a directory whose absolute path is in exclude, such as the
+    results and cache of this tool, are left out; files named on their
+    own are always kept.
+    """
+    exclude = {os.path.abspath(path) for path in exclude}
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                filenames.extend(
+                    os.path.join(root, name) for name in sorted(files)
+                    if os.path.abspath(os.path.join(root, name))
+                    not in exclude)
+        else:
+            filenames.append(path)
+    return list(dict.fromkeys(filenames))
+
+
+def count_one(task):
+    """Counts a single file in a worker process.
+
+    Returns the counts and the empty line numbers, or None and the error
+    message when the file cannot be read.
+    """
+    filename, tokenize = task
+    word_freq = {}
+    empty_lines = []
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            chunks = iter(lambda: file.read(CHUNK_SIZE), "")
+            for words in split_words(chunks, empty_lines.append,
+                                     tokenize=tokenize):
+                count_words(words, word_freq)
+    except FileNotFoundError:
+        return None, f"Error: File '{filename}' not found."
+    except (OSError, IOError, UnicodeDecodeError) as file_error:
+        return None, f"File error: {file_error}"
+    return word_freq, empty_lines
+
+
+def file_key(filename, tokenize=str.split):
+    """Returns the mtime, size and tokenizer that identify file counts."""
+    stat = os.stat(filename)
+    return [stat.st_mtime_ns, stat.st_size,
+            getattr(tokenize, "signature", "split")]
+
+
+def load_cache(cache_file):
+    """Loads the per-file counts cached by previous runs."""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def valid_entry(entry, key):
+    """Tells whether a cache entry holds the counts of a file with key.
+
+    Entries of an older format or damaged ones are not valid, so their
+    file is counted again.
+    """
+    try:
+        return (key is not None and entry["key"] == key
+                and isinstance(entry["counts"], dict)
+                and isinstance(entry["empty_lines"], list))
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def prune_cache(cache):
+    """Removes the entries of files that no longer exist.
+
+    Returns whether any entry was removed.
+    """
+    missing = [path for path in cache if not os.path.isfile(path)]
+    for path in missing:
+        del cache[path]
+    return bool(missing)
+
+
+def save_cache(cache_file, cache):
+    """Stores the per-file counts for the next run."""
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as file:
+            json.dump(cache, file)
+    except (OSError, IOError) as file_error:
+        print(f"File error: {file_error}")
+
+
+def file_keys(filenames, tokenize=str.split):
+    """Returns the file_key of every file, None for unreadable ones."""
+    keys = {}
+    for filename in filenames:
+        try:
+            keys[filename] = file_key(filename, tokenize)
+        except OSError:
+            keys[filename] = None
+    return keys
+
+
+def count_many(filenames, workers=1, tokenize=str.split):
+    """Runs count_one over files, in parallel when workers > 1."""
+    tasks = [(filename, tokenize) for filename in filenames]
+    if workers > 1 and len(tasks) > 1:
+        with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+            return dict(zip(filenames, pool.map(count_one, tasks)))
+    return {task[0]: count_one(task) for task in tasks}
+
+
+def count_files(filenames, workers=1, cache_file=None, tokenize=str.split):
+    """Counts many files concurrently, reusing cached unchanged files.
+
+    Returns a dict with the counts of every readable file, in order.
+    Cached entries are keyed by path and validated by mtime, size and
+    tokenizer configuration; entries of files that no longer exist are
+    dropped from the cache.
+    """
+    cache = load_cache(cache_file) if cache_file else {}
+    pruned = prune_cache(cache)
+    keys = file_keys(filenames, tokenize)
+    fresh = count_many(
+        [filename for filename in filenames
+         if not valid_entry(cache.get(os.path.abspath(filename)),
+                            keys[filename])],
+        workers, tokenize)
+
+    results = {}
+    for filename in filenames:
+        path = os.path.abspath(filename)
+        if filename in fresh:
+            word_freq, empty_lines = fresh[filename]
+            if word_freq is None:
+                print(empty_lines)
+                cache.pop(path, None)
+                continue
+            cache[path] = {"key": keys[filename], "counts": word_freq,
+                           "empty_lines": empty_lines}
+        entry = cache[path]
+        for line_num in entry["empty_lines"]:
+            print(f"Warning: {filename}: Line {line_num} is empty.")
+        results[filename] = entry["counts"]
+
+    if cache_file and (fresh or pruned):
+        save_cache(cache_file, cache)
+    return results
+
+
+def count_approximate(filename, capacity, tokenize=str.split):
+    """Counts the heavy hitters of a file with bounded memory."""
+    summary = SpaceSaving(capacity)
+    for words in read_chunks(filename, tokenize=tokenize):
+        summary.update(words)
+    return summary
+
+
+def frequency_key(item):
+    """Sorts (word, count) rows by descending count, then by word."""
+    return (-item[1], item[0])
+
+
+def order_results(word_freq, top=None, by_frequency=False):
+    """Returns the (word, count) rows in the order they are reported.
+
+    With top only the K most frequent words are selected, using a heap
+    of size K instead of sorting the whole vocabulary.
+    """
+    if top:
+        return heapq.nsmallest(top, word_freq.items(), key=frequency_key)
+    if by_frequency:
+        return sorted(word_freq.items(), key=frequency_key)
+    return sorted(word_freq.items())
+
+
+def write_results(rows, execution_time, note=None, file_totals=None):
     """Writes word count results to a file."""
-    with open("WordCountResults.txt", 'w', encoding='utf-8') as file:
+    with open(RESULTS_FILE, 'w', encoding='utf-8') as file:
+        if file_totals:
+            file.write("File\tWords\tDistinct\n")
+            for filename, total, distinct in file_totals:
+                file.write(f"{filename}\t{total}\t{distinct}\n")
+            file.write("\nMerged Results:\n")
+        if note:
+            file.write(f"{note}\n")
         file.write("Word\tFrequency\n")
         file.write("---------------------\n")
-        for word, count in sorted(word_freq.items()):
+        for word, count in rows:
             file.write(f"{word}\t{count}\n")
         file.write(f"\nExecution Time: {execution_time:.2f} seconds\n")
 
 
-def main():
-    """Main function to process the file and count words."""
-    if len(sys.argv) != 2:
-        print("Usage: python wordCount.py <fileWithData.txt>")
+def parse_args():
+    """Parses the command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Count distinct words in text files.")
+    parser.add_argument("paths", nargs="+",
+                        help="files or directories with the text to count")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes used to count the file")
+    parser.add_argument("--top", type=int,
+                        help="report only the K most frequent words")
+    parser.add_argument("--sort", choices=("word", "frequency"),
+                        default="word", help="order of the results")
+    parser.add_argument("--approximate", type=int, metavar="CAPACITY",
+                        help="track at most CAPACITY words (Space-Saving)")
+    parser.add_argument("--print-all", action="store_true",
+                        help=f"print results with more than {PRINT_LIMIT}"
+                             " rows to the console")
+    parser.add_argument("--fast", action="store_true",
+                        help="tokenize the bytes of a single file through "
+                             "mmap and only count empty lines")
+    parser.add_argument("--casefold", action="store_true",
+                        help="count words case-insensitively")
+    parser.add_argument("--strip-punctuation", action="store_true",
+                        help="count only letters, digits and apostrophes")
+    parser.add_argument("--normalize",
+                        choices=("NFC", "NFD", "NFKC", "NFKD"),
+                        help="Unicode normalization form applied first")
+    parser.add_argument("--stop-words", metavar="FILE",
+                        help="file with whitespace separated words to skip")
+    parser.add_argument("--ngrams", type=int, default=1,
+                        help="count sequences of N words of a line")
+    parser.add_argument("--cache", default=CACHE_FILE,
+                        help="cache of per-file counts for many files")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="recount every file and skip the cache")
+    args = parser.parse_args()
+    args.multiple = len(args.paths) > 1 or os.path.isdir(args.paths[0])
+    if args.multiple and args.approximate:
+        parser.error("--approximate counts a single file")
+    tokenizer_options = (args.casefold or args.strip_punctuation
+                         or args.normalize or args.stop_words
+                         or args.ngrams > 1)
+    if args.fast and (args.multiple or args.approximate or tokenizer_options
+                      or args.workers > 1):
+        parser.error("--fast counts a single file with one worker and no "
+                     "tokenizer options")
+    return args
+
+
+def build_tokenizer(args):
+    """Returns the tokenizer selected on the command line."""
+    stop_words = ()
+    if args.stop_words:
+        try:
+            with open(args.stop_words, 'r', encoding='utf-8') as file:
+                stop_words = file.read().split()
+        except (OSError, IOError) as file_error:
+            print(f"File error: {file_error}")
+            sys.exit(1)
+    if not (args.casefold or args.strip_punctuation or args.normalize
+            or stop_words or args.ngrams > 1):
+        return str.split
+    return Tokenizer(args.casefold, args.strip_punctuation, args.normalize,
+                     stop_words, args.ngrams)
+
+
+def report_many(args, tokenize):
+    """Counts every file of the paths and merges their counts.
+
+    Returns the rows, no note and the per-file totals to report.
+    """
+    filenames = collect_files(args.paths, (RESULTS_FILE, args.cache))
+    results = count_files(filenames, args.workers,
+                          None if args.no_cache else args.cache, tokenize)
+    if not results:
         sys.exit(1)
+    word_freq = {}
+    file_totals = []
+    for filename, partial_freq in results.items():
+        file_totals.append((filename, sum(partial_freq.values()),
+                            len(partial_freq)))
+        merge_counts(word_freq, partial_freq)
+    return (order_results(word_freq, args.top, args.sort == "frequency"),
+            None, file_totals)
 
-    filename = sys.argv[1]
-    start_time = time.time()
 
-    words = read_file(filename)
-    word_freq = count_words(words)
-    execution_time = time.time() - start_time
+def report_approximate(args, tokenize):
+    """Counts the heavy hitters of the file with Space-Saving.
+
+    Returns the rows, a note with the error bound and no file totals.
+    """
+    summary = count_approximate(args.paths[0], args.approximate, tokenize)
+    note = (f"Approximate counts (Space-Saving, capacity "
+            f"{args.approximate}); maximum overestimate: "
+            f"{max(summary.errors.values(), default=0)}")
+    return (order_results(summary.counts, args.top or args.approximate),
+            note, None)
+
+
+def report_single(args, tokenize):
+    """Counts the file, through mmap with --fast when possible.
+
+    Returns the rows, no note and no file totals.
+    """
+    counted = None
+    if args.fast:
+        counted = count_file_mmap(args.paths[0])
+    if counted is None:
+        word_freq = count_file(args.paths[0], args.workers, tokenize)
+    else:
+        word_freq, empty_lines = counted
+        if empty_lines:
+            print(f"Warning: {empty_lines} empty lines.")
+    return (order_results(word_freq, args.top, args.sort == "frequency"),
+            None, None)
 
+
+def print_results(rows, note=None, file_totals=None, print_all=False):
+    """Prints the word count results to the console."""
     print("\nWord Count Results:")
-    print("Word\tFrequency")
-    print("---------------------")
-    for word, count in sorted(word_freq.items()):
-        print(f"{word}\t{count}")
+    if file_totals:
+        print("File\tWords\tDistinct")
+        for filename, total, distinct in file_totals:
+            print(f"{filename}\t{total}\t{distinct}")
+        print("\nMerged Results:")
+    if note:
+        print(note)
+    if len(rows) > PRINT_LIMIT and not print_all:
+        print(f"{len(rows)} rows written to {RESULTS_FILE} "
+              "(use --print-all to print them).")
+    else:
+        print("Word\tFrequency")
+        print("---------------------")
+        for word, count in rows:
+            print(f"{word}\t{count}")
+
+
+def main():
+    """Main function to process the file and count words."""
+    args = parse_args()
+    start_time = time.time()
+    tokenize = build_tokenizer(args)
+
+    if args.multiple:
+        report = report_many
+    elif args.approximate:
+        report = report_approximate
+    else:
+        report = report_single
+    rows, note, file_totals = report(args, tokenize)
+    execution_time = time.time() - start_time
 
+    print_results(rows, note, file_totals, args.print_all)
     print(f"\nExecution Time: {execution_time:.2f} seconds")
 
-    write_results(word_freq, execution_time)
+    write_results(rows, execution_time, note, file_totals)
 
 
 if __name__ == "__main__":
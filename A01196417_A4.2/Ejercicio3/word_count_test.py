@@ -0,0 +1,356 @@
+"""
+Unit tests for word_count.py
+"""
+
+import collections
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import word_count
+
+
+class TestParallelCount(unittest.TestCase):
+    """Counting a file in worker processes matches a serial count."""
+
+    def setUp(self):
+        """Writes a file of random words and empty lines."""
+        rng = random.Random(0)
+        words = [f"word{i}" for i in range(50)] + ["Ñandú", "über"]
+        lines = []
+        for _ in range(3000):
+            if rng.random() < 0.05:
+                lines.append(rng.choice(["", "   ", "\t"]))
+            else:
+                lines.append(" ".join(rng.choice(words)
+                                      for _ in range(rng.randint(1, 8))))
+        handle, self.filename = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            file.write("\n".join(lines))
+
+    def tearDown(self):
+        """Deletes the test file."""
+        os.remove(self.filename)
+
+    def count(self, workers, tokenize=str.split):
+        """Returns the counts and the printed warnings of a count."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            word_freq = word_count.count_file(self.filename, workers,
+                                              tokenize)
+        return word_freq, output.getvalue()
+
+    def test_parallel_matches_serial(self):
+        """TC-01: Counts and empty line warnings match for any workers."""
+        expected = self.count(1)
+        self.assertIn("Warning: Line", expected[1])
+        for workers in (2, 3, 7):
+            self.assertEqual(self.count(workers), expected)
+
+    def test_parallel_tokenizer(self):
+        """TC-02: The tokenizer is applied the same way in the workers."""
+        tokenize = word_count.Tokenizer(casefold=True, ngrams=2)
+        self.assertEqual(self.count(4, tokenize), self.count(1, tokenize))
+
+
+class TestSplitWords(unittest.TestCase):
+    """Lines longer than a chunk are tokenized like whole lines."""
+
+    def split(self, text, chunk_size, tokenize):
+        """Returns the tokens of text read in chunks of chunk_size."""
+        chunks = [text[i:i + chunk_size]
+                  for i in range(0, len(text), chunk_size)]
+        return [token
+                for words in word_count.split_words(
+                    iter(chunks), lambda line_num: None, chunk_size,
+                    tokenize)
+                for token in words]
+
+    def test_ngrams_span_flushes(self):
+        """TC-03: N-grams are kept across the flushes of a long line."""
+        text = "one two three four five six seven\neight nine ten"
+        for size in (2, 3):
+            tokenize = word_count.Tokenizer(ngrams=size)
+            expected = [token for line in text.split("\n")
+                        for token in tokenize(line)]
+            for chunk_size in (1, 4, 9):
+                self.assertEqual(self.split(text, chunk_size, tokenize),
+                                 expected)
+
+    def test_ngrams_skip_stop_words(self):
+        """TC-04: Carried words are the ones left after the stop words."""
+        tokenize = word_count.Tokenizer(casefold=True, stop_words=["the"],
+                                        ngrams=2)
+        self.assertEqual(self.split("The cat and THE dog", 3, tokenize),
+                         ["cat and", "and dog"])
+
+
+class TestTokenizer(unittest.TestCase):
+    """Every Tokenizer stage transforms the words of a line."""
+
+    def test_default_split(self):
+        """TC-05: Without options a line is split on whitespace."""
+        self.assertEqual(word_count.Tokenizer()("Hello,  World!\tagain"),
+                         ["Hello,", "World!", "again"])
+
+    def test_casefold(self):
+        """TC-06: Casefolding merges case variants, including ß."""
+        tokenize = word_count.Tokenizer(casefold=True)
+        self.assertEqual(tokenize("The THE the Straße STRASSE"),
+                         ["the", "the", "the", "strasse", "strasse"])
+
+    def test_strip_punctuation(self):
+        """TC-07: Only letters, digits and inner apostrophes are kept."""
+        tokenize = word_count.Tokenizer(strip_punctuation=True)
+        self.assertEqual(
+            tokenize("(Hello), world! don't 'quoted' co-op naïve l\u2019eau"),
+            ["Hello", "world", "don't", "quoted", "co", "op", "naïve",
+             "l\u2019eau"])
+
+    def test_normalize(self):
+        """TC-08: Composed and decomposed forms count as one word."""
+        composed, decomposed = "caf\u00e9", "cafe\u0301"
+        self.assertEqual(
+            word_count.Tokenizer(normalize="NFC")(
+                f"{composed} {decomposed}"), [composed, composed])
+        self.assertEqual(word_count.Tokenizer(normalize="NFKC")("\ufb01x"),
+                         ["fix"])
+
+    def test_stop_words(self):
+        """TC-09: Stop words are removed after casefolding."""
+        self.assertEqual(
+            word_count.Tokenizer(stop_words=["the"])("The cat the end"),
+            ["The", "cat", "end"])
+        self.assertEqual(
+            word_count.Tokenizer(casefold=True, stop_words=["THE"])(
+                "The cat the end"), ["cat", "end"])
+
+    def test_ngrams(self):
+        """TC-10: N-grams group consecutive words of a line."""
+        tokenize = word_count.Tokenizer(ngrams=3)
+        self.assertEqual(tokenize("a b c d"), ["a b c", "b c d"])
+        self.assertEqual(tokenize("a b"), [])
+
+
+class TestCountFileMmap(unittest.TestCase):
+    """The mmap fast path counts like the text path."""
+
+    def setUp(self):
+        """Picks a path for the test file."""
+        handle, self.filename = tempfile.mkstemp(suffix=".txt")
+        os.close(handle)
+
+    def tearDown(self):
+        """Deletes the test file."""
+        os.remove(self.filename)
+
+    def check(self, data):
+        """Checks that both paths give the counts and empty lines of data.
+
+        Returns the result of count_file_mmap.
+        """
+        with open(self.filename, 'wb') as file:
+            file.write(data.encode('utf-8'))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            word_freq = word_count.count_file(self.filename)
+            counted = word_count.count_file_mmap(self.filename)
+        if counted is not None:
+            empty_lines = output.getvalue().count("is empty.")
+            self.assertEqual(counted, (word_freq, empty_lines), repr(data))
+        return counted
+
+    def test_matches_text_path(self):
+        """TC-11: ASCII, UTF-8, CRLF and blank lines count the same."""
+        for data in ("", "a b a\n", "a b\n\nc", "\n\n", "  \t\n x \n \t",
+                     "Ñandú über\nÑandú\n", "a\r\nb\r\n\r\n  \r\nc",
+                     "no newline at the end", "x\u00a0y\n"):
+            self.check(data)
+        self.assertIsNotNone(self.check("a\r\n\r\nb c\r\n"))
+
+    def test_random_files(self):
+        """TC-12: Random mixes of words and line breaks count the same."""
+        rng = random.Random(3)
+        pieces = ["word", "Ñandú", " ", "\t", "\n", "\r\n", "\r", "\x0c",
+                  "\u3000", "\x1c"]
+        for _ in range(200):
+            self.check("".join(rng.choice(pieces)
+                               for _ in range(rng.randint(0, 30))))
+
+    def test_text_only_files(self):
+        """TC-13: Lone CR and Unicode spaces go to the text path."""
+        for data in ("a\rb\n", "a\u3000b\n", "a\x1cb"):
+            self.assertIsNone(self.check(data))
+
+    def test_fast_rejects_other_options(self):
+        """TC-14: --fast cannot be combined with options it ignores."""
+        for options in (["--workers", "2"], ["--casefold"], ["--ngrams", "2"],
+                        ["--approximate", "10"]):
+            argv = ["word_count.py", self.filename, "--fast"] + options
+            with mock.patch("sys.argv", argv), \
+                    contextlib.redirect_stderr(io.StringIO()), \
+                    self.assertRaises(SystemExit):
+                word_count.parse_args()
+        with mock.patch("sys.argv",
+                        ["word_count.py", self.filename, "--fast"]):
+            self.assertTrue(word_count.parse_args().fast)
+
+
+class TestCountFilesCache(unittest.TestCase):
+    """Per-file counts are cached, validated and pruned."""
+
+    def setUp(self):
+        """Writes two text files and picks a cache file beside them."""
+        self.directory = tempfile.mkdtemp()
+        self.files = []
+        for name, text in (("a.txt", "x y x\n"), ("b.txt", "y z\n")):
+            path = os.path.join(self.directory, name)
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text)
+            self.files.append(path)
+        self.cache_file = os.path.join(self.directory, "cache.json")
+
+    def tearDown(self):
+        """Deletes the files."""
+        shutil.rmtree(self.directory)
+
+    def count(self, filenames=None):
+        """Counts the files through the cache, hiding the warnings."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return word_count.count_files(filenames or self.files,
+                                          cache_file=self.cache_file)
+
+    def read_cache(self):
+        """Returns the saved cache."""
+        with open(self.cache_file, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def write_cache(self, cache):
+        """Replaces the saved cache."""
+        with open(self.cache_file, 'w', encoding='utf-8') as file:
+            json.dump(cache, file)
+
+    def test_cached_counts_reused(self):
+        """TC-15: Unchanged files are read from the cache."""
+        expected = self.count()
+        cache = self.read_cache()
+        cache[self.files[0]]["counts"] = {"cached": 1}
+        self.write_cache(cache)
+        self.assertEqual(self.count()[self.files[0]], {"cached": 1})
+        self.assertEqual(expected[self.files[1]], {"y": 1, "z": 1})
+
+    def test_malformed_entries_recounted(self):
+        """TC-16: Old-format or damaged entries are counted again."""
+        expected = self.count()
+        self.write_cache({self.files[0]: {"counts": {"x": 9}},
+                          self.files[1]: "not an entry"})
+        self.assertEqual(self.count(), expected)
+        self.assertEqual(self.read_cache()[self.files[0]]["counts"],
+                         {"x": 2, "y": 1})
+
+    def test_own_files_excluded(self):
+        """TC-17: The cache and results files of a directory are skipped."""
+        results = os.path.join(self.directory, "WordCountResults.txt")
+        with open(results, 'w', encoding='utf-8') as file:
+            file.write("Word\tFrequency\n")
+        self.count()
+        self.assertEqual(
+            word_count.collect_files([self.directory],
+                                     (results, self.cache_file)),
+            self.files)
+        self.assertEqual(
+            word_count.collect_files([results], (results,)), [results])
+
+    def test_missing_files_pruned(self):
+        """TC-18: Entries of deleted files are removed from the cache."""
+        self.count()
+        os.remove(self.files[1])
+        self.count(self.files[:1])
+        self.assertEqual(list(self.read_cache()), self.files[:1])
+
+
+class TestSpaceSaving(unittest.TestCase):
+    """The Space-Saving counts stay within their error bounds."""
+
+    def check_bounds(self, words, capacity):
+        """Checks the guarantees of a summary of words."""
+        summary = word_count.SpaceSaving(capacity)
+        summary.update(words)
+        exact = collections.Counter(words)
+        bound = len(words) / capacity
+        self.assertLessEqual(len(summary.counts), capacity)
+        for word, count in summary.counts.items():
+            error = summary.errors[word]
+            self.assertLessEqual(error, bound)
+            self.assertLessEqual(count - error, exact[word])
+            self.assertGreaterEqual(count, exact[word])
+        for word, count in exact.items():
+            if count > bound:
+                self.assertIn(word, summary.counts)
+        return summary, exact
+
+    def test_skewed_stream(self):
+        """TC-19: Frequent words are kept and their counts bounded."""
+        rng = random.Random(1)
+        words = [f"w{int(rng.paretovariate(1.2))}" for _ in range(20000)]
+        summary, exact = self.check_bounds(words, 50)
+        top = [word for word, _ in exact.most_common(5)]
+        self.assertTrue(set(top) <= set(summary.counts))
+
+    def test_uniform_stream(self):
+        """TC-20: The bounds hold when no word stands out."""
+        rng = random.Random(2)
+        self.check_bounds([f"w{rng.randrange(500)}" for _ in range(5000)],
+                          20)
+
+    def test_exact_under_capacity(self):
+        """TC-21: Counts are exact while every word fits."""
+        words = "a b a c b a".split()
+        summary, exact = self.check_bounds(words, 3)
+        self.assertEqual(summary.counts, dict(exact))
+        self.assertEqual(set(summary.errors.values()), {0})
+
+
+class TestOrderResults(unittest.TestCase):
+    """Rows are ordered by word, by frequency or cut to the top K."""
+
+    WORD_FREQ = {"pear": 2, "apple": 3, "fig": 2, "kiwi": 1, "date": 3}
+
+    def test_sorted_by_word(self):
+        """TC-22: By default the rows are in word order."""
+        self.assertEqual([word for word, _ in
+                          word_count.order_results(self.WORD_FREQ)],
+                         ["apple", "date", "fig", "kiwi", "pear"])
+
+    def test_sorted_by_frequency(self):
+        """TC-23: Ties in frequency are ordered by word."""
+        self.assertEqual(
+            word_count.order_results(self.WORD_FREQ, by_frequency=True),
+            [("apple", 3), ("date", 3), ("fig", 2), ("pear", 2),
+             ("kiwi", 1)])
+
+    def test_top_words(self):
+        """TC-24: The top K match the head of the frequency order."""
+        ordered = word_count.order_results(self.WORD_FREQ, by_frequency=True)
+        for top in range(1, len(ordered) + 1):
+            self.assertEqual(word_count.order_results(self.WORD_FREQ, top),
+                             ordered[:top])
+        self.assertEqual(word_count.order_results(self.WORD_FREQ, 3),
+                         [("apple", 3), ("date", 3), ("fig", 2)])
+
+    def test_top_larger_than_vocabulary(self):
+        """TC-25: K beyond the vocabulary returns every word."""
+        self.assertEqual(
+            word_count.order_results(self.WORD_FREQ, 50),
+            word_count.order_results(self.WORD_FREQ, by_frequency=True))
+        self.assertEqual(word_count.order_results({}, 5), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Benchmark of the shared numeric_reader against the per-line loop.
+
+Measures the throughput of the previous read_file loop, which strips
+and scans every line with re.findall, against read_numbers, for float
+and int numbers, checking that both give the same numbers and
+warnings. Reads the given file, or a generated one with some empty and
+invalid lines.
+
+Usage: python benchmark_numeric_reader.py [fileWithData.txt]
+"""
+
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+from numeric_reader import NUMBER_PATTERNS, read_numbers
+
+
+def legacy_read_file(filename, number_type):
+    """Previous per-line reader, kept as the reference output."""
+    numbers = []
+    invalid_lines = []
+    with open(filename, 'r', encoding='utf-8') as file:
+        for line_num, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                invalid_lines.append(f"Warning: Line {line_num} is empty.")
+                continue
+
+            extracted_numbers = [
+                number_type(num)
+                for num in re.findall(NUMBER_PATTERNS[number_type], line)]
+            if extracted_numbers:
+                numbers.extend(extracted_numbers)
+            else:
+                invalid_lines.append(
+                    f"Warning: No valid numbers on line {line_num}: {line}")
+    return numbers, invalid_lines
+
+
+def shared_read_file(filename, number_type):
+    """Reads the file with numeric_reader."""
+    numbers, warnings = read_numbers(filename, number_type)
+    return numbers, warnings.messages()
+
+
+def generate_file(path, lines=1_000_000, seed=0):
+    """Writes lines of one or two numbers, with 1% bad lines."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as file:
+        for _ in range(lines):
+            choice = rng.random()
+            if choice < 0.005:
+                file.write("\n")
+            elif choice < 0.01:
+                file.write("not a number\n")
+            elif choice < 0.2:
+                file.write(f"{rng.randint(-10**6, 10**6)} "
+                           f"{rng.uniform(-1e3, 1e3):.4f}\n")
+            else:
+                file.write(f"{rng.uniform(-1e6, 1e6):.3f}\n")
+
+
+def measure(read, filename, number_type, repeat=3):
+    """Returns the best time of read and its result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = read(filename, number_type)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """Prints the throughput of both readers for floats and ints."""
+    with tempfile.TemporaryDirectory() as directory:
+        if len(sys.argv) > 1:
+            filename = sys.argv[1]
+        else:
+            filename = os.path.join(directory, "numbers.txt")
+            generate_file(filename)
+        size = os.path.getsize(filename) / 2 ** 20
+
+        print("Type\tReader\tMB/s\tMnumbers/s\tSpeedup")
+        for number_type in (float, int):
+            legacy_time, expected = measure(legacy_read_file, filename,
+                                            number_type)
+            shared_time, result = measure(shared_read_file, filename,
+                                          number_type)
+            if result != expected:
+                raise AssertionError("numeric_reader output differs")
+            count = len(expected[0]) / 1e6
+            for name, elapsed in (("per-line", legacy_time),
+                                  ("numeric_reader", shared_time)):
+                print(f"{number_type.__name__}\t{name}\t"
+                      f"{size / elapsed:.1f}\t{count / elapsed:.2f}\t"
+                      f"{legacy_time / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Module for reading the numbers of a text file in bulk.
+
+Shared by compute_statistics and convert_numbers. The file is read in
+large byte blocks cut after their last newline, so no number is split
+between two blocks, and each block is tokenized with one regex scan
+instead of one scan per line. Only the lines without numbers are
+visited one at a time; they are reported to a ReadWarnings, which
+counts them and keeps the line number and text of a sample of them.
+Blocks that are not ASCII are decoded first, so other Unicode digits
+are read as the per-line loop read them, and "\r\n" or a lone "\r"
+end a line as in a file opened in text mode.
+"""
+
+import itertools
+import os
+import re
+
+BLOCK_SIZE = 1 << 20  # Bytes read from the file per block
+CHUNK_SIZE = 1 << 16  # Numbers per list of iter_chunks
+NUMBER_PATTERNS = {float: r'-?\d+\.?\d*', int: r'-?\d+'}
+NO_NUMBER_LINE = r'^[^\d\n]*$'  # A line yields no number without a digit
+# (number type, whether the block is str) to the compiled patterns
+PATTERNS = {
+    (number_type, text): (re.compile(pattern if text else pattern.encode()),
+                          re.compile(NO_NUMBER_LINE if text
+                                     else NO_NUMBER_LINE.encode(),
+                                     re.MULTILINE))
+    for number_type, pattern in NUMBER_PATTERNS.items()
+    for text in (False, True)
+}
+
+
+class ReadWarnings:
+    """Lines skipped while reading numbers, counted by kind.
+
+    The kinds are "empty" and "no_numbers"; subclasses may define others
+    with their KINDS, LABELS and message. Only the first sample lines
+    of each kind are reported, or all of them when sample is None: their
+    messages are passed to report, which by default keeps them in lines.
+    summary describes the lines left out. Warnings of consecutive parts
+    of a file can be merged.
+    """
+
+    KINDS = ("empty", "no_numbers")
+    LABELS = {"empty": "empty lines",
+              "no_numbers": "lines without valid numbers"}
+
+    def __init__(self, sample=None, report=None):
+        self.sample = sample
+        self.counts = dict.fromkeys(self.KINDS, 0)
+        self.lines = []  # (line number, kind, text) of the sampled lines
+        self.report = report
+
+    @property
+    def total(self):
+        """Number of lines skipped."""
+        return sum(self.counts.values())
+
+    def add(self, line_num, text):
+        """Records a skipped line given its stripped text."""
+        self.record(line_num, "no_numbers" if text else "empty", text)
+
+    def record(self, line_num, kind, text):
+        """Records a skipped line of one of the KINDS."""
+        self.counts[kind] += 1
+        if self.sample is None or self.counts[kind] <= self.sample:
+            if self.report is None:
+                self.lines.append((line_num, kind, text))
+            else:
+                self.report(self.message(line_num, kind, text))
+
+    def merge(self, other):
+        """Adds the warnings of other, which covers later lines."""
+        seen = dict(self.counts)
+        for line in other.lines:
+            seen[line[1]] += 1
+            if self.sample is None or seen[line[1]] <= self.sample:
+                self.lines.append(line)
+        for kind in self.KINDS:
+            self.counts[kind] += other.counts[kind]
+        return self
+
+    @staticmethod
+    def message(line_num, kind, text):
+        """Returns the warning of one skipped line."""
+        if kind == "empty":
+            return f"Warning: Line {line_num} is empty."
+        return f"Warning: No valid numbers on line {line_num}: {text}"
+
+    def summary(self):
+        """Returns one warning per kind with lines that were not listed."""
+        if self.sample is None:
+            return []
+        return [f"Warning: {self.counts[kind] - self.sample} more "
+                f"{self.LABELS[kind]} not listed."
+                for kind in self.KINDS if self.counts[kind] > self.sample]
+
+    def messages(self):
+        """Returns the warnings of the kept lines and the summary."""
+        return [self.message(*line) for line in self.lines] + self.summary()
+
+    def to_dict(self):
+        """Returns the warnings as a JSON serializable dictionary."""
+        return {"sample": self.sample, "counts": self.counts,
+                "lines": self.lines}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds the warnings from the dictionary of to_dict."""
+        warnings = cls(data["sample"])
+        warnings.counts = dict(data["counts"])
+        warnings.lines = [tuple(line) for line in data["lines"]]
+        return warnings
+
+
+def read_blocks(file, start=0, end=None, size=BLOCK_SIZE):
+    """Yields blocks of whole lines of a binary file between two offsets.
+
+    Reads size bytes at a time; the bytes after the last newline of a
+    read are kept for the next block, so every block but the last ends
+    with a newline.
+    """
+    file.seek(start)
+    remaining = None if end is None else end - start
+    pending = []
+    while remaining is None or remaining > 0:
+        data = file.read(size if remaining is None else min(size,
+                                                            remaining))
+        if not data:
+            break
+        if remaining is not None:
+            remaining -= len(data)
+        cut = data.rfind(b"\n") + 1
+        if cut:
+            pending.append(data[:cut])
+            yield b"".join(pending)
+            pending = [data[cut:]]
+        else:
+            pending.append(data)
+    rest = b"".join(pending)
+    if rest:
+        yield rest
+
+
+def tokenize(block, warnings, number_type=float, first_line=1):
+    """Returns the number tokens of a block of whole lines.
+
+    Tokens are bytes, or str if the block is not ASCII. The lines
+    without numbers are added to warnings, numbering the lines from
+    first_line.
+    """
+    if b"\r" in block:  # Universal newlines, as in text mode
+        block = block.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    if not block.isascii():
+        block = block.decode('utf-8')
+    number, no_number = PATTERNS[number_type, isinstance(block, str)]
+    newline = "\n" if isinstance(block, str) else b"\n"
+    line_num = first_line
+    position = 0
+    for match in no_number.finditer(block):
+        if match.start() == len(block) and block[-1:] in ("", newline):
+            break  # Past the last line
+        line_num += block.count(newline, position, match.start())
+        position = match.start()
+        line = match.group()
+        if not isinstance(line, str):
+            line = line.decode('ascii')
+        warnings.add(line_num, line.strip())
+    return number.findall(block)
+
+
+def scan_blocks(blocks, warnings, number_type=float, first_line=1):
+    """Yields the numbers of every block of whole lines as a list.
+
+    The tokens of a block are converted to number_type at once; the
+    lines without numbers are added to warnings.
+    """
+    for block in blocks:
+        yield list(map(number_type,
+                       tokenize(block, warnings, number_type, first_line)))
+        first_line += count_breaks(block)
+
+
+def iter_numbers(file, warnings, number_type=float, part=(0, None, 1)):
+    """Yields the numbers of a byte range of a binary file, one by one.
+
+    part is the (start, end, first_line) of the range, end None for the
+    end of the file; lines are numbered from first_line, the number of
+    the line at start, for the warnings.
+    """
+    start, end, first_line = part
+    return itertools.chain.from_iterable(scan_blocks(
+        read_blocks(file, start, end), warnings, number_type, first_line))
+
+
+def iter_chunks(numbers, size=CHUNK_SIZE):
+    """Groups an iterable of numbers into lists of up to size numbers."""
+    numbers = iter(numbers)
+    while True:
+        chunk = list(itertools.islice(numbers, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_numbers(filename, number_type=float, sample=None):
+    """Reads every number of a file as number_type.
+
+    Returns the numbers and the ReadWarnings of the file. File errors
+    are raised.
+    """
+    warnings = ReadWarnings(sample)
+    with open(filename, 'rb') as file:
+        numbers = list(iter_numbers(file, warnings, number_type))
+    return numbers, warnings
+
+
+def split_offsets(filename, parts):
+    """Splits a file into byte ranges that start at a line boundary."""
+    size = os.path.getsize(filename)
+    offsets = [0]
+    with open(filename, 'rb') as file:
+        for part in range(1, parts):
+            file.seek(max(size * part // parts, offsets[-1]))
+            file.readline()
+            position = file.tell()
+            if position >= size:
+                break
+            if position > offsets[-1]:
+                offsets.append(position)
+    offsets.append(size)
+    return list(zip(offsets, offsets[1:]))
+
+
+def count_breaks(data):
+    """Returns the number of "\n", "\r\n" and lone "\r" in bytes."""
+    breaks = data.count(b"\n")
+    if b"\r" in data:
+        breaks += data.count(b"\r") - data.count(b"\r\n")
+    return breaks
+
+
+def count_lines(task):
+    """Returns the number of line breaks in a byte range of a file."""
+    filename, start, end = task
+    newlines = 0
+    previous = b""
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = file.read(min(BLOCK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            newlines += count_breaks(data)
+            if previous == b"\r" and data[:1] == b"\n":
+                newlines -= 1  # A "\r\n" split between two reads
+            previous = data[-1:]
+    return newlines
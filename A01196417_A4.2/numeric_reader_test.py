@@ -0,0 +1,99 @@
+"""
+Unit tests for numeric_reader.py
+"""
+
+import itertools
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import numeric_reader
+from benchmark_numeric_reader import legacy_read_file
+from numeric_reader import (
+    ReadWarnings, count_lines, iter_numbers, read_blocks, read_numbers,
+    scan_blocks, split_offsets)
+
+# Pieces of the generated lines: numbers, text, whitespace and the line
+# breaks of text mode, with some characters that are not ASCII
+PIECES = ["12", "-3.5", "7.", "-", ".", "abc", " ", "\t", "\x0c", "\x1c",
+          "٣٤", "é", " ", "\n", "\r", "\r\n"]
+
+
+class TestReadNumbers(unittest.TestCase):
+    """The reader gives the numbers and warnings of the per-line loop."""
+
+    def setUp(self):
+        """Picks a path for the test file."""
+        handle, self.filename = tempfile.mkstemp(suffix=".txt")
+        os.close(handle)
+
+    def tearDown(self):
+        """Deletes the test file."""
+        os.remove(self.filename)
+
+    def write(self, data):
+        """Writes data as the bytes of the test file."""
+        with open(self.filename, 'wb') as file:
+            file.write(data.encode('utf-8'))
+
+    def check(self, data):
+        """Checks both number types against the per-line loop."""
+        self.write(data)
+        for number_type in (float, int):
+            numbers, warnings = read_numbers(self.filename, number_type)
+            self.assertEqual((numbers, warnings.messages()),
+                             legacy_read_file(self.filename, number_type),
+                             repr(data))
+
+    def test_lone_carriage_returns(self):
+        """TC-01: A lone "\\r" ends a line as in text mode."""
+        self.write("1\r\rabc\r2\n")
+        numbers, warnings = read_numbers(self.filename)
+        self.assertEqual(numbers, [1.0, 2.0])
+        self.assertEqual(warnings.messages(),
+                         ["Warning: Line 2 is empty.",
+                          "Warning: No valid numbers on line 3: abc"])
+        for data in ("", "\r", "1\r", "\r\n\r", "a\r\r\n\r\nb", "1\n\r2"):
+            self.check(data)
+
+    def test_random_lines(self):
+        """TC-02: Random mixes of numbers, text and line breaks match."""
+        rng = random.Random(0)
+        for _ in range(300):
+            self.check("".join(rng.choice(PIECES)
+                               for _ in range(rng.randint(0, 40))))
+
+    def test_small_blocks_and_ranges(self):
+        """TC-03: Blocks and byte ranges of any size number the lines."""
+        rng = random.Random(1)
+        data = "".join(rng.choice(PIECES) for _ in range(3000))
+        self.write(data)
+        expected = legacy_read_file(self.filename, float)
+        with open(self.filename, 'rb') as file:
+            for size in (1, 2, 7, 64):
+                warnings = ReadWarnings()
+                numbers = list(itertools.chain.from_iterable(scan_blocks(
+                    read_blocks(file, size=size), warnings)))
+                self.assertEqual((numbers, warnings.messages()), expected)
+
+        with mock.patch.object(numeric_reader, "BLOCK_SIZE", 3):
+            for parts in (2, 5, 13):
+                ranges = split_offsets(self.filename, parts)
+                warnings = ReadWarnings()
+                numbers = []
+                first_line = 1
+                with open(self.filename, 'rb') as file:
+                    for start, end in ranges:
+                        part = ReadWarnings()
+                        numbers.extend(iter_numbers(
+                            file, part, float, (start, end, first_line)))
+                        warnings.merge(part)
+                        first_line += count_lines(
+                            (self.filename, start, end))
+                self.assertEqual((numbers, warnings.messages()), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
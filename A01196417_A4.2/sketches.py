@@ -0,0 +1,224 @@
+"""
+Module of mergeable sketches that summarize a stream in bounded memory.
+
+KLLSketch keeps approximate quantiles and SpaceSaving the most frequent
+items. A sketch can be built over each part of the data, by worker
+processes or by consecutive runs, merged into the sketch of the whole
+data and saved as JSON.
+"""
+
+import heapq
+import itertools
+import math
+import random
+
+
+class KLLSketch:
+    """Approximate quantiles of a stream of numbers (KLL sketch).
+
+    Keeps a hierarchy of compactors: level h holds numbers that stand
+    for 2**h numbers of the stream. A full level is sorted and every
+    other number, starting at a random offset, is promoted to the next
+    level. Lower levels get geometrically smaller capacities, bounded
+    by k, so the memory is O(k) for any stream length. The rank of a
+    quantile is off by less than ERROR_FACTOR / k of the count with
+    high probability. Sketches built over separate parts of the data
+    can be merged.
+    """
+
+    __slots__ = ("k", "count", "compactors", "size", "max_size", "rng")
+    DECAY = 2 / 3  # Capacity ratio between consecutive levels
+    ERROR_FACTOR = 2.5  # Largest rank error times k seen on 1% steps
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.count = 0
+        self.compactors = []
+        self.size = 0
+        self.max_size = 0
+        self.rng = random.Random(seed)
+        self.grow()
+
+    @classmethod
+    def for_error(cls, error, seed=0):
+        """Builds a sketch whose rank error is about error."""
+        return cls(max(8, math.ceil(cls.ERROR_FACTOR / error)), seed)
+
+    def capacity(self, level):
+        """Returns the number of items a level holds before compacting."""
+        depth = len(self.compactors) - level - 1
+        return math.ceil(self.k * self.DECAY ** depth) + 1
+
+    def grow(self):
+        """Adds a level on top of the hierarchy."""
+        self.compactors.append([])
+        self.max_size = sum(self.capacity(level)
+                            for level in range(len(self.compactors)))
+
+    def compress(self):
+        """Compacts full levels until the sketch is under its size."""
+        for level, items in enumerate(self.compactors):
+            if len(items) >= self.capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.grow()
+                items.sort()
+                keep = items[:len(items) % 2]
+                start = len(keep) + self.rng.randrange(2)
+                self.compactors[level + 1].extend(items[start::2])
+                items[:] = keep
+                self.size = sum(len(items) for items in self.compactors)
+                if self.size < self.max_size:
+                    break
+
+    def update(self, numbers):
+        """Adds every number of an iterable and returns the sketch."""
+        numbers = iter(numbers)
+        level = self.compactors[0]
+        while True:
+            chunk = list(itertools.islice(numbers,
+                                          self.max_size - self.size))
+            if not chunk:
+                return self
+            level.extend(chunk)
+            self.count += len(chunk)
+            self.size += len(chunk)
+            if self.size >= self.max_size:
+                self.compress()
+
+    def merge(self, other):
+        """Adds the numbers summarized by other and returns the sketch."""
+        while len(self.compactors) < len(other.compactors):
+            self.grow()
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.count += other.count
+        self.size = sum(len(items) for items in self.compactors)
+        while self.size >= self.max_size:
+            self.compress()
+        return self
+
+    def quantile(self, fraction):
+        """Returns the approximate number at fraction (0 to 1) of ranks."""
+        items = sorted((number, 1 << level)
+                       for level, numbers in enumerate(self.compactors)
+                       for number in numbers)
+        target = fraction * self.count
+        cumulative = 0
+        for number, weight in items:
+            cumulative += weight
+            if cumulative >= target:
+                return number
+        return items[-1][0]
+
+    def to_dict(self):
+        """Returns the sketch as a JSON serializable dictionary."""
+        return {"k": self.k, "count": self.count,
+                "compactors": self.compactors, "rng": self.rng.getstate()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a sketch from the dictionary of to_dict."""
+        sketch = cls(data["k"])
+        sketch.count = data["count"]
+        sketch.compactors = data["compactors"]
+        sketch.size = sum(len(items) for items in sketch.compactors)
+        sketch.max_size = sum(sketch.capacity(level)
+                              for level in range(len(sketch.compactors)))
+        version, internal, gauss = data["rng"]
+        sketch.rng.setstate((version, tuple(internal), gauss))
+        return sketch
+
+
+class SpaceSaving:
+    """Approximate heavy hitters of a stream with the Space-Saving method.
+
+    At most capacity items (words, numbers or any hashable value) are
+    monitored. A new item replaces the one with the lowest count and
+    inherits that count, so every count overestimates the true one by
+    at most its recorded error, and every item seen more than
+    total / capacity times is monitored. Counts are exact as long as no
+    item was evicted. Summaries of separate parts of the data can be
+    merged.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.heap = []  # One (count, item) entry per item, maybe stale
+        self.evicted = False
+
+    def add(self, item, count=1, error=0):
+        """Counts count occurrences of an item, overestimated by error."""
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+            self.errors[item] += error
+            return
+        if len(counts) < self.capacity:
+            counts[item] = count
+            self.errors[item] = error
+            heapq.heappush(self.heap, (count, item))
+            return
+
+        # Refresh stale entries until the top holds the true minimum
+        smallest, victim = self.heap[0]
+        while counts[victim] != smallest:
+            heapq.heapreplace(self.heap, (counts[victim], victim))
+            smallest, victim = self.heap[0]
+        del counts[victim]
+        del self.errors[victim]
+        counts[item] = smallest + count
+        self.errors[item] = smallest + error
+        heapq.heapreplace(self.heap, (smallest + count, item))
+        self.evicted = True
+
+    def update(self, items):
+        """Counts every item of an iterable, in order."""
+        for item in items:
+            self.add(item)
+        return self
+
+    def update_counts(self, counts):
+        """Counts (item, count) pairs, such as the items of a Counter."""
+        for item, count in counts:
+            self.add(item, count)
+        return self
+
+    def merge(self, other):
+        """Adds the counts of other and returns the summary."""
+        for item, count in other.counts.items():
+            self.add(item, count, other.errors[item])
+        self.evicted = self.evicted or other.evicted
+        return self
+
+    def modes(self):
+        """Returns the items with the highest guaranteed count.
+
+        The guaranteed count is the count minus its error, which is the
+        true count while no item was evicted.
+        """
+        if not self.counts:
+            return []
+        guaranteed = {item: count - self.errors[item]
+                      for item, count in self.counts.items()}
+        top = max(guaranteed.values())
+        return [item for item, count in guaranteed.items() if count == top]
+
+    def to_dict(self):
+        """Returns the summary as a JSON serializable dictionary."""
+        return {"capacity": self.capacity, "evicted": self.evicted,
+                "items": [[item, count, self.errors[item]]
+                          for item, count in self.counts.items()],
+                "heap": self.heap}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a summary from the dictionary of to_dict."""
+        summary = cls(data["capacity"])
+        for item, count, error in data["items"]:
+            summary.counts[item] = count
+            summary.errors[item] = error
+        summary.heap = [tuple(entry) for entry in data["heap"]]
+        summary.evicted = data["evicted"]
+        return summary
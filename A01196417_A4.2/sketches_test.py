@@ -0,0 +1,144 @@
+"""
+Unit tests for sketches.py
+"""
+
+import bisect
+import collections
+import random
+import unittest
+
+from sketches import KLLSketch, SpaceSaving
+
+
+class TestKLLSketch(unittest.TestCase):
+    """The KLL quantiles stay within their rank error."""
+
+    ERROR = 0.01
+
+    def rank_error(self, sketch, numbers):
+        """Returns the largest rank error of the quantiles at 1% steps."""
+        ordered = sorted(numbers)
+        largest = 0.0
+        for step in range(1, 100):
+            value = sketch.quantile(step / 100)
+            low = bisect.bisect_left(ordered, value)
+            high = bisect.bisect_right(ordered, value)
+            target = step / 100 * len(ordered)
+            distance = max(0, low - target, target - high)
+            largest = max(largest, distance / len(ordered))
+        return largest
+
+    def test_error_bound(self):
+        """TC-01: Quantiles are off by less than the requested error."""
+        for seed in range(3):
+            rng = random.Random(seed)
+            numbers = [rng.gauss(0, 1) for _ in range(100000)]
+            sketch = KLLSketch.for_error(self.ERROR, seed).update(numbers)
+            self.assertEqual(sketch.count, len(numbers))
+            self.assertLessEqual(sketch.size, sketch.max_size)
+            self.assertLessEqual(self.rank_error(sketch, numbers),
+                                 self.ERROR)
+
+    def test_sorted_stream(self):
+        """TC-02: The bound holds for numbers that arrive in order."""
+        numbers = list(range(50000))
+        sketch = KLLSketch.for_error(self.ERROR).update(numbers)
+        self.assertLessEqual(self.rank_error(sketch, numbers), self.ERROR)
+
+    def test_merged_error_bound(self):
+        """TC-03: Merged sketches keep the bound of a single sketch."""
+        rng = random.Random(7)
+        numbers = [rng.expovariate(1) for _ in range(60000)]
+        merged = KLLSketch.for_error(self.ERROR)
+        for seed, start in enumerate(range(0, len(numbers), 7000)):
+            part = KLLSketch.for_error(self.ERROR, seed)
+            merged.merge(part.update(numbers[start:start + 7000]))
+        self.assertEqual(merged.count, len(numbers))
+        self.assertLessEqual(self.rank_error(merged, numbers), self.ERROR)
+
+    def test_exact_below_capacity(self):
+        """TC-04: A stream that fits in the first level is exact."""
+        numbers = [5, 1, 4, 2, 3]
+        sketch = KLLSketch(k=200).update(numbers)
+        self.assertEqual([sketch.quantile(step / 5) for step in range(1, 6)],
+                         [1, 2, 3, 4, 5])
+
+    def test_saved_sketch(self):
+        """TC-05: A sketch rebuilt from to_dict goes on like the original."""
+        rng = random.Random(3)
+        first = [rng.random() for _ in range(20000)]
+        second = [rng.random() for _ in range(20000)]
+        sketch = KLLSketch.for_error(self.ERROR).update(first)
+        restored = KLLSketch.from_dict(sketch.to_dict())
+        sketch.update(second)
+        restored.update(second)
+        self.assertEqual(restored.compactors, sketch.compactors)
+        self.assertEqual(restored.quantile(0.5), sketch.quantile(0.5))
+
+
+class TestSpaceSaving(unittest.TestCase):
+    """Weighted and merged Space-Saving counts keep their guarantees."""
+
+    def check_bounds(self, summary, items, slack=1):
+        """Checks the counts of a summary of items against exact ones.
+
+        The errors stay under slack times total / capacity.
+        """
+        exact = collections.Counter(items)
+        bound = slack * len(items) / summary.capacity
+        self.assertLessEqual(len(summary.counts), summary.capacity)
+        for item, count in summary.counts.items():
+            self.assertLessEqual(summary.errors[item], bound)
+            self.assertLessEqual(count - summary.errors[item], exact[item])
+            self.assertGreaterEqual(count, exact[item])
+        for item, count in exact.items():
+            if count > bound:
+                self.assertIn(item, summary.counts)
+
+    def test_grouped_counts(self):
+        """TC-06: Counts added in groups keep the bounds of single ones."""
+        rng = random.Random(6)
+        numbers = [float(int(rng.paretovariate(1.1))) for _ in range(20000)]
+        summary = SpaceSaving(40)
+        for start in range(0, len(numbers), 1000):
+            summary.update_counts(
+                collections.Counter(numbers[start:start + 1000]).items())
+        self.check_bounds(summary, numbers)
+        self.assertTrue(summary.evicted)
+
+    def test_merged_summaries(self):
+        """TC-07: Merged summaries bracket the counts of the stream.
+
+        Merging adds the counts of each summary, which may double the
+        error of a single summary of the whole stream.
+        """
+        rng = random.Random(8)
+        items = [rng.choice("aaaabbbcdefghij") + str(rng.randrange(30))
+                 for _ in range(30000)]
+        merged = SpaceSaving(60)
+        for start in range(0, len(items), 5000):
+            merged.merge(SpaceSaving(60).update(items[start:start + 5000]))
+        self.check_bounds(merged, items, slack=2)
+
+    def test_exact_modes(self):
+        """TC-08: Without evictions the modes are exact and in order."""
+        summary = SpaceSaving(10).update([3.0, 1.0, 2.0, 1.0, 3.0])
+        self.assertFalse(summary.evicted)
+        self.assertEqual(summary.modes(), [3.0, 1.0])
+        self.assertEqual(SpaceSaving(10).modes(), [])
+
+    def test_saved_summary(self):
+        """TC-09: A summary rebuilt from to_dict goes on like the original."""
+        rng = random.Random(9)
+        numbers = [float(rng.randrange(100)) for _ in range(5000)]
+        summary = SpaceSaving(20).update(numbers)
+        restored = SpaceSaving.from_dict(summary.to_dict())
+        summary.update(numbers)
+        restored.update(numbers)
+        self.assertEqual(restored.counts, summary.counts)
+        self.assertEqual(restored.errors, summary.errors)
+        self.assertEqual(restored.evicted, summary.evicted)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,252 @@
+"""
+Load and concurrency benchmark for the hotel_system persistence layer.
+
+Populates the TXT files with a given number of records, measures the
+latency percentiles and throughput of the create, modify, display and
+delete operations of every class, runs parallel writers against the
+reservation file and against per-hotel shards, and writes the results
+as JSON so runs can be compared.
+
+Usage: python -m benchmarks.load_benchmark [--sizes 1000,10000]
+       [--operations 50] [--writers 4] [--output results.json]
+       [--baseline previous.json] [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from hotel_system.customer import Customer
+from hotel_system.hotel import Hotel
+from hotel_system.reservation import Reservation
+
+from .records_memory import generate_lines
+
+ENTITY_FILES = {
+    "hotels": Hotel,
+    "customers": Customer,
+    "reservations": Reservation,
+}
+
+
+def percentile(samples, fraction):
+    """Returns the nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1,
+                      round(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples):
+    """Summarizes latencies in seconds into milliseconds and ops/s."""
+    total = sum(samples)
+    return {
+        "operations": len(samples),
+        "mean_ms": statistics.mean(samples) * 1000,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p90_ms": percentile(samples, 0.90) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "throughput_ops": len(samples) / total if total else 0.0,
+    }
+
+
+def timed(operation, arguments):
+    """Runs operation once per argument tuple and returns the latencies."""
+    samples = []
+    for args in arguments:
+        start = time.perf_counter()
+        operation(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def populate(directory, size):
+    """Writes size records to every data file inside directory."""
+    for entity, lines in generate_lines(size).items():
+        cls = ENTITY_FILES[entity]
+        cls.DATA_FILE = os.path.join(directory, f"{entity}.txt")
+        with open(cls.DATA_FILE, "w", encoding="utf-8") as file:
+            file.writelines(lines)
+
+
+def bench_size(size, operations):
+    """Measures every operation of every class at a given file size."""
+    keys = [(f"Bench {i}",) for i in range(operations)]
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        populate(directory, size)
+        results["hotels"] = {
+            "create": timed(Hotel.create_hotel,
+                            [(k, "Bench City", "10", "100.00")
+                             for (k,) in keys]),
+            "modify": timed(lambda n: Hotel.modify_hotel(n, rooms="20"),
+                            keys),
+            "display": timed(Hotel.display_hotels, [()] * operations),
+            "delete": timed(Hotel.delete_hotel, keys),
+        }
+        results["customers"] = {
+            "create": timed(Customer.create_customer,
+                            [(k, "bench@example.com", "555-0000")
+                             for (k,) in keys]),
+            "modify": timed(
+                lambda n: Customer.modify_customer(n, phone="555-1111"),
+                keys),
+            "display": timed(Customer.display_customers,
+                             [()] * operations),
+            "delete": timed(Customer.delete_customer, keys),
+        }
+        results["reservations"] = {
+            "create": timed(Reservation.create_reservation,
+                            [(k, "Hotel 1") for (k,) in keys]),
+            "display": timed(Reservation.display_reservations,
+                             [()] * operations),
+            "delete": timed(Reservation.cancel_reservation,
+                            [(k, "Hotel 1") for (k,) in keys]),
+        }
+    return {entity: {name: summarize(samples)
+                     for name, samples in ops.items()}
+            for entity, ops in results.items()}
+
+
+def _writer(data_file, shard_dir, writer_id, operations):
+    """Creates reservations from a worker process.
+
+    Without shards every writer books the same hotel file; with shards
+    each writer books its own hotel, so it only touches its own shard.
+    """
+    Reservation.DATA_FILE = data_file
+    Reservation.SHARD_DIR = shard_dir
+    hotel = f"Hotel {writer_id}" if shard_dir else "Hotel 1"
+    for i in range(operations):
+        Reservation.create_reservation(f"Writer {writer_id} {i}", hotel)
+
+
+def bench_parallel_writers(writers, operations, size, sharded=False):
+    """Runs parallel reservation writers and counts lost updates."""
+    with tempfile.TemporaryDirectory() as directory:
+        populate(directory, size)
+        data_file = Reservation.DATA_FILE
+        shard_dir = os.path.join(directory, "shards") if sharded else None
+        Reservation.SHARD_DIR = shard_dir
+        # Move the populated reservations to their shards before the
+        # writers start, so they do not all migrate them at once.
+        Reservation.migrate()
+        initial = len(Reservation.load_records())
+        processes = [
+            multiprocessing.Process(
+                target=_writer,
+                args=(data_file, shard_dir, i, operations))
+            for i in range(writers)
+        ]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+        stored = len(Reservation.load_records()) - initial
+        Reservation.SHARD_DIR = None
+    expected = writers * operations
+    return {
+        "sharded": sharded,
+        "writers": writers,
+        "operations_per_writer": operations,
+        "elapsed_s": elapsed,
+        "throughput_ops": expected / elapsed if elapsed else 0.0,
+        "stored": stored,
+        "lost_updates": expected - stored,
+    }
+
+
+def find_regressions(results, baseline, tolerance):
+    """Lists the operations whose p50 grew beyond the tolerance."""
+    regressions = []
+    for size, entities in results["sizes"].items():
+        for entity, ops in entities.items():
+            for name, data in ops.items():
+                try:
+                    previous = baseline["sizes"][size][entity][name]
+                except KeyError:
+                    continue
+                limit = previous["p50_ms"] * (1 + tolerance)
+                if data["p50_ms"] > limit:
+                    regressions.append(
+                        f"{size} {entity} {name}: {data['p50_ms']:.2f}ms "
+                        f"> {previous['p50_ms']:.2f}ms")
+    return regressions
+
+
+def parse_args():
+    """Parses the command line options of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", default="1000,10000",
+                        help="comma separated record counts")
+    parser.add_argument("--operations", type=int, default=50,
+                        help="operations measured per size")
+    parser.add_argument("--writers", type=int, default=4,
+                        help="parallel writer processes")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="JSON file for the results")
+    parser.add_argument("--baseline",
+                        help="previous JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p50 slowdown versus the baseline")
+    return parser.parse_args()
+
+
+def run_suite(args):
+    """Runs every benchmark and returns the results."""
+    sizes = [int(size) for size in args.sizes.split(",")]
+    return {
+        "sizes": {str(size): bench_size(size, args.operations)
+                  for size in sizes},
+        "parallel_writers": [
+            bench_parallel_writers(args.writers, args.operations, sizes[0],
+                                   sharded)
+            for sharded in (False, True)
+        ],
+    }
+
+
+def print_results(results):
+    """Prints one line per measured operation and parallel run."""
+    for size, entities in results["sizes"].items():
+        for entity, ops in entities.items():
+            for name, data in ops.items():
+                print(f"{size}\t{entity}\t{name}\t"
+                      f"p50={data['p50_ms']:.2f}ms "
+                      f"p99={data['p99_ms']:.2f}ms "
+                      f"{data['throughput_ops']:.0f} ops/s")
+    for parallel in results["parallel_writers"]:
+        layout = "sharded" if parallel["sharded"] else "single file"
+        print(f"parallel\t{parallel['writers']} writers\t{layout}\t"
+              f"{parallel['throughput_ops']:.0f} ops/s\t"
+              f"lost updates={parallel['lost_updates']}")
+
+
+def main():
+    """Runs the benchmark suite and writes the JSON results."""
+    args = parse_args()
+    results = run_suite(args)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print_results(results)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"[ERROR] Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
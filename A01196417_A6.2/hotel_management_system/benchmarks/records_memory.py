@@ -0,0 +1,96 @@
+"""
+Memory benchmark for the hotel_system record types.
+
+Compares the memory held by the load_data results (lists of string
+parts for hotels, stripped lines for customers and reservations) against
+the __slots__ records returned by load_records and the same records with
+a __dict__, and reports the footprint scaled to one million records.
+Records only save memory for hotels, whose numbers they parse; the two
+string fields of a customer or reservation take more room as a record
+than as one line, which is why load_data keeps the lines.
+
+Usage: python -m benchmarks.records_memory [records]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from hotel_system.customer import Customer
+from hotel_system.hotel import Hotel
+from hotel_system.reservation import Reservation
+
+MILLION = 1_000_000
+
+
+def generate_lines(count):
+    """Generates TXT lines for hotels, customers and reservations."""
+    return {
+        "hotels": [f"Hotel {i}|City {i % 50}|{i % 300 + 1}|{i % 500}.99\n"
+                   for i in range(count)],
+        "customers": [f"Customer {i} | user{i}@example.com | 555-{i:07d}\n"
+                      for i in range(count)],
+        "reservations": [f"Customer {i} | Hotel {i % 1000}\n"
+                         for i in range(count)],
+    }
+
+
+def measure(builder, lines):
+    """Returns the bytes still allocated by the result of builder."""
+    gc.collect()
+    tracemalloc.start()
+    result = builder(lines)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def unslotted(record_type):
+    """Returns a subclass of record_type whose instances have a __dict__."""
+    return type(record_type.__name__, (record_type,), {})
+
+
+def run(count):
+    """Runs the benchmark and returns one row per entity and layout."""
+    lines = generate_lines(count)
+    builders = {
+        "hotels": {
+            "load_data": lambda data: [Hotel.split_line(x) for x in data],
+        },
+        "customers": {
+            "load_data": lambda data: [x.strip() for x in data],
+        },
+        "reservations": {
+            "load_data": lambda data: [x.strip() for x in data],
+        },
+    }
+    for entity, record_type in (("hotels", Hotel),
+                                ("customers", Customer),
+                                ("reservations", Reservation)):
+        plain = unslotted(record_type)
+        builders[entity]["records"] = lambda data, cls=record_type: [
+            cls.from_line(x) for x in data]
+        builders[entity]["records+dict"] = lambda data, cls=plain: [
+            cls.from_line(x) for x in data]
+
+    rows = []
+    for entity, layouts in builders.items():
+        for layout, builder in layouts.items():
+            used = measure(builder, lines[entity])
+            rows.append((entity, layout, used / count,
+                         used / count * MILLION / 2 ** 20))
+    return rows
+
+
+def main():
+    """Prints the memory footprint per record and per million records."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Records: {count}")
+    print("Entity\tLayout\tBytes/record\tMiB/million")
+    for entity, layout, per_record, per_million in run(count):
+        print(f"{entity}\t{layout}\t{per_record:.1f}\t{per_million:.1f}")
+
+
+if __name__ == "__main__":
+    main()
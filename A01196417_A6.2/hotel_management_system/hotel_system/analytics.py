@@ -0,0 +1,139 @@
+"""
+Analytics Module
+
+This module joins the hotel and reservation TXT files into a columnar
+view and computes occupancy and projected revenue per hotel and per
+location in a single pass. Results are cached until any of the
+underlying files change.
+"""
+
+import copy
+import os
+from decimal import Decimal
+
+from .hotel import Hotel
+from .reservation import Reservation
+
+
+class Analytics:
+    """Class that computes occupancy and revenue from the TXT files."""
+    _cache = {}
+
+    @staticmethod
+    def _file_signature(path):
+        """Returns a (path, mtime, size) tuple used to detect changes."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return (path, None, None)
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    @classmethod
+    def _signature(cls):
+        """Returns the combined signature of every data file used."""
+        return (cls._file_signature(Hotel.DATA_FILE),) + tuple(
+            cls._file_signature(path) for path in Reservation.data_files())
+
+    @classmethod
+    def clear_cache(cls):
+        """Discards every cached result."""
+        cls._cache.clear()
+
+    @classmethod
+    def build_view(cls):
+        """Builds the joined columnar view of hotels and reservations.
+
+        Reservations refer to hotels by name, so only the first line of
+        a repeated hotel name enters the view; the others are reported
+        and counted in duplicate_hotels.
+        """
+        view = {
+            "name": [],
+            "location": [],
+            "rooms": [],
+            "price": [],
+            "reservations": [],
+        }
+        index = {}
+        duplicates = 0
+        for hotel in Hotel.load_records():
+            if hotel.name in index:
+                print(f"[ERROR] Duplicate hotel skipped: {hotel.name}")
+                duplicates += 1
+                continue
+            index[hotel.name] = len(view["name"])
+            view["name"].append(hotel.name)
+            view["location"].append(hotel.location)
+            view["rooms"].append(hotel.rooms)
+            view["price"].append(hotel.price)
+            view["reservations"].append(0)
+
+        unmatched = 0
+        for reservation in Reservation.load_records():
+            position = index.get(reservation.hotel_name)
+            if position is None:
+                unmatched += 1
+                continue
+            view["reservations"][position] += 1
+        view["unmatched_reservations"] = unmatched
+        view["duplicate_hotels"] = duplicates
+        return view
+
+    @classmethod
+    def report(cls):
+        """Computes occupancy and revenue per hotel and per location.
+
+        Returns a copy of the cached report, so callers may modify it.
+        """
+        signature = cls._signature()
+        cached = cls._cache.get("report")
+        if cached is not None and cached[0] == signature:
+            return copy.deepcopy(cached[1])
+
+        view = cls.build_view()
+        hotels = {}
+        locations = {}
+        columns = zip(view["name"], view["location"], view["rooms"],
+                      view["price"], view["reservations"])
+        for name, location, rooms, price, booked in columns:
+            revenue = price * booked
+            hotels[name] = {
+                "location": location,
+                "rooms": rooms,
+                "reservations": booked,
+                "occupancy": booked / rooms if rooms else 0.0,
+                "revenue": revenue,
+            }
+            totals = locations.setdefault(location, {
+                "rooms": 0,
+                "reservations": 0,
+                "revenue": Decimal("0"),
+            })
+            totals["rooms"] += rooms
+            totals["reservations"] += booked
+            totals["revenue"] += revenue
+
+        for totals in locations.values():
+            totals["occupancy"] = (totals["reservations"] / totals["rooms"]
+                                   if totals["rooms"] else 0.0)
+
+        result = {
+            "hotels": hotels,
+            "locations": locations,
+            "unmatched_reservations": view["unmatched_reservations"],
+            "duplicate_hotels": view["duplicate_hotels"],
+        }
+        cls._cache["report"] = (signature, result)
+        return copy.deepcopy(result)
+
+    @classmethod
+    def occupancy_by_hotel(cls):
+        """Returns the occupancy ratio of every hotel."""
+        return {name: data["occupancy"]
+                for name, data in cls.report()["hotels"].items()}
+
+    @classmethod
+    def revenue_by_location(cls):
+        """Returns the projected revenue of every location."""
+        return {location: data["revenue"]
+                for location, data in cls.report()["locations"].items()}
@@ -9,10 +9,13 @@ retrieving customer information.
 import os
 import sys
 
+from .instrumentation import traced
+
 
 class Customer:
     """Class representing a Customer stored in a TXT file."""
     DATA_FILE = "customers.txt"
+    __slots__ = ("name", "email", "phone")
 
     def __init__(self, name: str, email: str, phone: str):
         self.name = name
@@ -24,6 +27,30 @@ class Customer:
         return f"{self.name} | {self.email} | {self.phone}\n"
 
     @classmethod
+    def from_line(cls, line):
+        """Parses a line of the TXT file into a Customer record."""
+        parts = line.strip().split(" | ")
+        if len(parts) != 3:
+            raise ValueError(f"Invalid data format: {line.strip()}")
+        return cls(*parts)
+
+    @classmethod
+    def iter_records(cls):
+        """Yields the Customer records of the TXT file.
+
+        Invalid lines are reported and skipped. File errors are raised.
+        """
+        with open(cls.DATA_FILE, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield cls.from_line(line)
+                except ValueError as error:
+                    print(f"[ERROR] {error}",
+                          file=sys.stderr,
+                          flush=True)
+
+    @classmethod
+    @traced("save")
     def save_data(cls, customers):
         """Saves the list of customers to a TXT file."""
         try:
@@ -35,25 +62,53 @@ class Customer:
                   flush=True)
 
     @classmethod
+    @traced("load")
     def load_data(cls):
-        """Loads the list of customers from a TXT file."""
+        """Loads the list of customers from a TXT file as text lines.
+
+        Lines are kept verbatim, invalid ones included, so saving them
+        back does not change the file; load_records parses them.
+        """
         if not os.path.exists(cls.DATA_FILE):
             return []
-        with open(cls.DATA_FILE, "r", encoding="utf-8") as file:
-            return [line.strip() for line in file.readlines()]
+        try:
+            with open(cls.DATA_FILE, "r", encoding="utf-8") as file:
+                return [line.strip() for line in file]
+        except IOError:
+            print("[ERROR] Unable to read customer file.",
+                  file=sys.stderr,
+                  flush=True)
+            return []
+
+    @classmethod
+    @traced("load")
+    def load_records(cls):
+        """Loads the customers from the TXT file as Customer records."""
+        if not os.path.exists(cls.DATA_FILE):
+            return []
+        try:
+            return list(cls.iter_records())
+        except IOError:
+            print("[ERROR] Unable to read customer file.",
+                  file=sys.stderr,
+                  flush=True)
+            return []
 
     @classmethod
+    @traced("operation")
     def create_customer(cls, name, email, phone):
         """Creates a new customer and stores it in the file."""
         customers = cls.load_data()
         if any(c.startswith(name + " |") for c in customers):
             return "[ERROR] Customer already exists."
         new_customer = cls(name, email, phone)
-        customers.append(new_customer.to_string())
-        cls.save_data(customers)
+        lines = [c + "\n" for c in customers]
+        lines.append(new_customer.to_string())
+        cls.save_data(lines)
         return "[INFO] Customer successfully created."
 
     @classmethod
+    @traced("operation")
     def delete_customer(cls, name):
         """Deletes a customer from the file."""
         customers = cls.load_data()
@@ -61,15 +116,17 @@ class Customer:
             c for c in customers if not c.startswith(name + " |")]
         if len(customers) == len(filtered_customers):
             return "[ERROR] Customer not found."
-        cls.save_data(filtered_customers)
+        cls.save_data([c + "\n" for c in filtered_customers])
         return "[INFO] Customer successfully deleted."
 
     @classmethod
+    @traced("operation")
     def display_customers(cls):
         """Returns the list of customers in text format."""
         return cls.load_data()
 
     @classmethod
+    @traced("operation")
     def modify_customer(cls, name, email=None, phone=None):
         """Modifies an existing customer's details."""
         customers = cls.load_data()
@@ -85,5 +142,5 @@ class Customer:
                 modified = True
         if not modified:
             return "[ERROR] Customer not found."
-        cls.save_data(customers)
+        cls.save_data([c + "\n" for c in customers])
         return "[INFO] Customer successfully modified."
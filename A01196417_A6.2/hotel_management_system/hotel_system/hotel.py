@@ -7,11 +7,16 @@ retrieving hotel information.
 """
 
 import os
+import sys
+from decimal import Decimal, InvalidOperation
+
+from .instrumentation import traced
 
 
 class Hotel:
     """Clase que maneja la información de los hoteles."""
     DATA_FILE = "hotels.txt"
+    __slots__ = ("name", "location", "rooms", "price")
 
     def __init__(self, name, location, rooms, price):
         self.name = name
@@ -23,13 +28,35 @@ class Hotel:
         """Convierte atributos en un string formateado para guardar en TXT."""
         return f"{self.name}|{self.location}|{self.rooms}|{self.price}\n"
 
+    @staticmethod
+    def split_line(line):
+        """Separa una línea del TXT en sus campos o devuelve None."""
+        parts = line.strip().split("|")
+        return parts if len(parts) == 4 else None
+
+    @classmethod
+    def from_line(cls, line):
+        """Convierte una línea del TXT en un registro Hotel con números."""
+        parts = cls.split_line(line)
+        if parts is None:
+            raise ValueError(f"Invalid data format: {line.strip()}")
+        name, location, rooms, price = parts
+        try:
+            return cls(name, sys.intern(location), int(rooms),
+                       Decimal(price))
+        except (ValueError, InvalidOperation) as error:
+            raise ValueError(
+                f"Invalid hotel values: {line.strip()}") from error
+
     @classmethod
+    @traced("save")
     def save_data(cls, hotels):
         """Guarda la lista de hoteles en un archivo TXT."""
         with open(cls.DATA_FILE, "w", encoding="utf-8") as file:
             file.writelines(hotels)
 
     @classmethod
+    @traced("load")
     def load_data(cls):
         """Carga los hoteles desde el archivo TXT y maneja datos inválidos."""
         if not os.path.exists(cls.DATA_FILE):
@@ -39,8 +66,8 @@ class Hotel:
         try:
             with open(cls.DATA_FILE, "r", encoding="utf-8") as file:
                 for line in file:
-                    parts = line.strip().split("|")
-                    if len(parts) == 4:
+                    parts = cls.split_line(line)
+                    if parts is not None:
                         hotels.append(parts)
                     else:
                         print(f"[ERROR] Invalid data format: {line.strip()}")
@@ -50,6 +77,27 @@ class Hotel:
         return hotels
 
     @classmethod
+    @traced("load")
+    def load_records(cls):
+        """Carga los hoteles como registros Hotel con rooms y price."""
+        if not os.path.exists(cls.DATA_FILE):
+            return []
+
+        hotels = []
+        try:
+            with open(cls.DATA_FILE, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        hotels.append(cls.from_line(line))
+                    except ValueError as error:
+                        print(f"[ERROR] {error}")
+        except OSError as error:
+            print(f"[ERROR] Failed to load hotel data: {error}")
+            return []
+        return hotels
+
+    @classmethod
+    @traced("operation")
     def create_hotel(cls, name, location, rooms, price):
         """Crea un nuevo hotel y lo guarda en el archivo."""
         hotels = cls.load_data()
@@ -59,17 +107,19 @@ class Hotel:
             return "[ERROR] El hotel ya existe."
 
         new_hotel = f"{name}|{location}|{rooms}|{price}\n"
-        hotels.append(new_hotel)
-        cls.save_data(hotels)
+        lines = ["|".join(hotel) + "\n" for hotel in hotels]
+        lines.append(new_hotel)
+        cls.save_data(lines)
         return "[INFO] Hotel creado exitosamente."
 
     @classmethod
+    @traced("operation")
     def modify_hotel(cls, name, location=None, rooms=None, price=None):
         """Modifica la información de un hotel existente."""
         hotels = cls.load_data()
         found = False
 
-        for i, hotel in enumerate(hotels):
+        for hotel in hotels:
             if hotel[0] == name:
                 if location:
                     hotel[1] = location
@@ -77,15 +127,15 @@ class Hotel:
                     hotel[2] = rooms
                 if price:
                     hotel[3] = price
-                hotels[i] = "|".join(hotel) + "\n"
                 found = True
 
         if found:
-            cls.save_data(hotels)
+            cls.save_data(["|".join(hotel) + "\n" for hotel in hotels])
             return "[INFO] Hotel modificado exitosamente."
         return "[ERROR] Hotel no encontrado."
 
     @classmethod
+    @traced("operation")
     def delete_hotel(cls, name):
         """Elimina un hotel por nombre."""
         hotels = cls.load_data()
@@ -98,6 +148,7 @@ class Hotel:
         return "[INFO] Hotel eliminado exitosamente."
 
     @classmethod
+    @traced("operation")
     def display_hotels(cls):
         """Muestra la lista de hoteles disponibles."""
         hotels = cls.load_data()
@@ -0,0 +1,156 @@
+"""
+Instrumentation Module
+
+This module provides an optional tracing layer for the hotel_system
+classes. When enabled it records, per operation, the time spent loading
+the TXT file, scanning the records and saving the file, together with
+the bytes read or written and the number of records involved. Metrics
+can be exported as JSON or in the Prometheus text format. When disabled
+the traced methods only pay for a single attribute check.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+
+class Instrumentation:
+    """Class that collects the timings of the traced operations."""
+    enabled = os.environ.get("HOTEL_SYSTEM_TRACE") == "1"
+    _metrics = {}
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    @classmethod
+    def enable(cls):
+        """Starts recording metrics."""
+        cls.enabled = True
+
+    @classmethod
+    def disable(cls):
+        """Stops recording metrics."""
+        cls.enabled = False
+
+    @classmethod
+    def reset(cls):
+        """Discards every recorded metric."""
+        with cls._lock:
+            cls._metrics = {}
+
+    @classmethod
+    def record(cls, operation, phase, seconds, size=0, records=0):
+        """Adds one measurement of a phase of an operation."""
+        with cls._lock:
+            metric = cls._metrics.setdefault((operation, phase), {
+                "calls": 0,
+                "seconds": 0.0,
+                "bytes": 0,
+                "records": 0,
+            })
+            metric["calls"] += 1
+            metric["seconds"] += seconds
+            metric["bytes"] += size
+            metric["records"] += records
+
+    @classmethod
+    def snapshot(cls):
+        """Returns a copy of the metrics as a list of dictionaries."""
+        with cls._lock:
+            return [dict(metric, operation=operation, phase=phase)
+                    for (operation, phase), metric
+                    in sorted(cls._metrics.items())]
+
+    @classmethod
+    def to_json(cls):
+        """Exports the metrics as a JSON document."""
+        return json.dumps(cls.snapshot(), indent=2)
+
+    @classmethod
+    def to_prometheus(cls):
+        """Exports the metrics in the Prometheus text format."""
+        metrics = cls.snapshot()
+        lines = []
+        for field, description in (
+                ("calls", "Number of times the phase ran."),
+                ("seconds", "Time spent in the phase."),
+                ("bytes", "Bytes read or written by the phase."),
+                ("records", "Records loaded or saved by the phase.")):
+            name = f"hotel_system_phase_{field}_total"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            for metric in metrics:
+                lines.append(
+                    f'{name}{{operation="{metric["operation"]}",'
+                    f'phase="{metric["phase"]}"}} {metric[field]}')
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def stack(cls):
+        """Returns the stack of traced calls of the current thread."""
+        if not hasattr(cls._local, "stack"):
+            cls._local.stack = []
+        return cls._local.stack
+
+
+def _data_size(cls, hotel_name):
+    """Returns the bytes of the data files of a class that exist."""
+    if hasattr(cls, "data_files"):
+        paths = cls.data_files(hotel_name)
+    else:
+        paths = [cls.DATA_FILE]
+    size = 0
+    for path in paths:
+        try:
+            size += os.path.getsize(path)
+        except OSError:
+            pass
+    return size
+
+
+def traced(phase):
+    """Decorates a classmethod so its calls are recorded as a phase.
+
+    The "load" and "save" phases record the size of the class data files
+    (the DATA_FILE, or the shards named by a hotel_name keyword argument)
+    and the number of records. Any other phase is an operation: it
+    records its total time and, as "scan", the time not spent in nested
+    load and save calls. Nested calls are attributed to the outermost
+    traced operation.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(cls, *args, **kwargs):
+            if not Instrumentation.enabled:
+                return func(cls, *args, **kwargs)
+
+            stack = Instrumentation.stack()
+            name = f"{cls.__name__}.{func.__name__}"
+            frame = [stack[-1][0] if stack else name, 0.0]
+            stack.append(frame)
+            start = time.perf_counter()
+            try:
+                result = func(cls, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+
+            operation = frame[0]
+            if phase == "load":
+                Instrumentation.record(
+                    operation, phase, elapsed,
+                    _data_size(cls, kwargs.get("hotel_name")), len(result))
+            elif phase == "save":
+                Instrumentation.record(
+                    operation, phase, elapsed,
+                    _data_size(cls, kwargs.get("hotel_name")), len(args[0]))
+            else:
+                Instrumentation.record(operation, "scan",
+                                       elapsed - frame[1])
+                Instrumentation.record(operation, "total", elapsed)
+            return result
+        return wrapper
+    return decorator
@@ -3,14 +3,26 @@ Reservation Management Module
 
 This module provides functionality to manage reservations using a TXT file
 for data persistence. It allows creating, deleting, and getting reservations.
+Reservations can optionally be sharded into one TXT file per hotel.
 """
 
+import glob
+import hashlib
 import os
+import sys
+import time
+
+from .instrumentation import traced
 
 
 class Reservation:
     """Clase que maneja las Reservaciones con persistencia en TXT."""
     DATA_FILE = "reservations.txt"
+    # Directorio de particiones por hotel; None usa solo DATA_FILE.
+    SHARD_DIR = None
+    # Segundos que se espera el candado de la migración de DATA_FILE.
+    LOCK_TIMEOUT = 10.0
+    __slots__ = ("customer_name", "hotel_name")
 
     def __init__(self, customer_name: str, hotel_name: str):
         self.customer_name = customer_name
@@ -21,44 +33,194 @@ class Reservation:
         return f"{self.customer_name} | {self.hotel_name}\n"
 
     @classmethod
-    def save_data(cls, reservations):
+    def from_line(cls, line):
+        """Convierte una línea del archivo en un registro Reservation."""
+        parts = line.strip().split(" | ")
+        if len(parts) != 2:
+            raise ValueError(f"Invalid data format: {line.strip()}")
+        # Hotel names repeat across reservations, so share one copy.
+        return cls(parts[0], sys.intern(parts[1]))
+
+    @classmethod
+    def shard_file(cls, hotel_name):
+        """Devuelve el archivo de la partición de un hotel."""
+        digest = hashlib.sha1(hotel_name.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(cls.SHARD_DIR, f"reservations_{digest}.txt")
+
+    @classmethod
+    def data_files(cls, hotel_name=None):
+        """Devuelve los archivos que contienen las reservaciones pedidas.
+
+        Sin particiones siempre es DATA_FILE. Con particiones es el archivo
+        del hotel indicado o, sin hotel, todas las particiones existentes
+        junto con DATA_FILE si aún tiene reservaciones sin migrar.
+        """
+        if cls.SHARD_DIR is None:
+            return [cls.DATA_FILE]
+        if hotel_name is None:
+            legacy = ([cls.DATA_FILE] if os.path.exists(cls.DATA_FILE)
+                      else [])
+            return legacy + sorted(glob.glob(
+                os.path.join(cls.SHARD_DIR, "reservations_*.txt")))
+        return [cls.shard_file(hotel_name)]
+
+    @classmethod
+    def read_file(cls, path):
+        """Genera los registros Reservation de un archivo.
+
+        Las líneas inválidas se reportan y se omiten; los errores de
+        archivo se propagan.
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield cls.from_line(line)
+                except ValueError as error:
+                    print(f"[ERROR] {error}")
+
+    @classmethod
+    def iter_records(cls, hotel_name=None):
+        """Genera los registros Reservation de los archivos pedidos."""
+        for path in cls.data_files(hotel_name):
+            if os.path.exists(path):
+                yield from cls.read_file(path)
+
+    @classmethod
+    def acquire_lock(cls, path):
+        """Crea el archivo de candado path en exclusiva.
+
+        Espera hasta LOCK_TIMEOUT segundos mientras otro proceso lo tenga
+        y devuelve su descriptor, o None si no se liberó.
+        """
+        deadline = time.monotonic() + cls.LOCK_TIMEOUT
+        while True:
+            try:
+                return os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if time.monotonic() >= deadline:
+                    return None
+                time.sleep(0.01)
+
+    @classmethod
+    def migrate(cls):
+        """Mueve las reservaciones de DATA_FILE a las particiones por hotel.
+
+        No hace nada sin particiones o sin DATA_FILE. La migración se hace
+        con un archivo de candado junto a DATA_FILE, así que entre varios
+        procesos solo uno la hace y los demás esperan a que termine. Las
+        reservaciones que ya están en su partición no se duplican, y
+        DATA_FILE se elimina solo si todas se guardaron. Devuelve el número
+        de reservaciones migradas.
+        """
+        if cls.SHARD_DIR is None or not os.path.exists(cls.DATA_FILE):
+            return 0
+        lock = cls.DATA_FILE + ".lock"
+        handle = cls.acquire_lock(lock)
+        if handle is None:
+            print(f"[ERROR] La migración sigue bloqueada por {lock}.")
+            return 0
+        try:
+            # Otro proceso pudo terminar la migración mientras se esperaba.
+            if not os.path.exists(cls.DATA_FILE):
+                return 0
+            return cls.migrate_locked()
+        finally:
+            os.close(handle)
+            os.remove(lock)
+
+    @classmethod
+    def migrate_locked(cls):
+        """Reparte DATA_FILE en las particiones con el candado tomado."""
+        by_hotel = {}
+        try:
+            for reservation in cls.read_file(cls.DATA_FILE):
+                by_hotel.setdefault(reservation.hotel_name, []).append(
+                    reservation.to_line())
+            os.makedirs(cls.SHARD_DIR, exist_ok=True)
+            for hotel_name, lines in by_hotel.items():
+                path = cls.shard_file(hotel_name)
+                existing = set()
+                if os.path.exists(path):
+                    with open(path, "r", encoding="utf-8") as file:
+                        existing.update(file)
+                with open(path, "a", encoding="utf-8") as file:
+                    file.writelines(dict.fromkeys(
+                        line for line in lines if line not in existing))
+            try:
+                os.remove(cls.DATA_FILE)
+            except FileNotFoundError:
+                pass
+        except OSError:
+            print("[ERROR] No se pudo migrar el archivo de reservaciones.")
+            return 0
+        return sum(len(lines) for lines in by_hotel.values())
+
+    @classmethod
+    @traced("save")
+    def save_data(cls, reservations, *, hotel_name=None):
         """Guarda las reservaciones en un archivo de texto."""
+        path = cls.DATA_FILE
+        if cls.SHARD_DIR is not None and hotel_name is not None:
+            path = cls.shard_file(hotel_name)
         try:
-            with open(cls.DATA_FILE, "w", encoding="utf-8") as file:
+            if cls.SHARD_DIR is not None:
+                os.makedirs(cls.SHARD_DIR, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
                 file.writelines(reservations)
         except IOError:
             print("[ERROR] No se pudo guardar el archivo de reservaciones.")
 
     @classmethod
-    def load_data(cls):
-        """Carga las reservaciones desde el archivo de texto."""
-        if not os.path.exists(cls.DATA_FILE):
+    @traced("load")
+    def load_data(cls, *, hotel_name=None):
+        """Carga las reservaciones desde el archivo de texto como líneas.
+
+        Las líneas se conservan tal cual, incluso las inválidas, para que
+        guardarlas no cambie el archivo; load_records las interpreta.
+        """
+        lines = []
+        try:
+            for path in cls.data_files(hotel_name):
+                if os.path.exists(path):
+                    with open(path, "r", encoding="utf-8") as file:
+                        lines.extend(line.strip() for line in file)
+        except IOError:
+            print("[ERROR] No se pudo leer el archivo de reservaciones.")
             return []
+        return lines
 
+    @classmethod
+    @traced("load")
+    def load_records(cls, *, hotel_name=None):
+        """Carga las reservaciones como registros Reservation."""
         try:
-            with open(cls.DATA_FILE, "r", encoding="utf-8") as file:
-                return [line.strip() for line in file.readlines()]
+            return list(cls.iter_records(hotel_name))
         except IOError:
             print("[ERROR] No se pudo leer el archivo de reservaciones.")
             return []
 
     @classmethod
+    @traced("operation")
     def create_reservation(cls, customer_name, hotel_name):
         """Crea una nueva reservación si no existe una igual."""
-        reservations = cls.load_data()
+        cls.migrate()
+        reservations = cls.load_data(hotel_name=hotel_name)
         new_reservation = f"{customer_name} | {hotel_name}"
 
         if new_reservation in reservations:
             return "[ERROR] La reservación ya existe."
 
         reservations.append(new_reservation)
-        cls.save_data([res + "\n" for res in reservations])
+        cls.save_data([res + "\n" for res in reservations],
+                      hotel_name=hotel_name)
         return "[INFO] Reservación creada exitosamente."
 
     @classmethod
+    @traced("operation")
     def cancel_reservation(cls, customer_name, hotel_name):
         """Cancela una reservación existente."""
-        reservations = cls.load_data()
+        cls.migrate()
+        reservations = cls.load_data(hotel_name=hotel_name)
         updated_reservations = [
             r for r in reservations if r != f"{customer_name} | {hotel_name}"
         ]
@@ -66,10 +228,12 @@ class Reservation:
         if len(updated_reservations) == len(reservations):
             return "[ERROR] Reservación no encontrada."
 
-        cls.save_data([res + "\n" for res in updated_reservations])
+        cls.save_data([res + "\n" for res in updated_reservations],
+                      hotel_name=hotel_name)
         return "[INFO] Reservación cancelada exitosamente."
 
     @classmethod
+    @traced("operation")
     def display_reservations(cls):
         """Devuelve la lista de reservaciones."""
         return cls.load_data()
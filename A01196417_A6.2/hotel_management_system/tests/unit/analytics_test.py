@@ -0,0 +1,125 @@
+"""
+This module contains tests for analytics.py module
+"""
+
+import unittest
+import os
+import io
+from decimal import Decimal
+from unittest.mock import patch
+from hotel_system.analytics import Analytics
+from hotel_system.hotel import Hotel
+from hotel_system.reservation import Reservation
+
+
+class TestAnalytics(unittest.TestCase):
+    """Unit tests for the Analytics class."""
+
+    def setUp(self):
+        """Points every class to temporary files before each test."""
+        self.hotel_file = "test_analytics_hotels.txt"
+        self.reservation_file = "test_analytics_reservations.txt"
+        Hotel.DATA_FILE = self.hotel_file
+        Reservation.DATA_FILE = self.reservation_file
+        Analytics.clear_cache()
+        self.cleanup_files()
+
+    def tearDown(self):
+        """Deletes the temporary files after each test."""
+        self.cleanup_files()
+
+    def cleanup_files(self):
+        """Deletes the temporary files if they exist."""
+        for path in (self.hotel_file, self.reservation_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def populate(self):
+        """Creates two hotels in one location and one in another."""
+        Hotel.create_hotel("Hotel Plaza", "NYC", "4", "150.00")
+        Hotel.create_hotel("Hotel Park", "NYC", "2", "99.50")
+        Hotel.create_hotel("Hotel Sol", "Cancun", "10", "80.00")
+        Reservation.create_reservation("John Doe", "Hotel Plaza")
+        Reservation.create_reservation("Ana Gomez", "Hotel Plaza")
+        Reservation.create_reservation("Luis Torres", "Hotel Park")
+
+    def test_empty_files(self):
+        """TC-01: Without data the report is empty."""
+        report = Analytics.report()
+        self.assertEqual(report["hotels"], {})
+        self.assertEqual(report["locations"], {})
+
+    def test_hotel_report(self):
+        """TC-02: Occupancy and revenue are computed per hotel."""
+        self.populate()
+        hotels = Analytics.report()["hotels"]
+        self.assertEqual(hotels["Hotel Plaza"]["reservations"], 2)
+        self.assertEqual(hotels["Hotel Plaza"]["occupancy"], 0.5)
+        self.assertEqual(hotels["Hotel Plaza"]["revenue"], Decimal("300.00"))
+        self.assertEqual(hotels["Hotel Sol"]["occupancy"], 0.0)
+
+    def test_location_report(self):
+        """TC-03: Hotels are aggregated by location."""
+        self.populate()
+        self.assertEqual(Analytics.revenue_by_location(),
+                         {"NYC": Decimal("399.50"),
+                          "Cancun": Decimal("0.00")})
+        nyc = Analytics.report()["locations"]["NYC"]
+        self.assertEqual(nyc["rooms"], 6)
+        self.assertEqual(nyc["occupancy"], 0.5)
+
+    def test_unmatched_reservations(self):
+        """TC-04: Reservations for unknown hotels are counted apart."""
+        self.populate()
+        Reservation.create_reservation("John Doe", "Hotel Ghost")
+        report = Analytics.report()
+        self.assertEqual(report["unmatched_reservations"], 1)
+        self.assertNotIn("Hotel Ghost", Analytics.occupancy_by_hotel())
+
+    def test_report_is_cached(self):
+        """TC-05: The files are not read again while unchanged."""
+        self.populate()
+        first = Analytics.report()
+        with patch.object(Hotel, "load_records") as mock_load:
+            second = Analytics.report()
+        mock_load.assert_not_called()
+        self.assertEqual(first, second)
+        first["hotels"].clear()
+        self.assertIn("Hotel Sol", Analytics.report()["hotels"])
+
+    def test_cache_invalidated_on_change(self):
+        """TC-06: A change in the files refreshes the report."""
+        self.populate()
+        Analytics.report()
+        Reservation.create_reservation("Maria Ruiz", "Hotel Sol")
+        occupancy = Analytics.occupancy_by_hotel()
+        self.assertEqual(occupancy["Hotel Sol"], 0.1)
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_invalid_hotel_values(self, mock_stdout):
+        """TC-07: Hotels with invalid rooms or price are skipped."""
+        with open(self.hotel_file, "w", encoding="utf-8") as file:
+            file.write("Hotel Bad|NYC|many|cheap\n")
+        report = Analytics.report()
+        self.assertEqual(report["hotels"], {})
+        self.assertIn("[ERROR] Invalid hotel values: Hotel Bad",
+                      mock_stdout.getvalue())
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_duplicate_hotels(self, mock_stdout):
+        """TC-08: A repeated hotel name is skipped in both views."""
+        with open(self.hotel_file, "w", encoding="utf-8") as file:
+            file.write("Hotel Plaza|NYC|4|150.00\n"
+                       "Hotel Plaza|Boston|6|90.00\n")
+        Reservation.create_reservation("John Doe", "Hotel Plaza")
+        report = Analytics.report()
+        self.assertEqual(report["duplicate_hotels"], 1)
+        self.assertEqual(report["hotels"]["Hotel Plaza"]["location"], "NYC")
+        self.assertEqual(report["locations"]["NYC"]["rooms"], 4)
+        self.assertNotIn("Boston", report["locations"])
+        self.assertIn("[ERROR] Duplicate hotel skipped: Hotel Plaza",
+                      mock_stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
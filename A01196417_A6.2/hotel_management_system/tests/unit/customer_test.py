@@ -98,6 +98,43 @@ class TestCustomer(unittest.TestCase):
         result = Customer.load_data()
         self.assertEqual(result, [])
 
+    def test_create_multiple_customers(self):
+        """TC-12: Test that every customer is stored on its own line."""
+        Customer.create_customer("Juan Perez", "juan@example.com", "555-1234")
+        Customer.create_customer("Ana Gomez", "ana@example.com", "555-5678")
+        customers = Customer.display_customers()
+        self.assertEqual(customers,
+                         ["Juan Perez | juan@example.com | 555-1234",
+                          "Ana Gomez | ana@example.com | 555-5678"])
+
+    def test_load_records(self):
+        """TC-13: Test loading customers as slotted records."""
+        Customer.create_customer("Juan Perez", "juan@example.com", "555-1234")
+        records = Customer.load_records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].email, "juan@example.com")
+        self.assertFalse(hasattr(records[0], "__dict__"))
+
+    @patch("sys.stderr", new_callable=StringIO)
+    def test_load_records_invalid_line(self, mock_stderr):
+        """TC-14: Test that invalid lines are reported and skipped."""
+        with open(self.test_file, "w", encoding="utf-8") as file:
+            file.write("INVALID LINE\nAna | ana@example.com | 555\n")
+        records = Customer.load_records()
+        self.assertEqual([c.name for c in records], ["Ana"])
+        self.assertIn("[ERROR] Invalid data format: INVALID LINE",
+                      mock_stderr.getvalue())
+
+    def test_load_data_invalid_line(self):
+        """TC-15: Test that invalid lines are kept when the file is saved."""
+        with open(self.test_file, "w", encoding="utf-8") as file:
+            file.write("INVALID LINE\nAna | ana@example.com | 555\n")
+        self.assertEqual(Customer.load_data(),
+                         ["INVALID LINE", "Ana | ana@example.com | 555"])
+        Customer.create_customer("Juan Perez", "juan@example.com", "555-1234")
+        with open(self.test_file, "r", encoding="utf-8") as file:
+            self.assertEqual(file.readline(), "INVALID LINE\n")
+
 
 if __name__ == "__main__":
     unittest.main()
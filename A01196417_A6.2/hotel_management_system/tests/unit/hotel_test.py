@@ -4,6 +4,7 @@ This module contains tests for hotel.py module
 
 import unittest
 import os
+from decimal import Decimal
 from hotel_system.hotel import Hotel
 
 
@@ -70,6 +71,31 @@ class TestHotel(unittest.TestCase):
         hotels = Hotel.display_hotels()
         self.assertEqual(hotels, [])
 
+    def test_create_multiple_hotels(self):
+        """Prueba la creación y modificación con varios hoteles."""
+        Hotel.create_hotel("Hotel Uno", "Lugar A", "10", "50.0")
+        Hotel.create_hotel("Hotel Dos", "Lugar B", "20", "80.0")
+        Hotel.modify_hotel("Hotel Uno", rooms="15")
+        hotels = Hotel.display_hotels()
+        self.assertEqual(hotels, [["Hotel Uno", "Lugar A", "15", "50.0"],
+                                  ["Hotel Dos", "Lugar B", "20", "80.0"]])
+
+    def test_load_records(self):
+        """Prueba que los registros tienen rooms y price numéricos."""
+        Hotel.create_hotel("Hotel Num", "Ciudad C", "25", "99.90")
+        hotel = Hotel.load_records()[0]
+        self.assertEqual(hotel.rooms, 25)
+        self.assertEqual(hotel.price, Decimal("99.90"))
+        self.assertEqual(hotel.to_string(), "Hotel Num|Ciudad C|25|99.90\n")
+        self.assertFalse(hasattr(hotel, "__dict__"))
+
+    def test_from_line_invalid_values(self):
+        """Prueba el manejo de valores no numéricos en una línea."""
+        with self.assertRaises(ValueError):
+            Hotel.from_line("Hotel Malo|Ciudad|muchos|caro\n")
+        with self.assertRaises(ValueError):
+            Hotel.from_line("INVALID DATA LINE\n")
+
 
 if __name__ == "__main__":
     unittest.main()
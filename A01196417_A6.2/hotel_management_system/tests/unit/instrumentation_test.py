@@ -0,0 +1,84 @@
+"""
+This module contains tests for instrumentation.py module
+"""
+
+import unittest
+import os
+import json
+from hotel_system.instrumentation import Instrumentation
+from hotel_system.hotel import Hotel
+from hotel_system.customer import Customer
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Unit tests for the Instrumentation class."""
+
+    def setUp(self):
+        """Enables the instrumentation over temporary files."""
+        self.hotel_file = "test_trace_hotels.txt"
+        self.customer_file = "test_trace_customers.txt"
+        Hotel.DATA_FILE = self.hotel_file
+        Customer.DATA_FILE = self.customer_file
+        self.was_enabled = Instrumentation.enabled
+        Instrumentation.reset()
+        Instrumentation.enable()
+
+    def tearDown(self):
+        """Restores the instrumentation and deletes the files."""
+        Instrumentation.enabled = self.was_enabled
+        Instrumentation.reset()
+        for path in (self.hotel_file, self.customer_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def metrics(self):
+        """Returns the snapshot indexed by operation and phase."""
+        return {(m["operation"], m["phase"]): m
+                for m in Instrumentation.snapshot()}
+
+    def test_operation_phases(self):
+        """TC-01: An operation records its load, scan and save phases."""
+        Hotel.create_hotel("Hotel Uno", "Lugar A", "10", "50.0")
+        Hotel.create_hotel("Hotel Dos", "Lugar B", "20", "80.0")
+        metrics = self.metrics()
+        for phase in ("load", "scan", "save", "total"):
+            self.assertEqual(
+                metrics[("Hotel.create_hotel", phase)]["calls"], 2)
+        save = metrics[("Hotel.create_hotel", "save")]
+        self.assertEqual(save["records"], 3)
+        self.assertGreater(save["bytes"], 0)
+        self.assertEqual(metrics[("Hotel.create_hotel", "load")]["records"],
+                         1)
+        self.assertNotIn(("Hotel.load_data", "load"), metrics)
+
+    def test_direct_load(self):
+        """TC-02: A direct load is recorded under its own name."""
+        Customer.create_customer("Ana Gomez", "ana@example.com", "555")
+        Instrumentation.reset()
+        Customer.load_records()
+        metrics = self.metrics()
+        load = metrics[("Customer.load_records", "load")]
+        self.assertEqual(load["records"], 1)
+        self.assertEqual(load["bytes"], os.path.getsize(self.customer_file))
+
+    def test_disabled(self):
+        """TC-03: Nothing is recorded while disabled."""
+        Instrumentation.disable()
+        Hotel.create_hotel("Hotel Uno", "Lugar A", "10", "50.0")
+        self.assertEqual(Instrumentation.snapshot(), [])
+
+    def test_exports(self):
+        """TC-04: Metrics are exported as JSON and Prometheus text."""
+        Customer.display_customers()
+        document = json.loads(Instrumentation.to_json())
+        phases = {m["phase"] for m in document
+                  if m["operation"] == "Customer.display_customers"}
+        self.assertEqual(phases, {"load", "scan", "total"})
+        text = Instrumentation.to_prometheus()
+        self.assertIn("# TYPE hotel_system_phase_calls_total counter", text)
+        self.assertIn('hotel_system_phase_calls_total{operation='
+                      '"Customer.display_customers",phase="total"} 1', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,10 +5,21 @@ This module contains tests for reservation.py module
 import unittest
 import os
 import io
+import multiprocessing
+import shutil
+import tempfile
 from unittest.mock import patch, mock_open
 from hotel_system.reservation import Reservation
 
 
+def write_reservation(barrier, data_file, shard_dir, hotel_name):
+    """Crea una reservación particionada en otro proceso."""
+    Reservation.DATA_FILE = data_file
+    Reservation.SHARD_DIR = shard_dir
+    barrier.wait()
+    Reservation.create_reservation("Nuevo Cliente", hotel_name)
+
+
 class TestReservation(unittest.TestCase):
     """Pruebas unitarias para la clase Reservation."""
 
@@ -105,6 +116,154 @@ class TestReservation(unittest.TestCase):
             mock_stdout.getvalue()
         )
 
+    def test_load_records(self):
+        """Prueba la carga de reservaciones como registros."""
+        Reservation.create_reservation("Carlos Lopez", "Hotel Plaza")
+        with open(self.test_file, "a", encoding="utf-8") as file:
+            file.write("INVALID LINE\n")
+        with patch("sys.stdout", new_callable=io.StringIO):
+            records = Reservation.load_records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].hotel_name, "Hotel Plaza")
+        self.assertEqual(records[0].to_line(), "Carlos Lopez | Hotel Plaza\n")
+
+    def test_invalid_lines_kept(self):
+        """Prueba que las líneas inválidas se conservan al guardar."""
+        with open(self.test_file, "w", encoding="utf-8") as file:
+            file.write("INVALID LINE\n")
+        Reservation.create_reservation("Carlos Lopez", "Hotel Plaza")
+        self.assertEqual(Reservation.load_data(),
+                         ["INVALID LINE", "Carlos Lopez | Hotel Plaza"])
+
+
+class TestShardedReservation(unittest.TestCase):
+    """Pruebas unitarias de las reservaciones particionadas por hotel."""
+
+    def setUp(self):
+        """Activa las particiones en un directorio temporal."""
+        self.shard_dir = tempfile.mkdtemp()
+        self.saved = (Reservation.DATA_FILE, Reservation.SHARD_DIR)
+        Reservation.DATA_FILE = os.path.join(self.shard_dir, "single.txt")
+        Reservation.SHARD_DIR = self.shard_dir
+
+    def tearDown(self):
+        """Restaura la configuración y elimina el directorio."""
+        Reservation.DATA_FILE, Reservation.SHARD_DIR = self.saved
+        shutil.rmtree(self.shard_dir)
+
+    def write_legacy(self, *lines):
+        """Escribe reservaciones en el archivo sin particiones."""
+        with open(Reservation.DATA_FILE, "w", encoding="utf-8") as file:
+            file.writelines(line + "\n" for line in lines)
+
+    def test_reservations_go_to_hotel_shard(self):
+        """Cada hotel guarda sus reservaciones en su propio archivo."""
+        Reservation.create_reservation("Juan Perez", "Hotel Central")
+        Reservation.create_reservation("Ana Gomez", "Hotel Central")
+        Reservation.create_reservation("Luis Torres", "Hotel Beach")
+        with open(Reservation.shard_file("Hotel Central"), "r",
+                  encoding="utf-8") as file:
+            self.assertEqual(file.read(), "Juan Perez | Hotel Central\n"
+                                          "Ana Gomez | Hotel Central\n")
+        self.assertEqual(len(Reservation.data_files()), 2)
+        self.assertFalse(os.path.exists(Reservation.DATA_FILE))
+
+    def test_display_merges_shards(self):
+        """Mostrar reservaciones une todas las particiones."""
+        Reservation.create_reservation("Juan Perez", "Hotel Central")
+        Reservation.create_reservation("Luis Torres", "Hotel Beach")
+        self.assertEqual(sorted(Reservation.display_reservations()),
+                         ["Juan Perez | Hotel Central",
+                          "Luis Torres | Hotel Beach"])
+        self.assertEqual(
+            Reservation.load_data(hotel_name="Hotel Beach"),
+            ["Luis Torres | Hotel Beach"])
+
+    def test_cancel_only_touches_shard(self):
+        """Cancelar una reservación solo modifica la partición del hotel."""
+        Reservation.create_reservation("Juan Perez", "Hotel Central")
+        Reservation.create_reservation("Luis Torres", "Hotel Beach")
+        beach = Reservation.shard_file("Hotel Beach")
+        before = os.stat(beach).st_mtime_ns
+        result = Reservation.cancel_reservation("Juan Perez", "Hotel Central")
+        self.assertEqual(result, "[INFO] Reservación cancelada exitosamente.")
+        self.assertEqual(os.stat(beach).st_mtime_ns, before)
+        self.assertEqual(Reservation.display_reservations(),
+                         ["Luis Torres | Hotel Beach"])
+
+    def test_legacy_file_is_read(self):
+        """Las reservaciones previas a las particiones siguen visibles."""
+        self.write_legacy("Juan Perez | Hotel Central")
+        Reservation.save_data(["Luis Torres | Hotel Beach\n"],
+                              hotel_name="Hotel Beach")
+        self.assertEqual(Reservation.display_reservations(),
+                         ["Juan Perez | Hotel Central",
+                          "Luis Torres | Hotel Beach"])
+
+    def test_migrate_moves_legacy_file(self):
+        """Migrar reparte DATA_FILE en particiones sin duplicar."""
+        self.write_legacy("Juan Perez | Hotel Central",
+                          "Ana Gomez | Hotel Central",
+                          "Luis Torres | Hotel Beach")
+        Reservation.save_data(["Juan Perez | Hotel Central\n"],
+                              hotel_name="Hotel Central")
+        self.assertEqual(Reservation.migrate(), 3)
+        self.assertFalse(os.path.exists(Reservation.DATA_FILE))
+        self.assertEqual(Reservation.load_data(hotel_name="Hotel Central"),
+                         ["Juan Perez | Hotel Central",
+                          "Ana Gomez | Hotel Central"])
+        self.assertEqual(Reservation.migrate(), 0)
+
+    def test_concurrent_writers_migrate_once(self):
+        """Dos procesos con DATA_FILE pendiente lo migran una sola vez."""
+        legacy = [f"Cliente {i} | Hotel {i % 2}" for i in range(5000)]
+        self.write_legacy(*legacy)
+        barrier = multiprocessing.Barrier(2)
+        processes = [
+            multiprocessing.Process(
+                target=write_reservation,
+                args=(barrier, Reservation.DATA_FILE, self.shard_dir,
+                      f"Hotel {i}"))
+            for i in range(2)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual([p.exitcode for p in processes], [0, 0])
+        self.assertFalse(os.path.exists(Reservation.DATA_FILE))
+        self.assertFalse(os.path.exists(Reservation.DATA_FILE + ".lock"))
+        stored = Reservation.display_reservations()
+        self.assertEqual(sorted(stored), sorted(
+            legacy + ["Nuevo Cliente | Hotel 0", "Nuevo Cliente | Hotel 1"]))
+
+    def test_migrate_legacy_file_removed(self):
+        """Migrar tolera que otro proceso ya eliminó DATA_FILE."""
+        self.write_legacy("Juan Perez | Hotel Central")
+        with patch("os.remove", side_effect=[FileNotFoundError, None]):
+            self.assertEqual(Reservation.migrate(), 1)
+        self.assertEqual(Reservation.load_data(hotel_name="Hotel Central"),
+                         ["Juan Perez | Hotel Central"])
+
+    def test_migrate_lock_timeout(self):
+        """Sin el candado la migración se omite y DATA_FILE se conserva."""
+        self.write_legacy("Juan Perez | Hotel Central")
+        with open(Reservation.DATA_FILE + ".lock", "w", encoding="utf-8"):
+            pass
+        with patch.object(Reservation, "LOCK_TIMEOUT", 0.05), \
+                patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            self.assertEqual(Reservation.migrate(), 0)
+        self.assertIn("[ERROR] La migración sigue bloqueada",
+                      mock_stdout.getvalue())
+        self.assertTrue(os.path.exists(Reservation.DATA_FILE))
+
+    def test_cancel_legacy_reservation(self):
+        """Cancelar migra antes una reservación de DATA_FILE."""
+        self.write_legacy("Juan Perez | Hotel Central")
+        result = Reservation.cancel_reservation("Juan Perez", "Hotel Central")
+        self.assertEqual(result, "[INFO] Reservación cancelada exitosamente.")
+        self.assertEqual(Reservation.display_reservations(), [])
+
 
 if __name__ == "__main__":
     unittest.main()